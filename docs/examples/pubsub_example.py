@@ -17,11 +17,69 @@ This example includes:
 """
 
 from kn_sock import start_pubsub_server, PubSubClient
+import logging
+import logging.handlers
+import os
+import queue
+import selectors
+import socket
+import tempfile
 import threading
 import time
-import json
 import sys
 
+# Use orjson when it is installed; it emits compact JSON by default
+try:
+    import orjson
+
+    def dumps(obj):
+        return orjson.dumps(obj).decode()
+
+    loads = orjson.loads
+except ImportError:
+    import json
+
+    def dumps(obj):
+        return json.dumps(obj, separators=(",", ":"))
+
+    loads = json.loads
+
+# Same-host clients connect over a Unix socket when the platform has one
+UNIX_PATH = (
+    os.path.join(tempfile.gettempdir(), "kn_sock_pubsub_8080.sock")
+    if hasattr(socket, "AF_UNIX")
+    else None
+)
+
+# Per-message output goes through a queue: server and listener threads only
+# enqueue, a background thread writes to stdout. Raise the level to WARNING
+# to silence it entirely.
+_log_queue = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(
+    _log_queue, logging.StreamHandler(sys.stdout)
+)
+message_log = logging.getLogger("pubsub_example.messages")
+message_log.addHandler(logging.handlers.QueueHandler(_log_queue))
+message_log.setLevel(logging.INFO)
+message_log.propagate = False
+
+EXPECTED_SUBSCRIPTIONS = 5
+EXPECTED_MESSAGES = 5
+
+# Demo stages signal each other instead of sleeping for a guessed duration
+server_ready = threading.Event()
+subscriptions_ready = threading.Event()
+messages_received = threading.Event()
+_counts = {"subscriptions": 0, "messages": 0}
+_counts_lock = threading.Lock()
+
+
+def _count(key, target, event):
+    with _counts_lock:
+        _counts[key] += 1
+        if _counts[key] >= target:
+            event.set()
+
 def custom_message_handler(data, client_sock, server):
     """
     Custom handler for server-side message processing.
@@ -35,12 +93,16 @@ def custom_message_handler(data, client_sock, server):
     topic = data.get("topic", "unknown")
     
     if action == "subscribe":
-        print(f"[SERVER] 📝 Client subscribed to: {topic}")
+        server.subscribe(topic, client_sock)
+        message_log.info(f"[SERVER] 📝 Client subscribed to: {topic}")
+        _count("subscriptions", EXPECTED_SUBSCRIPTIONS, subscriptions_ready)
     elif action == "unsubscribe":
-        print(f"[SERVER] 📤 Client unsubscribed from: {topic}")
+        server.unsubscribe(topic, client_sock)
+        message_log.info(f"[SERVER] 📤 Client unsubscribed from: {topic}")
     elif action == "publish":
         message = data.get("message", "")
-        print(f"[SERVER] 📢 Message on '{topic}': {message}")
+        message_log.info(f"[SERVER] 📢 Message on '{topic}': {message}")
+        server.publish(topic, message)
 
 def start_pubsub_server_demo():
     """Start the PubSub server."""
@@ -49,33 +111,33 @@ def start_pubsub_server_demo():
         start_pubsub_server(
             port=8080,
             host='0.0.0.0',
-            handler_func=custom_message_handler
+            handler_func=custom_message_handler,
+            unix_path=UNIX_PATH,
+            ready_event=server_ready
         )
     except Exception as e:
         print(f"[SERVER] ❌ Error starting server: {e}")
 
 def publisher_demo():
     """Demonstrate publishing messages."""
-    time.sleep(1)  # Wait for server to start
-    
+    client = None
     try:
         print("[PUBLISHER] 🔌 Connecting to PubSub server...")
-        client = PubSubClient("localhost", 8080)
+        client = PubSubClient("localhost", 8080, unix_path=UNIX_PATH)
         print("[PUBLISHER] ✅ Connected successfully!")
         
-        # Publish various types of messages
+        # Publish various types of messages (JSON payloads serialized once, compactly)
         messages = [
             ("news/tech", "AI breakthrough: New language model released"),
             ("news/sports", "Championship finals tonight at 8 PM"),
             ("alerts/system", "System maintenance scheduled for midnight"),
-            ("data/sensors", json.dumps({"sensor_id": "temp_01", "temperature": 23.5, "unit": "celsius"})),
-            ("events/user", json.dumps({"user_id": "user_123", "action": "login", "timestamp": time.time()}))
+            ("data/sensors", dumps({"sensor_id": "temp_01", "temperature": 23.5, "unit": "celsius"})),
+            ("events/user", dumps({"user_id": "user_123", "action": "login", "timestamp": time.time()}))
         ]
         
-        for topic, message in messages:
+        for topic, _ in messages:
             print(f"[PUBLISHER] 📤 Publishing to '{topic}'...")
-            client.publish(topic, message)
-            time.sleep(0.3)  # Small delay between messages
+        client.publish_many(messages)  # One send for the whole batch
         
         print("[PUBLISHER] ✅ All messages published successfully!")
         
@@ -84,41 +146,59 @@ def publisher_demo():
     except Exception as e:
         print(f"[PUBLISHER] ❌ Error: {e}")
     finally:
-        client.close()
-        print("[PUBLISHER] 🔒 Connection closed")
+        if client is not None:
+            client.close()
+            print("[PUBLISHER] 🔒 Connection closed")
 
 def subscriber_demo():
     """Demonstrate subscribing to topics and receiving messages."""
-    time.sleep(1.5)  # Wait for server to start
-    
+    # Shared wakeup socket: one byte written on shutdown wakes every listener
+    wakeup_recv, wakeup_send = socket.socketpair()
+
     def message_listener(client, name):
         """Listen for messages in a separate thread."""
+        sel = selectors.DefaultSelector()
+        sel.register(client.sock, selectors.EVENT_READ, "data")
+        sel.register(wakeup_recv, selectors.EVENT_READ, "wakeup")
         try:
             while True:
-                message = client.recv(timeout=1.0)
+                # Sleep in the OS until data or the wakeup byte arrives
+                if b"\n" not in client.recv_buffer:
+                    events = sel.select()
+                    if any(key.data == "wakeup" for key, _ in events):
+                        break
+                message = client.recv()
+                if message is None:
+                    break
                 if message:
                     topic = message.get("topic")
                     content = message.get("message")
-                    print(f"[{name}] 📨 Received on '{topic}': {content}")
+                    message_log.info(f"[{name}] 📨 Received on '{topic}': {content}")
+                    _count("messages", EXPECTED_MESSAGES, messages_received)
                     
-                    # Parse JSON messages if possible
-                    try:
-                        parsed = json.loads(content)
-                        if isinstance(parsed, dict):
-                            print(f"[{name}] 📊 Parsed data: {parsed}")
-                    except:
-                        pass  # Not JSON, that's fine
+                    # Structured payloads may arrive already decoded; only
+                    # re-parse strings that look like JSON objects
+                    parsed = content
+                    if isinstance(content, str) and content.startswith("{"):
+                        try:
+                            parsed = loads(content)
+                        except ValueError:
+                            pass  # Not JSON, that's fine
+                    if isinstance(parsed, dict):
+                        message_log.info(f"[{name}] 📊 Parsed data: {parsed}")
         except Exception as e:
             print(f"[{name}] ⚠️  Message listener stopped: {e}")
+        finally:
+            sel.close()
     
     try:
         # Create two different subscribers to demonstrate multiple connections
         print("[SUBSCRIBER1] 🔌 Connecting to PubSub server...")
-        client1 = PubSubClient("localhost", 8080)
+        client1 = PubSubClient("localhost", 8080, unix_path=UNIX_PATH)
         print("[SUBSCRIBER1] ✅ Connected!")
         
         print("[SUBSCRIBER2] 🔌 Connecting to PubSub server...")  
-        client2 = PubSubClient("localhost", 8080)
+        client2 = PubSubClient("localhost", 8080, unix_path=UNIX_PATH)
         print("[SUBSCRIBER2] ✅ Connected!")
         
         # Subscribe to different topics
@@ -146,8 +226,8 @@ def subscriber_demo():
         listener1.start()
         listener2.start()
         
-        # Keep subscribers alive for the demo
-        time.sleep(5)
+        # Stay subscribed until every published message has arrived
+        messages_received.wait(timeout=5)
         
         print("[SUBSCRIBER1] 🔄 Unsubscribing from topics...")
         client1.unsubscribe("news/tech")
@@ -163,6 +243,7 @@ def subscriber_demo():
     except Exception as e:
         print(f"[SUBSCRIBER] ❌ Error: {e}")
     finally:
+        wakeup_send.send(b"\0")
         try:
             client1.close()
             client2.close()
@@ -177,18 +258,19 @@ def main():
     print("=" * 60)
     print()
     
+    _log_listener.start()
     try:
         # Start server in background
         print("1️⃣  Starting PubSub Server...")
         server_thread = threading.Thread(target=start_pubsub_server_demo, daemon=True)
         server_thread.start()
-        time.sleep(2)  # Give server time to start
+        server_ready.wait(timeout=5)
         
         # Start subscribers in background
         print("2️⃣  Starting Subscriber Clients...")
         subscriber_thread = threading.Thread(target=subscriber_demo, daemon=True)
         subscriber_thread.start()
-        time.sleep(1)  # Give subscribers time to connect
+        subscriptions_ready.wait(timeout=5)
         
         # Start publisher
         print("3️⃣  Starting Publisher Client...")
@@ -196,7 +278,7 @@ def main():
         
         # Wait for messages to be processed
         print("\n4️⃣  Waiting for message processing...")
-        time.sleep(3)
+        messages_received.wait(timeout=5)
         
         print("\n" + "=" * 60)
         print("✅ PubSub Example Completed Successfully!")
@@ -222,6 +304,8 @@ def main():
     except Exception as e:
         print(f"\n❌ Error running example: {e}")
         sys.exit(1)
+    finally:
+        _log_listener.stop()
 
 if __name__ == "__main__":
     main()
@@ -7,9 +7,19 @@ Copy this example and it should work immediately.
 """
 
 from kn_sock import start_rpc_server, RPCClient
+import os
+import socket
+import tempfile
 import threading
 import time
 
+# Same-host clients connect over a Unix socket when the platform has one
+UNIX_PATH = (
+    os.path.join(tempfile.gettempdir(), "kn_sock_rpc_8080.sock")
+    if hasattr(socket, "AF_UNIX")
+    else None
+)
+
 def start_math_rpc_server():
     """Start a basic RPC server - matches documentation."""
     
@@ -61,7 +71,8 @@ def start_math_rpc_server():
     start_rpc_server(
         port=8080,
         register_funcs=register_funcs,
-        host='0.0.0.0'
+        host='0.0.0.0',
+        unix_path=UNIX_PATH
     )
 
 def test_rpc_client():
@@ -70,22 +81,20 @@ def test_rpc_client():
     client = None
     try:
         # Connect to RPC server
-        client = RPCClient('localhost', 8080)
+        client = RPCClient('localhost', 8080, unix_path=UNIX_PATH)
         print("✅ Connected to RPC server")
         
-        # Call individual functions
-        greeting = client.call('hello', 'Alice')
+        # Pipeline independent calls: one send, one round trip
+        greeting, server_time, total, product = client.call_many([
+            ('hello', 'Alice'),
+            ('get_time',),
+            ('add', 10, 20),
+            ('multiply', 7, 8),
+        ])
         print(f"Greeting: {greeting}")
-        
-        server_time = client.call('get_time')
         print(f"Server time: {server_time}")
-        
-        # Call math functions
-        result = client.call('add', 10, 20)
-        print(f"10 + 20 = {result}")
-        
-        result = client.call('multiply', 7, 8)
-        print(f"7 * 8 = {result}")
+        print(f"10 + 20 = {total}")
+        print(f"7 * 8 = {product}")
         
         # Handle errors
         try:
@@ -1,5 +1,4 @@
 import threading
-import time
 from kn_sock import start_rpc_server
 
 
@@ -14,16 +13,13 @@ def echo(msg):
 if __name__ == "__main__":
     funcs = {"add": add, "echo": echo}
     shutdown_event = threading.Event()
-    server_thread = threading.Thread(
-        target=start_rpc_server,
-        args=(9001, funcs),
-        kwargs={"shutdown_event": shutdown_event},
-        daemon=True,
-    )
-    server_thread.start()
+    # Run the server on the main thread; a timer triggers the shutdown
+    timer = threading.Timer(10, shutdown_event.set)
+    timer.daemon = True
+    timer.start()
     print("[RPC][SERVER] Running. Will shutdown in 10 seconds...")
-    time.sleep(10)
-    print("[RPC][SERVER] Triggering graceful shutdown...")
-    shutdown_event.set()
-    server_thread.join()
+    try:
+        start_rpc_server(9001, funcs, shutdown_event=shutdown_event)
+    finally:
+        timer.cancel()
     print("[RPC][SERVER] Shutdown complete.")
@@ -1,29 +1,32 @@
 # examples/tcp_server.py
 
-import threading
-import time
-from kn_sock import start_tcp_server
+import asyncio
+import signal
+from kn_sock import start_async_tcp_server
 
 
-def echo_handler(data, addr, client_socket):
+async def echo_handler(data, addr, writer):
     print(f"[SERVER] Received from {addr}: {data.decode()}")
-    client_socket.sendall(b"Echo: " + data)
+    writer.write(b"Echo: " + data)
+    await writer.drain()
 
 
-if __name__ == "__main__":
-    # Example: Graceful shutdown for sync TCP server (IPv4 and IPv6 supported)
-    # To run on IPv6 localhost, use host='::1'
-    shutdown_event = threading.Event()
-    server_thread = threading.Thread(
-        target=start_tcp_server,
-        args=(8080, echo_handler),
-        kwargs={"host": "::1", "shutdown_event": shutdown_event},
-        daemon=True,
-    )
-    server_thread.start()
+async def main():
+    # Example: Graceful shutdown for TCP server on a single event loop
+    # (IPv4 and IPv6 supported). To run on IPv6 localhost, use host='::1'
+    loop = asyncio.get_running_loop()
+    shutdown_event = asyncio.Event()
+    try:
+        loop.add_signal_handler(signal.SIGINT, shutdown_event.set)
+    except NotImplementedError:
+        pass  # Signal handlers are not available on Windows event loops
+    loop.call_later(10, shutdown_event.set)
     print("[SERVER] Running on IPv6 (::1). Will shutdown in 10 seconds...")
-    time.sleep(10)
-    print("[SERVER] Triggering graceful shutdown...")
-    shutdown_event.set()
-    server_thread.join()
+    await start_async_tcp_server(
+        8080, echo_handler, host="::1", shutdown_event=shutdown_event
+    )
     print("[SERVER] Shutdown complete.")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
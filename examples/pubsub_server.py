@@ -1,19 +1,15 @@
 import threading
-import time
 from kn_sock import start_pubsub_server
 
 if __name__ == "__main__":
     shutdown_event = threading.Event()
-    server_thread = threading.Thread(
-        target=start_pubsub_server,
-        args=(9000,),
-        kwargs={"shutdown_event": shutdown_event},
-        daemon=True,
-    )
-    server_thread.start()
+    # Run the server on the main thread; a timer triggers the shutdown
+    timer = threading.Timer(10, shutdown_event.set)
+    timer.daemon = True
+    timer.start()
     print("[PubSub][SERVER] Running. Will shutdown in 10 seconds...")
-    time.sleep(10)
-    print("[PubSub][SERVER] Triggering graceful shutdown...")
-    shutdown_event.set()
-    server_thread.join()
+    try:
+        start_pubsub_server(9000, shutdown_event=shutdown_event)
+    finally:
+        timer.cancel()
     print("[PubSub][SERVER] Shutdown complete.")
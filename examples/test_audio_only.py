@@ -5,12 +5,43 @@ Simple Audio Test Script
 This script tests audio input and output separately to help isolate audio issues.
 """
 
+import math
 import pyaudio
 import time
 import numpy as np
 
 SAMPLE_RATE = 44100  # Changed from 16000 to 44100
 
+_device_cache = None
+
+
+def _enumerate_devices(pa):
+    """Return (index, info) pairs for all devices, querying PortAudio only once.
+
+    info is the exception raised instead if a device could not be read.
+    """
+    global _device_cache
+    if _device_cache is None:
+        devices = []
+        for i in range(pa.get_device_count()):
+            try:
+                devices.append((i, pa.get_device_info_by_index(i)))
+            except Exception as e:
+                devices.append((i, e))
+        _device_cache = devices
+    return _device_cache
+
+
+def _first_device(pa, channels_key):
+    return next(
+        (
+            i
+            for i, info in _enumerate_devices(pa)
+            if isinstance(info, dict) and info[channels_key] > 0
+        ),
+        None,
+    )
+
 
 def test_audio_devices():
     """Test all audio devices"""
@@ -20,21 +51,21 @@ def test_audio_devices():
     try:
         pa = pyaudio.PyAudio()
 
-        print(f"Found {pa.get_device_count()} audio devices:")
+        devices = _enumerate_devices(pa)
+        print(f"Found {len(devices)} audio devices:")
         print()
 
         # List all devices
-        for i in range(pa.get_device_count()):
-            try:
-                device_info = pa.get_device_info_by_index(i)
-                print(f"Device {i}: {device_info['name']}")
-                print(f"  - Input channels: {device_info['maxInputChannels']}")
-                print(f"  - Output channels: {device_info['maxOutputChannels']}")
-                print(f"  - Sample rate: {device_info['defaultSampleRate']}")
-                print()
-            except Exception as e:
-                print(f"Device {i}: Error reading info - {e}")
+        for i, device_info in devices:
+            if isinstance(device_info, Exception):
+                print(f"Device {i}: Error reading info - {device_info}")
                 print()
+                continue
+            print(f"Device {i}: {device_info['name']}")
+            print(f"  - Input channels: {device_info['maxInputChannels']}")
+            print(f"  - Output channels: {device_info['maxOutputChannels']}")
+            print(f"  - Sample rate: {device_info['defaultSampleRate']}")
+            print()
 
         pa.terminate()
         return True
@@ -53,14 +84,7 @@ def test_audio_input(device_id=None):
 
         if device_id is None:
             # Find first working input device
-            for i in range(pa.get_device_count()):
-                try:
-                    device_info = pa.get_device_info_by_index(i)
-                    if device_info["maxInputChannels"] > 0:
-                        device_id = i
-                        break
-                except:
-                    continue
+            device_id = _first_device(pa, "maxInputChannels")
 
         if device_id is None:
             print("❌ No input devices found")
@@ -100,7 +124,9 @@ def test_audio_input(device_id=None):
             print(f"✅ Successfully recorded {len(frames)} audio frames")
             # Calculate audio level
             audio_data = np.frombuffer(b"".join(frames), dtype=np.int16)
-            level = np.sqrt(np.mean(audio_data**2))
+            # Accumulate squares in int64: int16**2 wraps around and copies
+            energy = np.einsum("i,i->", audio_data, audio_data, dtype=np.int64)
+            level = math.sqrt(energy / audio_data.size)
             print(f"Audio level: {level:.2f}")
             if level > 100:
                 print("✅ Audio input is working (detected sound)")
@@ -128,14 +154,7 @@ def test_audio_output(device_id=None):
 
         if device_id is None:
             # Find first working output device
-            for i in range(pa.get_device_count()):
-                try:
-                    device_info = pa.get_device_info_by_index(i)
-                    if device_info["maxOutputChannels"] > 0:
-                        device_id = i
-                        break
-                except:
-                    continue
+            device_id = _first_device(pa, "maxOutputChannels")
 
         if device_id is None:
             print("❌ No output devices found")
@@ -162,9 +181,16 @@ def test_audio_output(device_id=None):
         duration = 2
         frequency = 440
 
-        t = np.linspace(0, duration, int(sample_rate * duration), False)
-        tone = np.sin(2 * np.pi * frequency * t) * 0.3
-        audio_data = (tone * 32767).astype(np.int16)
+        # Synthesize the shortest run of samples holding a whole number of
+        # cycles once, then repeat it for the full duration
+        period = sample_rate // math.gcd(sample_rate, frequency)
+        n = np.arange(period)
+        cycle = (np.sin(2 * np.pi * frequency * n / sample_rate) * 0.3 * 32767).astype(
+            np.int16
+        )
+        audio_data = np.tile(cycle, sample_rate * duration // period + 1)[
+            : sample_rate * duration
+        ]
 
         # Play the tone
         try:
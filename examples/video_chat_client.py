@@ -56,7 +56,7 @@ if __name__ == "__main__":
 
     client.start()
     try:
-        while client.running:
-            pass
+        client.wait()
     except KeyboardInterrupt:
+        client.stop()
         print("Client stopped.")
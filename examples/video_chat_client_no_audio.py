@@ -34,6 +34,7 @@ if __name__ == "__main__":
         room=args.room,
         nickname=args.nickname,
         enable_audio=False,  # Disable audio
+        low_latency=True,
     )
 
     print(
@@ -43,7 +44,7 @@ if __name__ == "__main__":
 
     client.start()
     try:
-        while client.running:
-            pass
+        client.wait()
     except KeyboardInterrupt:
+        client.stop()
         print("Client stopped.")
@@ -2,7 +2,11 @@ from kn_sock.video_chat import VideoChatServer
 
 if __name__ == "__main__":
     server = VideoChatServer(
-        host="0.0.0.0", video_port=9000, audio_port=9001, text_port=9002
+        host="0.0.0.0",
+        video_port=9000,
+        audio_port=9001,
+        text_port=9002,
+        low_latency=True,
     )
     print("Video chat server started on ports:")
     print("  - 9000 (video)")
@@ -13,7 +17,7 @@ if __name__ == "__main__":
     # The server will handle multiple rooms and nicknames automatically.
     server.start()
     try:
-        while True:
-            pass
+        server.wait()
     except KeyboardInterrupt:
+        server.stop()
         print("Server stopped.")
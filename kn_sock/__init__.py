@@ -18,94 +18,204 @@ __version__ = "0.1.0"
 __author__ = "Khagendra Neupane"
 __license__ = "MIT"
 
+import importlib
 import logging
+import os
 
+_log_listener = None
 
-def configure_logging(level=logging.INFO, fmt=None):
-    """Configure kn_sock logging globally."""
+
+def _stop_log_listener():
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+
+def configure_logging(level=logging.INFO, fmt=None, queued=False):
+    """
+    Configure kn_sock logging globally.
+    With queued=True, log calls only enqueue the record and a background
+    listener thread formats and writes it, so socket threads never block on
+    stderr. Records still queued when the process exits are flushed at exit.
+    """
+    global _log_listener
     if fmt is None:
         fmt = "[%(levelname)s][%(name)s] %(message)s"
+    _stop_log_listener()
     logging.basicConfig(level=level, format=fmt, force=True)
+    if queued:
+        import atexit
+        import queue
+        from logging.handlers import QueueHandler, QueueListener
+
+        root = logging.getLogger()
+        records = queue.SimpleQueue()
+        _log_listener = QueueListener(
+            records, *root.handlers, respect_handler_level=True
+        )
+        root.handlers = [QueueHandler(records)]
+        _log_listener.start()
+        atexit.unregister(_stop_log_listener)
+        atexit.register(_stop_log_listener)
+
 
+# Set default logging config on import; set KN_SOCK_CONFIGURE_LOGGING=0 to opt out
+if os.environ.get("KN_SOCK_CONFIGURE_LOGGING", "1") != "0":
+    configure_logging()
 
-# Set default logging config on import
-configure_logging()
-
-# Only import and expose public API symbols that are actually used. Remove unused imports and fix E402 errors by placing imports at the top.
-from .tcp import (
-    send_tcp_message,
-    send_tcp_bytes,
-    start_tcp_server,
-    start_threaded_tcp_server,
-    start_async_tcp_server,
-    send_tcp_message_async,
-    start_ssl_tcp_server,
-    send_ssl_tcp_message,
-    start_async_ssl_tcp_server,
-    send_ssl_tcp_message_async,
-    TCPConnectionPool,
-)
-from .udp import (
-    send_udp_message,
-    start_udp_server,
-    send_udp_message_async,
-    start_udp_server_async,
-    send_udp_multicast,
-    start_udp_multicast_server,
-)
-from .file_transfer import (
-    send_file,
-    start_file_server,
-    send_file_async,
-    start_file_server_async,
-)
-from .json_socket import (
-    start_json_server,
-    send_json,
-    start_json_server_async,
-    send_json_async,
-    send_json_response,
-    send_json_response_async,
-)
 from .utils import *
 from .errors import *
 
-# Optional import for live_stream (requires cv2, pyaudio)
-try:
-    from .live_stream import start_live_stream, connect_to_live_server
-except ImportError:
-    # Define placeholder functions that raise informative errors
-    def start_live_stream(*args, **kwargs):
-        raise ImportError("live_stream functionality requires additional dependencies. Install with: pip install opencv-python pyaudio")
-    
-    def connect_to_live_server(*args, **kwargs):
-        raise ImportError("live_stream functionality requires additional dependencies. Install with: pip install opencv-python pyaudio")
-
-from .websocket import (
-    start_websocket_server,
-    start_async_websocket_server,
-    connect_websocket,
-    async_connect_websocket,
-    AsyncWebSocketConnection,
-)
-from .http import http_get, http_post, https_get, https_post, start_http_server
-from .pubsub import start_pubsub_server, PubSubClient
-from .rpc import start_rpc_server, RPCClient
-
-# Optional import for video_chat (requires cv2, pyaudio)  
-try:
-    from .video_chat import VideoChatServer, VideoChatClient
-except ImportError:
-    # Define placeholder classes that raise informative errors
-    class VideoChatServer:
-        def __init__(self, *args, **kwargs):
-            raise ImportError("video_chat functionality requires additional dependencies. Install with: pip install opencv-python pyaudio")
-    
-    class VideoChatClient:
-        def __init__(self, *args, **kwargs):
-            raise ImportError("video_chat functionality requires additional dependencies. Install with: pip install opencv-python pyaudio")
-
-from .compression import compress_data, decompress_data, detect_compression
-from .decorators import log_exceptions, retry, measure_time, ensure_json_input
-from .interactive_cli import KnSockInteractiveCLI
-from .network import arp_scan, mac_lookup, monitor_dns
+# Public API symbols, imported from their submodule on first access (PEP 562)
+# so that e.g. ``from kn_sock import http_get`` does not load cv2/pyaudio.
+_LAZY = {}
+for _module, _names in (
+    (
+        "tcp",
+        (
+            "send_tcp_message",
+            "send_tcp_bytes",
+            "send_tcp_file",
+            "send_tcp_vectored",
+            "send_tcp_messages",
+            "send_tcp_message_pooled",
+            "start_tcp_server",
+            "start_tcp_server_reuseport",
+            "start_threaded_tcp_server",
+            "start_selector_tcp_server",
+            "start_iouring_tcp_server",
+            "start_async_tcp_server",
+            "start_async_tcp_server_multi",
+            "install_fast_event_loop",
+            "send_tcp_message_async",
+            "start_ssl_tcp_server",
+            "send_ssl_tcp_message",
+            "start_async_ssl_tcp_server",
+            "send_ssl_tcp_message_async",
+            "TCPConnectionPool",
+        ),
+    ),
+    (
+        "udp",
+        (
+            "send_udp_message",
+            "send_udp_messages",
+            "start_udp_server",
+            "send_udp_message_async",
+            "start_udp_server_async",
+            "send_udp_multicast",
+            "start_udp_multicast_server",
+        ),
+    ),
+    (
+        "file_transfer",
+        (
+            "send_file",
+            "start_file_server",
+            "send_file_async",
+            "start_file_server_async",
+        ),
+    ),
+    (
+        "json_socket",
+        (
+            "start_json_server",
+            "send_json",
+            "start_json_server_async",
+            "send_json_async",
+            "send_json_response",
+            "send_json_response_async",
+        ),
+    ),
+    ("live_stream", ("start_live_stream", "connect_to_live_server")),
+    (
+        "websocket",
+        (
+            "start_websocket_server",
+            "start_async_websocket_server",
+            "start_websocket_server_async",
+            "connect_websocket",
+            "async_connect_websocket",
+            "AsyncWebSocketConnection",
+        ),
+    ),
+    ("http", ("http_get", "http_post", "https_get", "https_post", "start_http_server")),
+    ("pubsub", ("start_pubsub_server", "PubSubClient")),
+    ("rpc", ("start_rpc_server", "RPCClient")),
+    ("video_chat", ("VideoChatServer", "VideoChatClient")),
+    ("compression", ("compress_data", "decompress_data", "detect_compression")),
+    ("decorators", ("log_exceptions", "retry", "measure_time", "ensure_json_input")),
+    ("interactive_cli", ("KnSockInteractiveCLI",)),
+    ("network", ("arp_scan", "mac_lookup", "monitor_dns")),
+):
+    for _name in _names:
+        _LAZY[_name] = "kn_sock." + _module
+del _module, _names, _name
+
+# Star imports leave out modules with optional dependencies (cv2, pyaudio,
+# requests) so they never import them; their names are still importable directly
+_STAR_EXCLUDED = ("kn_sock.live_stream", "kn_sock.video_chat", "kn_sock.network")
+
+__all__ = [
+    "configure_logging",
+    "get_free_port",
+    "get_local_ip",
+    "send_all_vectored",
+    "chunked_file_reader",
+    "recv_all",
+    "print_progress",
+    "is_valid_json",
+    "EasySocketError",
+    "ConnectionTimeoutError",
+    "PortInUseError",
+    "InvalidJSONError",
+    "UnsupportedProtocolError",
+    "FileTransferError",
+] + [_name for _name, _module in _LAZY.items() if _module not in _STAR_EXCLUDED]
+
+# Modules with optional dependencies (cv2, pyaudio)
+_OPTIONAL = {"kn_sock.live_stream": "live_stream", "kn_sock.video_chat": "video_chat"}
+
+
+def _missing_dependency(name, feature):
+    """Build a placeholder that raises an informative ImportError when used."""
+    message = (
+        f"{feature} functionality requires additional dependencies. "
+        "Install with: pip install opencv-python pyaudio"
+    )
+
+    if name[0].isupper():
+
+        class _Placeholder:
+            def __init__(self, *args, **kwargs):
+                raise ImportError(message)
+
+        _Placeholder.__name__ = _Placeholder.__qualname__ = name
+        return _Placeholder
+
+    def _placeholder(*args, **kwargs):
+        raise ImportError(message)
+
+    _placeholder.__name__ = _placeholder.__qualname__ = name
+    return _placeholder
+
+
+def __getattr__(name):
+    module_name = _LAZY.get(name)
+    if module_name is None:
+        if "kn_sock." + name in _LAZY.values():
+            return importlib.import_module("kn_sock." + name)
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    try:
+        value = getattr(importlib.import_module(module_name), name)
+    except ImportError:
+        if module_name not in _OPTIONAL:
+            raise
+        value = _missing_dependency(name, _OPTIONAL[module_name])
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
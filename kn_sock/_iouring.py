@@ -0,0 +1,149 @@
+# kn_sock/_iouring.py
+#
+# Experimental io_uring accept + recv loop behind tcp.start_iouring_tcp_server.
+# Importing this module raises ImportError off Linux or without the liburing
+# bindings (pip install liburing), so callers can fall back to the selector server.
+
+import logging
+import platform
+import selectors
+import socket
+
+if platform.system() != "Linux":
+    raise ImportError("io_uring is only available on Linux")
+
+from liburing import (
+    IORING_CQE_F_MORE,
+    Cqe,
+    Ring,
+    io_uring_cq_advance,
+    io_uring_cq_ready,
+    io_uring_get_sqe,
+    io_uring_peek_cqe,
+    io_uring_prep_multishot_accept,
+    io_uring_prep_recv,
+    io_uring_queue_exit,
+    io_uring_queue_init,
+    io_uring_sqe_set_data64,
+    io_uring_submit,
+)
+
+from kn_sock.utils import _EventWakeup
+
+logger = logging.getLogger("kn_sock.tcp")
+
+# Submission queue depth
+SQ_DEPTH = 256
+
+# user_data of the multishot accept; recv requests carry the client fd + 1
+_ACCEPT = 0
+
+
+def serve(server_socket, handler_func, shutdown_event, bufsize, zero_copy, on_accept):
+    """
+    Run the io_uring loop on a bound, listening socket until shutdown_event
+    is set. One multishot accept stays armed on the listener; each client has
+    one recv in flight into its own buffer, re-armed after the handler returns.
+    """
+    ring = Ring()
+    io_uring_queue_init(SQ_DEPTH, ring)
+    cqe = Cqe()
+    conns = {}  # fd -> (socket, addr, buffer, view)
+
+    def get_sqe():
+        sqe = io_uring_get_sqe(ring)
+        if sqe is None:
+            # Submission queue full: hand what is queued to the kernel first
+            io_uring_submit(ring)
+            sqe = io_uring_get_sqe(ring)
+        return sqe
+
+    def arm_accept():
+        sqe = get_sqe()
+        io_uring_prep_multishot_accept(sqe, server_socket.fileno())
+        io_uring_sqe_set_data64(sqe, _ACCEPT)
+
+    def arm_recv(fd):
+        sqe = get_sqe()
+        io_uring_prep_recv(sqe, fd, conns[fd][2])
+        io_uring_sqe_set_data64(sqe, fd + 1)
+
+    def drop(fd):
+        client_socket, addr = conns.pop(fd)[:2]
+        client_socket.close()
+        logger.info("[TCP] Connection closed for %s", addr)
+
+    # The bindings hold the GIL inside io_uring_wait_cqe(), so block in the
+    # selector on the ring fd instead and only peek completions once ready
+    sel = selectors.DefaultSelector()
+    sel.register(ring.ring_fd, selectors.EVENT_READ)
+    wakeup = None
+    if shutdown_event is not None:
+        wakeup = _EventWakeup(shutdown_event)
+        sel.register(wakeup, selectors.EVENT_READ)
+
+    arm_accept()
+    io_uring_submit(ring)
+    try:
+        while shutdown_event is None or not shutdown_event.is_set():
+            sel.select()
+            # Reap every ready completion, then submit all re-armed requests
+            # with a single io_uring_submit()
+            while io_uring_cq_ready(ring):
+                completions = []
+                for _ in range(io_uring_cq_ready(ring)):
+                    io_uring_peek_cqe(ring, cqe)
+                    entry = cqe[0]
+                    completions.append((entry.user_data, entry.res, entry.flags))
+                    io_uring_cq_advance(ring, 1)
+                for user_data, res, flags in completions:
+                    if user_data == _ACCEPT:
+                        if res >= 0:
+                            client_socket = socket.socket(fileno=res)
+                            try:
+                                addr = client_socket.getpeername()
+                                on_accept(client_socket)
+                            except OSError as e:
+                                # The client reset before we got to it; only
+                                # this connection is lost, not the server
+                                logger.warning("[TCP] Dropped new connection: %s", e)
+                                client_socket.close()
+                            else:
+                                logger.info("[TCP] Connection from %s", addr)
+                                buf = bytearray(bufsize)
+                                conns[res] = (client_socket, addr, buf, memoryview(buf))
+                                arm_recv(res)
+                        else:
+                            logger.warning("[TCP] io_uring accept failed: %d", res)
+                        if not flags & IORING_CQE_F_MORE:
+                            # The kernel ended the multishot accept; re-arm it
+                            arm_accept()
+                        continue
+                    fd = user_data - 1
+                    if fd not in conns:
+                        continue
+                    if res <= 0:
+                        if res < 0:
+                            logger.warning(
+                                "[TCP] Connection lost from %s", conns[fd][1]
+                            )
+                        drop(fd)
+                        continue
+                    client_socket, addr, _, view = conns[fd]
+                    data = view[:res] if zero_copy else bytes(view[:res])
+                    try:
+                        handler_func(data, addr, client_socket)
+                    except Exception as e:
+                        logger.error("[TCP] Handler error for %s: %s", addr, e)
+                        drop(fd)
+                        continue
+                    arm_recv(fd)
+            io_uring_submit(ring)
+    finally:
+        # Tearing down the ring cancels the accept and any recv still in flight
+        io_uring_queue_exit(ring)
+        for fd in list(conns):
+            drop(fd)
+        sel.close()
+        if wakeup is not None:
+            wakeup.close()
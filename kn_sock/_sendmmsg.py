@@ -0,0 +1,77 @@
+# kn_sock/_sendmmsg.py
+#
+# ctypes binding for sendmmsg(2), which hands many datagrams to the kernel in
+# one syscall. Importing this module raises ImportError off Linux or when libc
+# lacks sendmmsg, so callers can fall back to one send() per datagram.
+
+import ctypes
+import errno
+import os
+import sys
+
+if not sys.platform.startswith("linux"):
+    raise ImportError("sendmmsg is only available on Linux")
+
+_libc = ctypes.CDLL(None, use_errno=True)
+if not hasattr(_libc, "sendmmsg"):
+    raise ImportError("libc does not provide sendmmsg")
+
+# Kernel cap on datagrams per call (UIO_MAXIOV)
+SENDMMSG_MAX = 1024
+
+
+class _IOVec(ctypes.Structure):
+    _fields_ = [("iov_base", ctypes.c_void_p), ("iov_len", ctypes.c_size_t)]
+
+
+class _MsgHdr(ctypes.Structure):
+    _fields_ = [
+        ("msg_name", ctypes.c_void_p),
+        ("msg_namelen", ctypes.c_uint32),
+        ("msg_iov", ctypes.POINTER(_IOVec)),
+        ("msg_iovlen", ctypes.c_size_t),
+        ("msg_control", ctypes.c_void_p),
+        ("msg_controllen", ctypes.c_size_t),
+        ("msg_flags", ctypes.c_int),
+    ]
+
+
+class _MMsgHdr(ctypes.Structure):
+    _fields_ = [("msg_hdr", _MsgHdr), ("msg_len", ctypes.c_uint)]
+
+
+_sendmmsg = _libc.sendmmsg
+_sendmmsg.argtypes = [
+    ctypes.c_int,
+    ctypes.POINTER(_MMsgHdr),
+    ctypes.c_uint,
+    ctypes.c_int,
+]
+_sendmmsg.restype = ctypes.c_int
+
+
+def sendmmsg(sock, payloads) -> int:
+    """
+    Send each bytes object in payloads as one datagram on a connected socket,
+    up to SENDMMSG_MAX per syscall. Returns the number of datagrams sent.
+    """
+    sent = 0
+    while sent < len(payloads):
+        batch = payloads[sent : sent + SENDMMSG_MAX]
+        n = len(batch)
+        iovs = (_IOVec * n)()
+        msgs = (_MMsgHdr * n)()
+        for i, payload in enumerate(batch):
+            # Points into the bytes object itself; batch keeps it alive
+            iovs[i].iov_base = ctypes.cast(ctypes.c_char_p(payload), ctypes.c_void_p)
+            iovs[i].iov_len = len(payload)
+            msgs[i].msg_hdr.msg_iov = ctypes.pointer(iovs[i])
+            msgs[i].msg_hdr.msg_iovlen = 1
+        result = _sendmmsg(sock.fileno(), msgs, n, 0)
+        if result < 0:
+            err = ctypes.get_errno()
+            if err == errno.EINTR:
+                continue
+            raise OSError(err, os.strerror(err))
+        sent += result
+    return sent
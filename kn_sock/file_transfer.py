@@ -3,6 +3,7 @@
 import os
 import socket
 import asyncio
+from typing import Optional
 
 CHUNK_SIZE = 4096
 
@@ -41,14 +42,8 @@ def _send_text(sock: socket.socket, text: str):
     sock.sendall((text + "\n").encode("utf-8"))
 
 
-def _recv_line(sock: socket.socket) -> str:
-    data = b""
-    while not data.endswith(b"\n"):
-        chunk = sock.recv(1)
-        if not chunk:
-            break
-        data += chunk
-    return data.decode("utf-8").strip()
+def _recv_line(rfile) -> str:
+    return rfile.readline().decode("utf-8").strip()
 
 
 async def _recv_line_async(reader: asyncio.StreamReader) -> str:
@@ -67,6 +62,8 @@ def send_file(host: str, port: int, filepath: str, show_progress: bool = True):
 
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
         sock.connect((host, port))
+        # Two small header writes back to back would otherwise wait on an ACK
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
         _send_text(sock, filename)
         _send_text(sock, str(filesize))
 
@@ -97,9 +94,11 @@ def start_file_server(
         conn, addr = server_socket.accept()
         print(f"[SYNC] Connection from {addr}")
 
-        with conn:
-            filename = _recv_line(conn)
-            filesize = int(_recv_line(conn))
+        # Buffered reader: the header lines and the start of the file body
+        # arrive in one recv() instead of one syscall per header byte
+        with conn, conn.makefile("rb") as rfile:
+            filename = _recv_line(rfile)
+            filesize = int(_recv_line(rfile))
 
             save_path = os.path.join(save_dir, filename)
             bar = _progress_bar(
@@ -108,7 +107,7 @@ def start_file_server(
             with open(save_path, "wb") as f:
                 remaining = filesize
                 while remaining > 0:
-                    data = conn.recv(min(CHUNK_SIZE, remaining))
+                    data = rfile.read1(min(CHUNK_SIZE, remaining))
                     if not data:
                         break
                     f.write(data)
@@ -153,8 +152,23 @@ async def send_file_async(
 
 
 async def start_file_server_async(
-    port: int, save_dir: str, host: str = "0.0.0.0", show_progress: bool = True
+    port: int,
+    save_dir: str,
+    host: str = "0.0.0.0",
+    show_progress: bool = True,
+    shutdown_event: Optional[asyncio.Event] = None,
 ):
+    """
+    Starts an asynchronous TCP file receiver.
+    Args:
+        port (int): Port to bind.
+        save_dir (str): Directory to save received files.
+        host (str): Host to bind.
+        show_progress (bool): Show a progress bar per file.
+        shutdown_event (asyncio.Event, optional): If provided, server will exit when
+            event is set, so callers need not cancel the task.
+    """
+
     async def handle_client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
         addr = writer.get_extra_info("peername")
         print(f"[ASYNC] Connection from {addr}")
@@ -188,4 +202,8 @@ async def start_file_server_async(
     server = await asyncio.start_server(handle_client, host, port)
     print(f"[ASYNC] File server listening on {host}:{port}...")
     async with server:
-        await server.serve_forever()
+        if shutdown_event is not None:
+            await shutdown_event.wait()
+            print("[ASYNC] Shutdown event set. Stopping file server.")
+        else:
+            await server.serve_forever()
@@ -1,13 +1,287 @@
+import functools
+import mimetypes
 import socket
 import ssl
 import os
+import selectors
+import stat
 import threading
-from typing import Optional, Dict, Callable, Tuple
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Callable, List, Tuple, Union
+
+from kn_sock.utils import _EventWakeup, send_all_vectored
+
+RECV_BUFFER_SIZE = 65536
+# Static files larger than this are sent with sendfile() instead of read()+sendall()
+SENDFILE_THRESHOLD = 65536
+# Static file metadata (and bodies up to SENDFILE_THRESHOLD) are cached per server
+STATIC_CACHE_SIZE = 1024
+STATIC_CACHE_TTL = 1.0
+
+# Largest request head (request line + headers) the server accepts
+MAX_REQUEST_HEAD = 8192
+# Seconds a server worker waits on a silent client before dropping it, so idle
+# connections cannot hold every pooled worker
+CLIENT_TIMEOUT = 10.0
+
+_NO_ROUTES: Dict[str, Callable] = {}
+
+# POST bodies at least this large are sent beside the head, not copied into it
+VECTORED_WRITE_THRESHOLD = 65536
+
+
+def _tune_socket(
+    sock: socket.socket, sndbuf: Optional[int] = None, rcvbuf: Optional[int] = None
+) -> socket.socket:
+    """Disable Nagle for request/response traffic; optionally size kernel buffers."""
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    # Left at the OS default unless given, so Linux keeps autotuning them
+    if sndbuf:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, sndbuf)
+    if rcvbuf:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, rcvbuf)
+    return sock
+
+
+@functools.lru_cache(maxsize=256)
+def _request_prefix(method: str, host: str, path: str, connection: str) -> bytes:
+    """Encoded request line, Host and Connection headers, cached per target."""
+    return (
+        f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nConnection: {connection}\r\n"
+    ).encode()
+
+
+@functools.lru_cache(maxsize=256)
+def _bare_request(method: str, host: str, path: str, connection: str) -> bytes:
+    """Complete encoded request with no body or extra headers."""
+    return _request_prefix(method, host, path, connection) + b"\r\n"
+
+
+def _build_request(
+    method: str,
+    host: str,
+    path: str,
+    connection: str,
+    headers: Optional[Dict[str, str]] = None,
+    payload: Optional[bytes] = None,
+) -> List[bytes]:
+    """
+    Returns:
+        list: Buffers to send in order; a large payload is kept separate so it
+            is never copied into the head.
+    """
+    if payload is None and not headers:
+        return [_bare_request(method, host, path, connection)]
+    parts = [_request_prefix(method, host, path, connection)]
+    if payload is not None:
+        parts.append(b"Content-Length: %d\r\n" % len(payload))
+    if headers:
+        parts.extend(f"{k}: {v}\r\n".encode() for k, v in headers.items())
+    parts.append(b"\r\n")
+    if payload and len(payload) >= VECTORED_WRITE_THRESHOLD:
+        return [b"".join(parts), payload]
+    if payload:
+        parts.append(payload)
+    return [b"".join(parts)]
+
+
+def _send_request(sock: socket.socket, buffers: List[bytes]) -> None:
+    """Send request buffers, gathering head and body in one sendmsg() where possible."""
+    if len(buffers) == 1:
+        sock.sendall(buffers[0])
+        return
+    send_all_vectored(sock, buffers)
+
+
+def _parse_head(head: bytes) -> Tuple[Optional[int], bool, bool]:
+    """Return (content_length, keep_alive, chunked) from a response head."""
+    lines = head.split(b"\r\n")
+    content_length = None
+    keep_alive = lines[0].startswith(b"HTTP/1.1")
+    chunked = False
+    for line in lines[1:]:
+        name, _, value = line.partition(b":")
+        name = name.strip().lower()
+        if name == b"content-length":
+            try:
+                content_length = int(value.strip())
+            except ValueError:
+                content_length = None
+        elif name == b"connection":
+            keep_alive = value.strip().lower() == b"keep-alive"
+        elif name == b"transfer-encoding":
+            chunked = value.strip().lower().endswith(b"chunked")
+    return content_length, keep_alive, chunked
+
+
+def _recv_more(sock: socket.socket, buf: bytearray) -> bool:
+    """Append the next read to buf; False once the peer has closed."""
+    chunk = sock.recv(RECV_BUFFER_SIZE)
+    buf.extend(chunk)
+    return bool(chunk)
+
+
+def _read_chunked(sock: socket.socket, buf: bytearray, pos: int) -> Tuple[bytes, bool]:
+    """
+    Decode a Transfer-Encoding: chunked body that starts at buf[pos].
+    Returns:
+        tuple: (body, complete). complete is False if the peer closed or sent
+        a malformed chunk before the terminating zero-size chunk.
+    """
+    body = bytearray()
+    while True:
+        line_end = buf.find(b"\r\n", pos)
+        while line_end == -1:
+            if not _recv_more(sock, buf):
+                return bytes(body), False
+            line_end = buf.find(b"\r\n", pos)
+        try:
+            size = int(bytes(buf[pos:line_end]).split(b";", 1)[0], 16)
+        except ValueError:
+            return bytes(body), False
+        pos = line_end + 2
+        if size == 0:
+            break
+        while len(buf) < pos + size + 2:
+            if not _recv_more(sock, buf):
+                body += buf[pos : pos + size]
+                return bytes(body), False
+        body += buf[pos : pos + size]
+        pos += size + 2
+    # Skip any trailer fields up to the blank line that ends the message
+    while True:
+        line_end = buf.find(b"\r\n", pos)
+        if line_end == -1:
+            if not _recv_more(sock, buf):
+                return bytes(body), False
+            continue
+        if line_end == pos:
+            return bytes(body), True
+        pos = line_end + 2
+
+
+def _read_response(sock: socket.socket) -> Tuple[Optional[bytes], bool]:
+    """
+    Read an HTTP response. The body is framed by Transfer-Encoding: chunked or
+    Content-Length, so a keep-alive server never has to close the connection;
+    without either it is read until the peer closes.
+    Returns:
+        tuple: (body, reusable). body is None if the peer closed before sending
+        anything; reusable is True if the connection can carry another request.
+    """
+    resp = bytearray()
+    header_end = -1
+    while header_end == -1:
+        scan_from = max(0, len(resp) - 3)
+        if not _recv_more(sock, resp):
+            break
+        header_end = resp.find(b"\r\n\r\n", scan_from)
+    if not resp:
+        return None, False
+    if header_end == -1:
+        return bytes(resp), False
+    content_length, keep_alive, chunked = _parse_head(bytes(resp[:header_end]))
+    start = header_end + 4
+    if chunked:
+        body, complete = _read_chunked(sock, resp, start)
+        return body, keep_alive and complete
+    if content_length is None:
+        while _recv_more(sock, resp):
+            pass
+        return bytes(resp[start:]), False
+    while len(resp) - start < content_length and _recv_more(sock, resp):
+        pass
+    complete = len(resp) - start >= content_length
+    body = memoryview(resp)[start : start + content_length].tobytes()
+    return body, keep_alive and complete
+
+
+def _read_body(sock: socket.socket) -> bytes:
+    body, _ = _read_response(sock)
+    return body or b""
+
+
+# Idle keep-alive HTTPS connections and TLS sessions, keyed by (host, port, cafile)
+_HTTPS_POOL_MAX_IDLE = 4
+# Socket timeout in seconds for HTTPS connections, so a stalled peer cannot hang a call
+HTTPS_TIMEOUT = 30.0
+_https_pool: Dict[Tuple[str, int, Optional[str]], List[ssl.SSLSocket]] = {}
+_https_sessions: Dict[Tuple[str, int, Optional[str]], ssl.SSLSession] = {}
+_https_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=None)
+def _client_ssl_context(cafile: Optional[str]) -> ssl.SSLContext:
+    return (
+        ssl.create_default_context(cafile=cafile)
+        if cafile
+        else ssl.create_default_context()
+    )
+
+
+def _https_connect(key: Tuple[str, int, Optional[str]]) -> ssl.SSLSocket:
+    host, port, cafile = key
+    with _https_lock:
+        session = _https_sessions.get(key)
+    sock = _tune_socket(
+        socket.create_connection((host, port), timeout=HTTPS_TIMEOUT)
+    )
+    try:
+        # Offering the previous session lets the server resume it: faster handshake
+        return _client_ssl_context(cafile).wrap_socket(
+            sock, server_hostname=host, session=session
+        )
+    except Exception:
+        sock.close()
+        raise
+
+
+def _https_request(
+    host: str, port: int, cafile: Optional[str], req: List[bytes]
+) -> bytes:
+    key = (host, port, cafile)
+    with _https_lock:
+        idle = _https_pool.get(key)
+        ssock = idle.pop() if idle else None
+    body = None
+    if ssock is not None:
+        try:
+            _send_request(ssock, req)
+            body, reusable = _read_response(ssock)
+        except OSError:
+            body = None
+        if body is None:
+            # The server dropped the idle connection; retry on a fresh one
+            ssock.close()
+            ssock = None
+    if ssock is None:
+        ssock = _https_connect(key)
+        try:
+            _send_request(ssock, req)
+            body, reusable = _read_response(ssock)
+        except BaseException:
+            ssock.close()
+            raise
+    with _https_lock:
+        if ssock.session is not None:
+            _https_sessions[key] = ssock.session
+        idle = _https_pool.setdefault(key, [])
+        if reusable and len(idle) < _HTTPS_POOL_MAX_IDLE:
+            idle.append(ssock)
+            ssock = None
+    if ssock is not None:
+        ssock.close()
+    return body or b""
 
 
 def http_get(
-    host: str, port: int = 80, path: str = "/", headers: Optional[Dict[str, str]] = None
-) -> str:
+    host: str,
+    port: int = 80,
+    path: str = "/",
+    headers: Optional[Dict[str, str]] = None,
+    decode: bool = True,
+) -> Union[str, bytes]:
     """
     Perform a simple HTTP GET request.
     Args:
@@ -15,60 +289,43 @@ def http_get(
         port (int): Server port (default 80).
         path (str): Resource path (default '/').
         headers (dict): Optional headers.
+        decode (bool): Decode the body as text (default True); False returns raw bytes.
     Returns:
-        str: Response body.
+        str | bytes: Response body.
     """
-    sock = socket.create_connection((host, port))
-    req = f"GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n"
-    if headers:
-        for k, v in headers.items():
-            req += f"{k}: {v}\r\n"
-    req += "\r\n"
-    sock.sendall(req.encode())
-    resp = b""
-    while True:
-        chunk = sock.recv(4096)
-        if not chunk:
-            break
-        resp += chunk
+    sock = _tune_socket(socket.create_connection((host, port)))
+    _send_request(sock, _build_request("GET", host, path, "close", headers))
+    body = _read_body(sock)
     sock.close()
-    return resp.split(b"\r\n\r\n", 1)[-1].decode(errors="replace")
+    return body.decode(errors="replace") if decode else body
 
 
 def http_post(
     host: str,
     port: int = 80,
     path: str = "/",
-    data: str = "",
+    data: Union[str, bytes] = "",
     headers: Optional[Dict[str, str]] = None,
-) -> str:
+    decode: bool = True,
+) -> Union[str, bytes]:
     """
     Perform a simple HTTP POST request.
     Args:
         host (str): Server host.
         port (int): Server port (default 80).
         path (str): Resource path (default '/').
-        data (str): POST body.
+        data (str | bytes): POST body; str is UTF-8 encoded.
         headers (dict): Optional headers.
+        decode (bool): Decode the body as text (default True); False returns raw bytes.
     Returns:
-        str: Response body.
+        str | bytes: Response body.
     """
-    sock = socket.create_connection((host, port))
-    req = f"POST {path} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\nContent-Length: {len(data.encode())}\r\n"
-    if headers:
-        for k, v in headers.items():
-            req += f"{k}: {v}\r\n"
-    req += "\r\n"
-    req = req.encode() + data.encode()
-    sock.sendall(req)
-    resp = b""
-    while True:
-        chunk = sock.recv(4096)
-        if not chunk:
-            break
-        resp += chunk
+    payload = data.encode() if isinstance(data, str) else data
+    sock = _tune_socket(socket.create_connection((host, port)))
+    _send_request(sock, _build_request("POST", host, path, "close", headers, payload))
+    body = _read_body(sock)
     sock.close()
-    return resp.split(b"\r\n\r\n", 1)[-1].decode(errors="replace")
+    return body.decode(errors="replace") if decode else body
 
 
 def https_get(
@@ -77,7 +334,8 @@ def https_get(
     path: str = "/",
     headers: Optional[Dict[str, str]] = None,
     cafile: Optional[str] = None,
-) -> str:
+    decode: bool = True,
+) -> Union[str, bytes]:
     """
     Perform a simple HTTPS GET request.
     Args:
@@ -86,74 +344,41 @@ def https_get(
         path (str): Resource path (default '/').
         headers (dict): Optional headers.
         cafile (str): Path to CA file for server verification (optional).
+        decode (bool): Decode the body as text (default True); False returns raw bytes.
     Returns:
-        str: Response body.
+        str | bytes: Response body.
     """
-    context = (
-        ssl.create_default_context(cafile=cafile)
-        if cafile
-        else ssl.create_default_context()
-    )
-    sock = socket.create_connection((host, port))
-    ssock = context.wrap_socket(sock, server_hostname=host)
-    req = f"GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n"
-    if headers:
-        for k, v in headers.items():
-            req += f"{k}: {v}\r\n"
-    req += "\r\n"
-    ssock.sendall(req.encode())
-    resp = b""
-    while True:
-        chunk = ssock.recv(4096)
-        if not chunk:
-            break
-        resp += chunk
-    ssock.close()
-    return resp.split(b"\r\n\r\n", 1)[-1].decode(errors="replace")
+    req = _build_request("GET", host, path, "keep-alive", headers)
+    body = _https_request(host, port, cafile, req)
+    return body.decode(errors="replace") if decode else body
 
 
 def https_post(
     host: str,
     port: int = 443,
     path: str = "/",
-    data: str = "",
+    data: Union[str, bytes] = "",
     headers: Optional[Dict[str, str]] = None,
     cafile: Optional[str] = None,
-) -> str:
+    decode: bool = True,
+) -> Union[str, bytes]:
     """
     Perform a simple HTTPS POST request.
     Args:
         host (str): Server host.
         port (int): Server port (default 443).
         path (str): Resource path (default '/').
-        data (str): POST body.
+        data (str | bytes): POST body; str is UTF-8 encoded.
         headers (dict): Optional headers.
         cafile (str): Path to CA file for server verification (optional).
+        decode (bool): Decode the body as text (default True); False returns raw bytes.
     Returns:
-        str: Response body.
+        str | bytes: Response body.
     """
-    context = (
-        ssl.create_default_context(cafile=cafile)
-        if cafile
-        else ssl.create_default_context()
-    )
-    sock = socket.create_connection((host, port))
-    ssock = context.wrap_socket(sock, server_hostname=host)
-    req = f"POST {path} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\nContent-Length: {len(data.encode())}\r\n"
-    if headers:
-        for k, v in headers.items():
-            req += f"{k}: {v}\r\n"
-    req += "\r\n"
-    req = req.encode() + data.encode()
-    ssock.sendall(req)
-    resp = b""
-    while True:
-        chunk = ssock.recv(4096)
-        if not chunk:
-            break
-        resp += chunk
-    ssock.close()
-    return resp.split(b"\r\n\r\n", 1)[-1].decode(errors="replace")
+    payload = data.encode() if isinstance(data, str) else data
+    req = _build_request("POST", host, path, "keep-alive", headers, payload)
+    body = _https_request(host, port, cafile, req)
+    return body.decode(errors="replace") if decode else body
 
 
 def start_http_server(
@@ -162,6 +387,7 @@ def start_http_server(
     static_dir: Optional[str] = None,
     routes: Optional[Dict[Tuple[str, str], Callable]] = None,
     shutdown_event: Optional[threading.Event] = None,
+    max_workers: Optional[int] = None,
 ):
     """
     Start a minimal HTTP server.
@@ -171,6 +397,8 @@ def start_http_server(
         static_dir (str, optional): Directory to serve static files from (default None).
         routes (dict, optional): Mapping of (method, path) to handler function. Handler signature: (request, client_socket) -> None.
         shutdown_event (threading.Event, optional): For graceful shutdown.
+        max_workers (int, optional): Size of the worker thread pool handling
+            connections (default min(32, 4 * CPU count)).
     """
     sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
@@ -178,51 +406,112 @@ def start_http_server(
     sock.listen(5)
     print(f"[HTTP][SERVER] Listening on {host}:{port}")
 
+    # method -> path -> handler, built once so dispatch needs no key tuple
+    route_table: Dict[str, Dict[str, Callable]] = {}
+    for (route_method, route_path), route_handler in (routes or {}).items():
+        route_table.setdefault(route_method, {})[route_path] = route_handler
+
+    # rel_path -> (checked_at, file_path, mtime_ns, size, header, content or None)
+    static_cache = {}
+
+    def resolve_static(rel_path):
+        # Trust a cached entry for STATIC_CACHE_TTL seconds before re-validating
+        now = time.monotonic()
+        entry = static_cache.get(rel_path)
+        if entry is not None and now - entry[0] < STATIC_CACHE_TTL:
+            return entry
+        file_path = os.path.join(static_dir, rel_path)
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            st = None
+        if st is None or not stat.S_ISREG(st.st_mode):
+            static_cache.pop(rel_path, None)
+            return None
+        if entry is not None and entry[2:4] == (st.st_mtime_ns, st.st_size):
+            entry = (now,) + entry[1:]
+        else:
+            content = None
+            size = st.st_size
+            if size <= SENDFILE_THRESHOLD:
+                with open(file_path, "rb") as f:
+                    content = f.read()
+                size = len(content)
+            content_type = (
+                mimetypes.guess_type(file_path)[0] or "application/octet-stream"
+            )
+            header = (
+                f"HTTP/1.1 200 OK\r\nContent-Type: {content_type}\r\n"
+                f"Content-Length: {size}\r\n\r\n"
+            ).encode()
+            entry = (now, file_path, st.st_mtime_ns, size, header, content)
+        if rel_path not in static_cache and len(static_cache) >= STATIC_CACHE_SIZE:
+            static_cache.pop(next(iter(static_cache)), None)
+        static_cache[rel_path] = entry
+        return entry
+
     def serve_client(client_sock, addr):
         try:
-            req = b""
-            while b"\r\n\r\n" not in req:
-                chunk = client_sock.recv(1024)
-                if not chunk:
+            # Read the head into a fixed buffer, scanning only new bytes for the
+            # blank line that ends it
+            buf = bytearray(MAX_REQUEST_HEAD)
+            view = memoryview(buf)
+            n = 0
+            header_end = -1
+            while n < len(buf):
+                k = client_sock.recv_into(view[n:])
+                if not k:
+                    break
+                start = max(0, n - 3)
+                n += k
+                header_end = buf.find(b"\r\n\r\n", start, n)
+                if header_end != -1:
                     break
-                req += chunk
-            if not req:
+            if not n:
                 client_sock.close()
                 return
-            lines = req.decode(errors="replace").split("\r\n")
-            request_line = lines[0]
-            method, path, _ = request_line.split(" ", 2)
+            if header_end == -1 and n == len(buf):
+                client_sock.sendall(
+                    b"HTTP/1.1 431 Request Header Fields Too Large\r\nContent-Length: 0\r\n\r\n"
+                )
+                return
+            req = bytes(view[:n])
+            # Parse the head as bytes; only the request line and header values
+            # are decoded, never the body
+            head = req[:header_end] if header_end != -1 else req
+            lines = head.split(b"\r\n")
+            method, path, _ = lines[0].decode(errors="replace").split(" ", 2)
             headers = {}
             for line in lines[1:]:
-                if ": " in line:
-                    k, v = line.split(": ", 1)
-                    headers[k.lower()] = v
-                if line == "":
-                    break
+                k, sep, v = line.partition(b": ")
+                if sep:
+                    headers[k.decode("latin-1").lower()] = v.decode(errors="replace")
             # Route handler
-            if routes and (method, path) in routes:
+            handler = route_table.get(method, _NO_ROUTES).get(path)
+            if handler is not None:
                 request = {
                     "method": method,
                     "path": path,
                     "headers": headers,
                     "raw": req,
                 }
-                routes[(method, path)](request, client_sock)
+                handler(request, client_sock)
                 client_sock.close()
                 return
             # Static file
             if static_dir:
                 rel_path = path.lstrip("/") or "index.html"
-                file_path = os.path.join(static_dir, rel_path)
-                if os.path.isfile(file_path):
-                    with open(file_path, "rb") as f:
-                        content = f.read()
-                    client_sock.sendall(
-                        b"HTTP/1.1 200 OK\r\nContent-Length: "
-                        + str(len(content)).encode()
-                        + b"\r\n\r\n"
-                        + content
-                    )
+                entry = resolve_static(rel_path)
+                if entry is not None:
+                    _, file_path, _, size, header, content = entry
+                    if content is not None:
+                        # Small files are cached and go out in one write
+                        client_sock.sendall(header + content)
+                    else:
+                        # Let the kernel copy large files straight to the socket
+                        with open(file_path, "rb") as f:
+                            client_sock.sendall(header)
+                            client_sock.sendfile(f, count=size)
                 else:
                     client_sock.sendall(
                         b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\n\r\n"
@@ -231,6 +520,8 @@ def start_http_server(
                 client_sock.sendall(
                     b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\n\r\n"
                 )
+        except socket.timeout:
+            pass
         except Exception as e:
             try:
                 client_sock.sendall(
@@ -241,19 +532,42 @@ def start_http_server(
         finally:
             client_sock.close()
 
+    # Connections are served by a fixed pool of reused threads
+    if max_workers is None:
+        max_workers = min(32, (os.cpu_count() or 1) * 4)
+    pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="kn_http")
+    # Future -> client socket for connections still queued or being served
+    pending = {}
+
+    # Block until a connection arrives or shutdown_event is set; no timeout polling
+    sel = selectors.DefaultSelector()
+    sel.register(sock, selectors.EVENT_READ)
+    wakeup = None
+    if shutdown_event is not None:
+        wakeup = _EventWakeup(shutdown_event)
+        sel.register(wakeup, selectors.EVENT_READ)
     try:
         while True:
             if shutdown_event is not None and shutdown_event.is_set():
                 print("[HTTP][SERVER] Shutdown event set. Stopping server.")
                 break
-            sock.settimeout(1.0)
-            try:
+            for key, _ in sel.select():
+                if key.fileobj is not sock:
+                    continue
                 client_sock, addr = sock.accept()
-            except socket.timeout:
-                continue
-            threading.Thread(
-                target=serve_client, args=(client_sock, addr), daemon=True
-            ).start()
+                _tune_socket(client_sock)
+                client_sock.settimeout(CLIENT_TIMEOUT)
+                future = pool.submit(serve_client, client_sock, addr)
+                pending[future] = client_sock
+                future.add_done_callback(lambda f: pending.pop(f, None))
     finally:
+        # Queued connections never reach a worker; close them rather than leak them
+        for future, client_sock in list(pending.items()):
+            if future.cancel():
+                client_sock.close()
+        pool.shutdown(wait=False)
+        sel.close()
+        if wakeup is not None:
+            wakeup.close()
         sock.close()
         print("[HTTP][SERVER] Shutdown complete.")
@@ -3,7 +3,7 @@ import sys
 import socket
 import threading
 import time
-from kn_sock.tcp import _get_socket_family, BUFFER_SIZE
+from kn_sock.tcp import _get_socket_family, DEFAULT_RECV_BUFSIZE
 
 class KnSockInteractiveCLI(cmd.Cmd):
     intro = 'Welcome to the kn-sock interactive CLI. Type help or ? to list commands.\n'
@@ -70,7 +70,7 @@ class KnSockInteractiveCLI(cmd.Cmd):
             return
         s = self.connections[self.default_conn]
         try:
-            data = s.recv(BUFFER_SIZE)
+            data = s.recv(DEFAULT_RECV_BUFSIZE)
             if data:
                 msg = data.decode("utf-8", errors="replace")
                 self._add_history('recv', msg)
@@ -127,7 +127,7 @@ class KnSockInteractiveCLI(cmd.Cmd):
         while not self._stop_bg.is_set():
             try:
                 s.settimeout(0.5)
-                data = s.recv(BUFFER_SIZE)
+                data = s.recv(DEFAULT_RECV_BUFSIZE)
                 if data:
                     msg = data.decode("utf-8", errors="replace")
                     self._add_history('recv', msg)
@@ -13,7 +13,12 @@ BUFFER_SIZE = 1024
 
 
 def _recv_line(sock: socket.socket) -> bytes:
-    """Receive bytes from socket until newline (sync)."""
+    """
+    Receive bytes from socket until newline (sync). Reads one byte per recv so
+    nothing past the newline is consumed; use it only when the caller goes on
+    to read raw data from the socket, and a buffered sock.makefile("rb")
+    otherwise.
+    """
     buffer = b""
     while True:
         chunk = sock.recv(1)
@@ -52,12 +57,15 @@ def start_json_server(
 
     while True:
         client_sock, addr = server_socket.accept()
+        # Replies are small; don't let Nagle hold them behind a delayed ACK
+        client_sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
         print(f"[JSON][SYNC SERVER] Connection from {addr}")
 
-        with client_sock:
+        # Buffered reader: one recv() can carry several newline-framed messages
+        with client_sock, client_sock.makefile("rb") as rfile:
             try:
                 while True:
-                    data_bytes = _recv_line(client_sock)
+                    data_bytes = rfile.readline()
                     if not data_bytes:
                         break
                     data_str = data_bytes.decode("utf-8").strip()
@@ -82,11 +90,13 @@ def send_json(
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
         sock.settimeout(timeout)
         sock.connect((host, port))
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
         message = json.dumps(data) + "\n"
         sock.sendall(message.encode("utf-8"))
 
         try:
-            response_bytes = _recv_line(sock)
+            with sock.makefile("rb") as rfile:
+                response_bytes = rfile.readline()
             response_str = response_bytes.decode("utf-8").strip()
             return json.loads(response_str)
         except (socket.timeout, json.JSONDecodeError):
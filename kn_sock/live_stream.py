@@ -26,6 +26,110 @@ except ImportError as e:
 AUDIO_MAGIC = b"AUD0"
 
 
+def _open_video_capture(video_path):
+    # Let OpenCV use a hardware decoder (VAAPI, NVDEC, D3D11, ...) when its build
+    # has one, otherwise decode on the CPU as before
+    if hasattr(cv2, "CAP_PROP_HW_ACCELERATION"):
+        cap = cv2.VideoCapture(
+            video_path,
+            cv2.CAP_ANY,
+            [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY],
+        )
+        if cap.isOpened():
+            return cap
+        cap.release()
+    return cv2.VideoCapture(video_path)
+
+
+class _VideoBroadcaster:
+    """
+    Decodes one video file on a single thread and shares each frame with every
+    client watching it. Each frame is JPEG-encoded at most once per quality level.
+    """
+
+    def __init__(self, video_path, running):
+        self.video_path = video_path
+        self._running = running
+        self._cond = threading.Condition()
+        self._frame = None
+        self._timestamp = 0.0
+        self._seq = 0
+        self._packets = {}  # quality -> framed packet for the current frame
+        self._clients = 0
+        self._thread = None
+        self._failed = False
+
+    def attach(self):
+        with self._cond:
+            self._clients += 1
+            if self._thread is None:
+                self._failed = False
+                self._thread = threading.Thread(target=self._produce, daemon=True)
+                self._thread.start()
+
+    def detach(self):
+        with self._cond:
+            self._clients -= 1
+
+    def _produce(self):
+        cap = _open_video_capture(self.video_path)
+        if not cap.isOpened():
+            logger.error(
+                f"[!] Could not open video file: {self.video_path}. Try converting it to mp4 (H.264) format for best compatibility."
+            )
+            with self._cond:
+                self._failed = True
+                self._thread = None
+                self._cond.notify_all()
+            return
+        try:
+            while True:
+                with self._cond:
+                    # Stop decoding once the last client has left
+                    if self._clients <= 0 or not self._running.is_set():
+                        self._thread = None
+                        self._cond.notify_all()
+                        break
+                ret, frame = cap.read()
+                if not ret:
+                    cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                    continue
+                with self._cond:
+                    self._frame = frame
+                    self._timestamp = time.time()
+                    self._packets = {}
+                    self._seq += 1
+                    self._cond.notify_all()
+                time.sleep(1 / 30)
+        finally:
+            cap.release()
+
+    def next_packet(self, last_seq, quality):
+        """
+        Wait for a frame newer than last_seq.
+
+        Returns:
+            tuple: (seq, packet) with the frame framed as [8 bytes timestamp][4 bytes length][jpeg],
+            or None if the stream has stopped.
+        """
+        with self._cond:
+            while self._seq == last_seq:
+                if self._failed or not self._running.is_set():
+                    return None
+                self._cond.wait(timeout=0.5)
+            seq, frame, timestamp = self._seq, self._frame, self._timestamp
+            packet = self._packets.get(quality)
+        if packet is None:
+            # Encode outside the lock so the producer and other clients keep going
+            _, buffer = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+            data = buffer.tobytes()
+            packet = struct.pack("!dI", timestamp, len(data)) + data
+            with self._cond:
+                if self._seq == seq:
+                    self._packets[quality] = packet
+        return seq, packet
+
+
 class LiveStreamServer:
     """
     A server that streams video and audio from a file to multiple clients.
@@ -55,6 +159,8 @@ class LiveStreamServer:
         self._running = threading.Event()
         self._extract_audio(self.video_paths[0])
         self._client_quality = {}  # addr -> jpeg quality
+        self._broadcasters = {}  # video path -> _VideoBroadcaster
+        self._broadcasters_lock = threading.Lock()
 
     def _extract_audio(self, video_path):
         logger.info("[*] Extracting audio from video file...")
@@ -212,29 +318,32 @@ class LiveStreamServer:
                 self.clients.remove(client_socket)
             client_socket.close()
 
+    def _get_broadcaster(self, video_path):
+        with self._broadcasters_lock:
+            broadcaster = self._broadcasters.get(video_path)
+            if broadcaster is None:
+                broadcaster = _VideoBroadcaster(video_path, self._running)
+                self._broadcasters[video_path] = broadcaster
+            return broadcaster
+
     def _stream_video(self, client_socket, video_path):
-        cap = cv2.VideoCapture(video_path)
-        if not cap.isOpened():
-            logger.error(
-                f"[!] Could not open video file: {video_path}. Try converting it to mp4 (H.264) format for best compatibility."
-            )
-            return
+        broadcaster = self._get_broadcaster(video_path)
+        broadcaster.attach()
         addr = client_socket.getpeername()
-        while self._running.is_set():
-            ret, frame = cap.read()
-            if not ret:
-                cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
-                continue
-            quality = self._client_quality.get(addr, 80)
-            _, buffer = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
-            data = np.array(buffer).tobytes()
-            timestamp = time.time()
-            try:
-                client_socket.sendall(struct.pack("!dI", timestamp, len(data)) + data)
-            except (socket.error, BrokenPipeError):
-                break
-            time.sleep(1 / 30)
-        cap.release()
+        seq = 0
+        try:
+            while self._running.is_set():
+                quality = self._client_quality.get(addr, 80)
+                packet = broadcaster.next_packet(seq, quality)
+                if packet is None:
+                    break
+                seq, data = packet
+                try:
+                    client_socket.sendall(data)
+                except (socket.error, BrokenPipeError):
+                    break
+        finally:
+            broadcaster.detach()
 
     def _stream_audio(self, client_socket):
         try:
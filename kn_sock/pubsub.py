@@ -1,43 +1,156 @@
+import os
+import select
 import socket
 import threading
 import json
-from typing import Callable, Dict, Set, Optional
+import logging
+from typing import Callable, Dict, Iterable, Set, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+
+    _HAS_ORJSON = True
+except ImportError:
+    _HAS_ORJSON = False
+
+# Incoming frames are parsed straight from bytes; orjson is used when installed.
+_json_loads = orjson.loads if _HAS_ORJSON else json.loads
+
+# MQTT-style wildcards: "+" matches one topic level, "#" matches the rest.
+SINGLE_LEVEL_WILDCARD = "+"
+MULTI_LEVEL_WILDCARD = "#"
+
+RECV_BUFFER_SIZE = 65536
+# Compact separators keep frames small; the server accepts either form.
+JSON_SEPARATORS = (",", ":")
+
+
+def _is_wildcard(topic: str) -> bool:
+    return SINGLE_LEVEL_WILDCARD in topic or MULTI_LEVEL_WILDCARD in topic
+
+
+class _TopicNode:
+    __slots__ = ("children", "subscribers")
+
+    def __init__(self):
+        self.children: Dict[str, "_TopicNode"] = {}
+        self.subscribers: Set[socket.socket] = set()
+
+
+class _TopicTrie:
+    """
+    Trie of '/'-separated topic levels. Only holds wildcard subscriptions;
+    exact topics are looked up directly in PubSubServer.topics.
+    """
+
+    def __init__(self):
+        self.root = _TopicNode()
+
+    def add(self, pattern: str, client_sock: socket.socket):
+        node = self.root
+        for level in pattern.split("/"):
+            node = node.children.setdefault(level, _TopicNode())
+        node.subscribers.add(client_sock)
+
+    def discard(self, pattern: str, client_sock: socket.socket):
+        path = [self.root]
+        for level in pattern.split("/"):
+            node = path[-1].children.get(level)
+            if node is None:
+                return
+            path.append(node)
+        path[-1].subscribers.discard(client_sock)
+        # Prune empty branches so match() does not walk dead nodes
+        levels = pattern.split("/")
+        for i in range(len(levels), 0, -1):
+            node = path[i]
+            if node.subscribers or node.children:
+                break
+            del path[i - 1].children[levels[i - 1]]
+
+    def match(self, topic: str) -> Set[socket.socket]:
+        matched: Set[socket.socket] = set()
+        levels = topic.split("/")
+        stack = [(self.root, 0)]
+        while stack:
+            node, depth = stack.pop()
+            multi = node.children.get(MULTI_LEVEL_WILDCARD)
+            if multi is not None:
+                matched |= multi.subscribers
+            if depth == len(levels):
+                matched |= node.subscribers
+                continue
+            child = node.children.get(levels[depth])
+            if child is not None:
+                stack.append((child, depth + 1))
+            single = node.children.get(SINGLE_LEVEL_WILDCARD)
+            if single is not None:
+                stack.append((single, depth + 1))
+        return matched
 
 
 class PubSubServer:
     def __init__(self):
+        # Exact topic -> subscribers; the hot path for publish()
         self.topics: Dict[str, Set[socket.socket]] = {}
+        # Wildcard pattern -> subscribers, indexed by a trie for matching
+        self.wildcards: Dict[str, Set[socket.socket]] = {}
+        self._trie = _TopicTrie()
         self.lock = threading.Lock()
 
     def subscribe(self, topic: str, client_sock: socket.socket):
         with self.lock:
-            self.topics.setdefault(topic, set()).add(client_sock)
+            if _is_wildcard(topic):
+                self.wildcards.setdefault(topic, set()).add(client_sock)
+                self._trie.add(topic, client_sock)
+            else:
+                self.topics.setdefault(topic, set()).add(client_sock)
 
     def unsubscribe(self, topic: str, client_sock: socket.socket):
         with self.lock:
-            if topic in self.topics:
-                self.topics[topic].discard(client_sock)
-                if not self.topics[topic]:
-                    del self.topics[topic]
+            self._unsubscribe_locked(topic, client_sock)
+
+    def _unsubscribe_locked(self, topic: str, client_sock: socket.socket):
+        index = self.wildcards if _is_wildcard(topic) else self.topics
+        if topic in index:
+            index[topic].discard(client_sock)
+            if not index[topic]:
+                del index[topic]
+            if index is self.wildcards:
+                self._trie.discard(topic, client_sock)
+
+    def _subscribers(self, topic: str) -> Set[socket.socket]:
+        subscribers = set(self.topics.get(topic, ()))
+        if self.wildcards:
+            subscribers |= self._trie.match(topic)
+        return subscribers
 
     def publish(self, topic: str, message: str):
+        # Serialize once; every subscriber gets the same frame
+        data = (
+            json.dumps(
+                {"topic": topic, "message": message}, separators=JSON_SEPARATORS
+            ).encode()
+            + b"\n"
+        )
         with self.lock:
-            for sock in list(self.topics.get(topic, [])):
+            for sock in self._subscribers(topic):
                 try:
-                    data = (
-                        json.dumps({"topic": topic, "message": message}).encode()
-                        + b"\n"
-                    )
                     sock.sendall(data)
                 except Exception:
-                    self.topics[topic].discard(sock)
+                    self._remove_client_locked(sock)
 
     def remove_client(self, client_sock: socket.socket):
         with self.lock:
-            for topic in list(self.topics):
-                self.topics[topic].discard(client_sock)
-                if not self.topics[topic]:
-                    del self.topics[topic]
+            self._remove_client_locked(client_sock)
+
+    def _remove_client_locked(self, client_sock: socket.socket):
+        for topic in list(self.topics):
+            self._unsubscribe_locked(topic, client_sock)
+        for pattern in list(self.wildcards):
+            self._unsubscribe_locked(pattern, client_sock)
 
 
 def start_pubsub_server(
@@ -45,6 +158,9 @@ def start_pubsub_server(
     handler_func: Optional[Callable[[dict, socket.socket, PubSubServer], None]] = None,
     host: str = "0.0.0.0",
     shutdown_event: Optional[threading.Event] = None,
+    unix_path: Optional[str] = None,
+    reuse_port: bool = False,
+    ready_event: Optional[threading.Event] = None,
 ):
     """
     Start a TCP pub/sub server. Handles subscribe, unsubscribe, and publish actions.
@@ -53,26 +169,48 @@ def start_pubsub_server(
         handler_func (callable, optional): Custom handler for messages (default: built-in).
         host (str): Host to bind (default '0.0.0.0').
         shutdown_event (threading.Event, optional): For graceful shutdown.
+        unix_path (str, optional): Also accept clients on this Unix socket path,
+            a faster path for clients on the same host.
+        reuse_port (bool): Set SO_REUSEPORT so several server processes can share
+            the port. Each process keeps its own subscriptions, so publishers only
+            reach subscribers connected to the same process.
+        ready_event (threading.Event, optional): Set once the server is listening.
     """
     server = PubSubServer()
     sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if reuse_port:
+        if not hasattr(socket, "SO_REUSEPORT"):
+            raise OSError("SO_REUSEPORT is not supported on this platform")
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
     sock.bind((host, port))
     sock.listen(5)
-    print(f"[PubSub][SERVER] Listening on {host}:{port}")
+    logger.info(f"[PubSub][SERVER] Listening on {host}:{port}")
+    listeners = [sock]
+    if unix_path is not None:
+        if os.path.exists(unix_path):
+            os.unlink(unix_path)
+        unix_sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        unix_sock.bind(unix_path)
+        unix_sock.listen(5)
+        listeners.append(unix_sock)
+        logger.info(f"[PubSub][SERVER] Listening on {unix_path}")
+    if ready_event is not None:
+        ready_event.set()
 
     def client_thread(client_sock, addr):
         try:
             buffer = b""
             while True:
-                chunk = client_sock.recv(4096)
+                chunk = client_sock.recv(RECV_BUFFER_SIZE)
                 if not chunk:
                     break
                 buffer += chunk
-                while b"\n" in buffer:
-                    line, buffer = buffer.split(b"\n", 1)
+                # Handle every complete line from this recv in one pass
+                *lines, buffer = buffer.split(b"\n")
+                for line in lines:
                     try:
-                        msg = json.loads(line.decode())
+                        msg = _json_loads(line)
                     except Exception:
                         continue
                     if handler_func:
@@ -93,19 +231,36 @@ def start_pubsub_server(
     try:
         while True:
             if shutdown_event is not None and shutdown_event.is_set():
-                print("[PubSub][SERVER] Shutdown event set. Stopping server.")
+                logger.info("[PubSub][SERVER] Shutdown event set. Stopping server.")
                 break
-            sock.settimeout(1.0)
-            try:
-                client_sock, addr = sock.accept()
-            except socket.timeout:
-                continue
-            threading.Thread(
-                target=client_thread, args=(client_sock, addr), daemon=True
-            ).start()
+            readable, _, _ = select.select(listeners, [], [], 1.0)
+            for listener in readable:
+                client_sock, addr = listener.accept()
+                if listener is sock:
+                    client_sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                threading.Thread(
+                    target=client_thread, args=(client_sock, addr), daemon=True
+                ).start()
     finally:
-        sock.close()
-        print("[PubSub][SERVER] Shutdown complete.")
+        for listener in listeners:
+            listener.close()
+        if unix_path is not None and os.path.exists(unix_path):
+            os.unlink(unix_path)
+        logger.info("[PubSub][SERVER] Shutdown complete.")
+
+
+def _connect(host: str, port: int, unix_path: Optional[str]) -> socket.socket:
+    # Prefer the server's Unix socket when given, falling back to TCP
+    if unix_path is not None:
+        unix_sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            unix_sock.connect(unix_path)
+            return unix_sock
+        except OSError:
+            unix_sock.close()
+    sock = socket.create_connection((host, port))
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return sock
 
 
 class PubSubClient:
@@ -113,10 +268,12 @@ class PubSubClient:
     Simple TCP pub/sub client. Use subscribe, unsubscribe, publish, and recv methods.
     """
 
-    def __init__(self, host: str, port: int):
-        self.sock = socket.create_connection((host, port))
+    def __init__(self, host: str, port: int, unix_path: Optional[str] = None):
+        self.sock = _connect(host, port, unix_path)
         self.lock = threading.Lock()
-        self.recv_buffer = b""
+        self.recv_buffer = bytearray()
+        self._chunk = bytearray(RECV_BUFFER_SIZE)
+        self._timeout = self.sock.gettimeout()
 
     def subscribe(self, topic: str):
         self._send({"action": "subscribe", "topic": topic})
@@ -127,26 +284,51 @@ class PubSubClient:
     def publish(self, topic: str, message: str):
         self._send({"action": "publish", "topic": topic, "message": message})
 
+    def publish_many(self, messages: Iterable[Tuple[str, str]]):
+        """
+        Publish several (topic, message) pairs with a single send.
+
+        Args:
+            messages: Iterable of (topic, message) pairs.
+        """
+        frames = [
+            self._encode({"action": "publish", "topic": topic, "message": message})
+            for topic, message in messages
+        ]
+        if frames:
+            with self.lock:
+                self.sock.sendall(b"".join(frames))
+
     def recv(self, timeout: Optional[float] = None) -> Optional[dict]:
-        self.sock.settimeout(timeout)
         while True:
-            if b"\n" in self.recv_buffer:
-                line, self.recv_buffer = self.recv_buffer.split(b"\n", 1)
+            end = self.recv_buffer.find(b"\n")
+            if end != -1:
+                line = self.recv_buffer[:end]
+                del self.recv_buffer[: end + 1]
                 try:
-                    return json.loads(line.decode())
-                except Exception:
+                    return _json_loads(line)
+                except ValueError:
                     continue
+            # Buffered messages never touch the socket; only adjust it when needed
+            if timeout != self._timeout:
+                self.sock.settimeout(timeout)
+                self._timeout = timeout
             try:
-                chunk = self.sock.recv(4096)
-                if not chunk:
+                n = self.sock.recv_into(self._chunk)
+                if not n:
                     return None
-                self.recv_buffer += chunk
+                self.recv_buffer += memoryview(self._chunk)[:n]
             except socket.timeout:
                 return None
 
+    @staticmethod
+    def _encode(msg: dict) -> bytes:
+        return json.dumps(msg, separators=JSON_SEPARATORS).encode() + b"\n"
+
     def _send(self, msg: dict):
+        data = self._encode(msg)
         with self.lock:
-            self.sock.sendall(json.dumps(msg).encode() + b"\n")
+            self.sock.sendall(data)
 
     def close(self):
         self.sock.close()
@@ -1,7 +1,26 @@
+import os
+import select
 import socket
 import threading
 import json
-from typing import Callable, Dict, Any, Optional
+import logging
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+
+    _HAS_ORJSON = True
+except ImportError:
+    _HAS_ORJSON = False
+
+# Incoming frames are parsed straight from bytes; orjson is used when installed.
+_json_loads = orjson.loads if _HAS_ORJSON else json.loads
+
+RECV_BUFFER_SIZE = 65536
+# Compact separators keep frames small; both ends accept either form.
+JSON_SEPARATORS = (",", ":")
 
 
 class RPCServer:
@@ -31,6 +50,7 @@ def start_rpc_server(
     register_funcs: Dict[str, Callable],
     host: str = "0.0.0.0",
     shutdown_event: Optional[threading.Event] = None,
+    unix_path: Optional[str] = None,
 ):
     """
     Start a TCP JSON-RPC server. Registers functions and handles remote calls.
@@ -39,6 +59,8 @@ def start_rpc_server(
         register_funcs (dict): Mapping of function names to callables.
         host (str): Host to bind (default '0.0.0.0').
         shutdown_event (threading.Event, optional): For graceful shutdown.
+        unix_path (str, optional): Also accept clients on this Unix socket path,
+            a faster path for clients on the same host.
     """
     server = RPCServer()
     for name, func in register_funcs.items():
@@ -47,74 +69,182 @@ def start_rpc_server(
     sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
     sock.bind((host, port))
     sock.listen(5)
-    print(f"[RPC][SERVER] Listening on {host}:{port}")
+    logger.info(f"[RPC][SERVER] Listening on {host}:{port}")
+    listeners = [sock]
+    if unix_path is not None:
+        if os.path.exists(unix_path):
+            os.unlink(unix_path)
+        unix_sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        unix_sock.bind(unix_path)
+        unix_sock.listen(5)
+        listeners.append(unix_sock)
+        logger.info(f"[RPC][SERVER] Listening on {unix_path}")
 
     def client_thread(client_sock, addr):
         try:
             buffer = b""
             while True:
-                chunk = client_sock.recv(4096)
+                chunk = client_sock.recv(RECV_BUFFER_SIZE)
                 if not chunk:
                     break
                 buffer += chunk
-                while b"\n" in buffer:
-                    line, buffer = buffer.split(b"\n", 1)
+                # Answer every complete request from this recv with one send
+                *lines, buffer = buffer.split(b"\n")
+                responses = []
+                for line in lines:
                     try:
-                        req = json.loads(line.decode())
+                        req = _json_loads(line)
                     except Exception:
                         continue
                     resp = server.handle(req)
-                    client_sock.sendall(json.dumps(resp).encode() + b"\n")
+                    if "id" in req:
+                        resp["id"] = req["id"]
+                    responses.append(_encode(resp))
+                if responses:
+                    client_sock.sendall(b"".join(responses))
         finally:
             client_sock.close()
 
     try:
         while True:
             if shutdown_event is not None and shutdown_event.is_set():
-                print("[RPC][SERVER] Shutdown event set. Stopping server.")
+                logger.info("[RPC][SERVER] Shutdown event set. Stopping server.")
                 break
-            sock.settimeout(1.0)
-            try:
-                client_sock, addr = sock.accept()
-            except socket.timeout:
-                continue
-            threading.Thread(
-                target=client_thread, args=(client_sock, addr), daemon=True
-            ).start()
+            readable, _, _ = select.select(listeners, [], [], 1.0)
+            for listener in readable:
+                client_sock, addr = listener.accept()
+                if listener is sock:
+                    client_sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                threading.Thread(
+                    target=client_thread, args=(client_sock, addr), daemon=True
+                ).start()
     finally:
-        sock.close()
-        print("[RPC][SERVER] Shutdown complete.")
+        for listener in listeners:
+            listener.close()
+        if unix_path is not None and os.path.exists(unix_path):
+            os.unlink(unix_path)
+        logger.info("[RPC][SERVER] Shutdown complete.")
+
+
+def _encode(msg: dict) -> bytes:
+    return json.dumps(msg, separators=JSON_SEPARATORS).encode() + b"\n"
+
+
+def _connect(host: str, port: int, unix_path: Optional[str]) -> socket.socket:
+    # Prefer the server's Unix socket when given, falling back to TCP
+    if unix_path is not None:
+        unix_sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            unix_sock.connect(unix_path)
+            return unix_sock
+        except OSError:
+            unix_sock.close()
+    sock = socket.create_connection((host, port))
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return sock
 
 
 class RPCClient:
     """
-    Simple TCP JSON-RPC client. Use call(method, *args, **kwargs) to invoke remote functions.
+    Simple TCP JSON-RPC client. Use call(method, *args, **kwargs) to invoke remote
+    functions, or call_many to pipeline several calls in one round trip.
     """
 
-    def __init__(self, host: str, port: int):
-        self.sock = socket.create_connection((host, port))
+    def __init__(self, host: str, port: int, unix_path: Optional[str] = None):
+        self.sock = _connect(host, port, unix_path)
         self.lock = threading.Lock()
-        self.recv_buffer = b""
+        self.recv_buffer = bytearray()
+        self._next_id = 0
 
     def call(self, method: str, *args, **kwargs) -> Any:
         req = {"method": method, "params": args, "kwargs": kwargs}
         with self.lock:
-            self.sock.sendall(json.dumps(req).encode() + b"\n")
-            while True:
-                if b"\n" in self.recv_buffer:
-                    line, self.recv_buffer = self.recv_buffer.split(b"\n", 1)
-                    try:
-                        resp = json.loads(line.decode())
-                    except Exception:
-                        continue
-                    if "result" in resp:
-                        return resp["result"]
-                    elif "error" in resp:
-                        raise Exception(resp["error"])
-                chunk = self.sock.recv(4096)
-                if not chunk:
-                    raise ConnectionError("Connection closed")
-                self.recv_buffer += chunk
+            self.sock.sendall(_encode(req))
+            resp = self._read_response()
+        if "error" in resp:
+            raise Exception(resp["error"])
+        return resp["result"]
+
+    def call_many(self, calls: Iterable[Sequence[Any]]) -> List[Any]:
+        """
+        Send several calls at once and wait for all of their results.
+
+        Args:
+            calls: Iterable of (method, *args) tuples, or (method, args, kwargs)
+                tuples where args is a list/tuple and kwargs a dict, to pass
+                keyword arguments.
+
+        Returns:
+            list: Results in the same order as the calls. If any call failed, the
+            first error is raised after every response has been read.
+
+        Responses are matched to calls by id. A server that does not echo ids
+        answers in order, so responses without one are matched by position.
+        One response is read per call before anything is raised, so no reply
+        is left behind for the next call; a response with an id that was not
+        sent (or was already answered) then raises RuntimeError.
+        """
+        with self.lock:
+            frames = []
+            ids = []
+            for method, *args in calls:
+                kwargs = {}
+                if (
+                    len(args) == 2
+                    and isinstance(args[0], (list, tuple))
+                    and isinstance(args[1], dict)
+                ):
+                    args, kwargs = args
+                self._next_id += 1
+                ids.append(self._next_id)
+                req = {"id": self._next_id, "method": method, "params": args}
+                if kwargs:
+                    req["kwargs"] = kwargs
+                frames.append(_encode(req))
+            if not frames:
+                return []
+            self.sock.sendall(b"".join(frames))
+            responses = {}
+            unexpected = []
+            pending = iter(ids)
+            for _ in ids:
+                resp = self._read_response()
+                req_id = resp.get("id")
+                if req_id is None:
+                    # Older servers don't echo ids; take the next unanswered call
+                    req_id = next((i for i in pending if i not in responses), None)
+                if req_id in ids and req_id not in responses:
+                    responses[req_id] = resp
+                else:
+                    unexpected.append(resp.get("id"))
+        if unexpected:
+            raise RuntimeError(f"Unexpected RPC response id: {unexpected[0]!r}")
+        results = []
+        for req_id in ids:
+            resp = responses[req_id]
+            if "error" in resp:
+                raise Exception(resp["error"])
+            results.append(resp["result"])
+        return results
+
+    def _read_response(self) -> dict:
+        # Caller holds self.lock
+        while True:
+            end = self.recv_buffer.find(b"\n")
+            if end != -1:
+                line = self.recv_buffer[:end]
+                del self.recv_buffer[: end + 1]
+                try:
+                    resp = _json_loads(line)
+                except ValueError:
+                    continue
+                if "result" in resp or "error" in resp:
+                    return resp
+                continue
+            chunk = self.sock.recv(RECV_BUFFER_SIZE)
+            if not chunk:
+                raise ConnectionError("Connection closed")
+            self.recv_buffer += chunk
 
     def close(self):
         self.sock.close()
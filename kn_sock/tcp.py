@@ -1,17 +1,39 @@
 # kn_sock/tcp.py
 
+import os
+import selectors
 import socket
 import threading
 import asyncio
+import functools
 import logging
-from typing import Callable, Awaitable, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    BinaryIO,
+    Callable,
+    Awaitable,
+    Deque,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 import ssl
-import queue
 import time
+import weakref
+from collections import deque
+
+from kn_sock.utils import _EventWakeup, send_all_vectored
 
 logger = logging.getLogger(__name__)
 
-BUFFER_SIZE = 1024
+# Bytes requested per recv()/read(); pass bufsize=1024 for small-message protocols
+DEFAULT_RECV_BUFSIZE = 65536
+BUFFER_SIZE = DEFAULT_RECV_BUFSIZE  # backwards-compatible alias
+# StreamReader buffer high-water mark for the async servers (asyncio default is 64 KiB)
+DEFAULT_STREAM_LIMIT = 1 << 20
 
 
 def _get_socket_family(host):
@@ -21,6 +43,115 @@ def _get_socket_family(host):
     return socket.AF_INET
 
 
+def _tune_sock(s, sndbuf=None, rcvbuf=None):
+    # Disable Nagle so small replies are not held behind delayed ACKs
+    s.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    s.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    # Kernel buffers are left at the OS default (autotuned on Linux) unless a
+    # size is given; 256 KiB-1 MiB suits bulk transfers on fast links
+    if sndbuf:
+        s.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, sndbuf)
+    if rcvbuf:
+        s.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, rcvbuf)
+    return s
+
+
+def _set_reuse(s, reuse_port):
+    # SO_REUSEADDR lets a restarted server rebind while old sockets sit in TIME_WAIT
+    s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if reuse_port:
+        if not hasattr(socket, "SO_REUSEPORT"):
+            raise OSError("SO_REUSEPORT is not supported on this platform")
+        s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+
+
+def _connect(host, port, unix_path=None, sndbuf=None, rcvbuf=None):
+    # Prefer the server's Unix socket when given, falling back to TCP
+    if unix_path is not None:
+        unix_sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            unix_sock.connect(unix_path)
+            return unix_sock
+        except OSError:
+            unix_sock.close()
+    return _tune_sock(socket.create_connection((host, port)), sndbuf, rcvbuf)
+
+
+@functools.lru_cache(maxsize=32)
+def _build_client_context(cafile, certfile, keyfile, verify, alpn_protocols, stamps):
+    # stamps holds the PEM mtimes; it only keys the cache so edited files reload
+    context = ssl.create_default_context(ssl.Purpose.SERVER_AUTH, cafile=cafile)
+    context.minimum_version = ssl.TLSVersion.TLSv1_2
+    if not verify:
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    if certfile and keyfile:
+        context.load_cert_chain(certfile=certfile, keyfile=keyfile)
+    if alpn_protocols:
+        context.set_alpn_protocols(list(alpn_protocols))
+    return context
+
+
+def _get_client_context(
+    cafile=None, certfile=None, keyfile=None, verify=True, alpn_protocols=None
+):
+    # One SSLContext per configuration: PEM files are parsed once, not per call
+    stamps = tuple(
+        os.stat(path).st_mtime_ns if path else None
+        for path in (cafile, certfile, keyfile)
+    )
+    return _build_client_context(
+        cafile,
+        certfile,
+        keyfile,
+        verify,
+        tuple(alpn_protocols) if alpn_protocols else None,
+        stamps,
+    )
+
+
+# Last TLS session per (host, port, context), offered on reconnect so the
+# server can resume it instead of running a full handshake
+_ssl_sessions = {}
+_ssl_sessions_lock = threading.Lock()
+
+
+def _get_ssl_session(host, port, context):
+    with _ssl_sessions_lock:
+        return _ssl_sessions.get((host, port, context))
+
+
+def _store_ssl_session(host, port, context, ssock):
+    # TLS 1.3 tickets arrive after the handshake, so call this once data has flowed
+    session = ssock.session
+    if session is not None:
+        with _ssl_sessions_lock:
+            _ssl_sessions[(host, port, context)] = session
+
+
+def _recv_view(mv, n, zero_copy):
+    # Servers recv_into one reusable buffer; copy out unless the handler opted in
+    return mv[:n] if zero_copy else bytes(mv[:n])
+
+
+# Messages up to this length are cached by _encode; longer ones are not worth it
+_ENCODE_CACHE_MAX_LEN = 1024
+
+
+@functools.lru_cache(maxsize=256)
+def _encode_cached(message: str) -> bytes:
+    return message.encode("utf-8")
+
+
+def _encode(message: Union[str, bytes, memoryview]):
+    # Clients often resend the same short messages; skip re-encoding them
+    if not isinstance(message, str):
+        return message
+    if len(message) <= _ENCODE_CACHE_MAX_LEN:
+        return _encode_cached(message)
+    return message.encode("utf-8")
+
+
 # -----------------------------
 # 🖥️ TCP Server (Synchronous)
 # -----------------------------
@@ -31,6 +162,11 @@ def start_tcp_server(
     handler_func: Callable[[bytes, tuple, socket.socket], None],
     host: str = "0.0.0.0",
     shutdown_event: Optional[threading.Event] = None,
+    bufsize: int = DEFAULT_RECV_BUFSIZE,
+    zero_copy: bool = False,
+    sndbuf: Optional[int] = None,
+    rcvbuf: Optional[int] = None,
+    reuse_port: bool = False,
 ):
     """
     Starts a synchronous TCP server (IPv4/IPv6 supported).
@@ -38,31 +174,84 @@ def start_tcp_server(
         port (int): Port to bind.
         handler_func (callable): Function to handle (data, addr, client_socket).
         host (str): Host to bind (IPv4 or IPv6).
-        shutdown_event (threading.Event, optional): If provided, server will exit when event is set.
+        shutdown_event (threading.Event, optional): If provided, server will exit
+            when event is set.
+        bufsize (int): Maximum bytes read per recv (default 64 KiB).
+        zero_copy (bool): Pass the handler a memoryview into the receive buffer
+            instead of a bytes copy. The view is only valid until the next recv.
+        sndbuf (int, optional): SO_SNDBUF size in bytes (OS default if None).
+        rcvbuf (int, optional): SO_RCVBUF size in bytes (OS default if None).
+        reuse_port (bool): Set SO_REUSEPORT so several server processes can bind the
+            same port; the kernel spreads incoming connections across them.
     """
     family = _get_socket_family(host)
     server_socket = socket.socket(family, socket.SOCK_STREAM)
+    _set_reuse(server_socket, reuse_port)
     server_socket.bind((host, port))
     server_socket.listen(5)
-    logger.info(f"[TCP] Server listening on {host}:{port}")
+    # Wake up once a second to check shutdown_event
+    server_socket.settimeout(1.0)
+    logger.info("[TCP] Server listening on %s:%s", host, port)
+    buf = bytearray(bufsize)
+    mv = memoryview(buf)
 
     while True:
         if shutdown_event is not None and shutdown_event.is_set():
             logger.info("[TCP] Shutdown event set. Stopping server.")
             break
         try:
-            server_socket.settimeout(1.0)
             client_socket, addr = server_socket.accept()
         except socket.timeout:
             continue
-        logger.info(f"[TCP] Connection from {addr}")
-        data = client_socket.recv(BUFFER_SIZE)
-        if data:
-            handler_func(data, addr, client_socket)
+        _tune_sock(client_socket, sndbuf, rcvbuf)
+        logger.info("[TCP] Connection from %s", addr)
+        n = client_socket.recv_into(mv)
+        if n:
+            handler_func(_recv_view(mv, n, zero_copy), addr, client_socket)
         client_socket.close()
     server_socket.close()
 
 
+def start_tcp_server_reuseport(
+    port: int,
+    handler_func: Callable[[bytes, tuple, socket.socket], None],
+    num_workers: Optional[int] = None,
+    shutdown_event: Optional[threading.Event] = None,
+    **kwargs,
+):
+    """
+    Runs num_workers copies of start_tcp_server in threads, each with its own
+    listening socket bound to the same port with SO_REUSEPORT. The kernel
+    hashes incoming connections across the listeners, so one slow client only
+    stalls its own accept loop instead of the whole server. Handlers still
+    share the GIL; use start_async_tcp_server_multi for CPU-bound handlers.
+    Requires SO_REUSEPORT (Linux, BSD, macOS).
+    Args:
+        port (int): Port to bind.
+        handler_func (callable): Function to handle (data, addr, client_socket).
+        num_workers (int, optional): Number of listeners (default CPU count).
+        shutdown_event (threading.Event, optional): Stops every listener when set.
+        **kwargs: Passed through to start_tcp_server (host, bufsize, ...).
+    """
+    if "reuse_port" in kwargs:
+        raise TypeError("reuse_port is always enabled")
+    num_workers = num_workers or os.cpu_count() or 1
+    threads = [
+        threading.Thread(
+            target=start_tcp_server,
+            args=(port, handler_func),
+            kwargs=dict(kwargs, shutdown_event=shutdown_event, reuse_port=True),
+            daemon=True,
+        )
+        for _ in range(num_workers)
+    ]
+    for t in threads:
+        t.start()
+    logger.info("[TCP] Started %d SO_REUSEPORT listeners on port %s", num_workers, port)
+    for t in threads:
+        t.join()
+
+
 # -----------------------------
 # 🧵 Threaded TCP Server
 # -----------------------------
@@ -73,6 +262,13 @@ def start_threaded_tcp_server(
     handler_func: Callable[[bytes, tuple, socket.socket], None],
     host: str = "0.0.0.0",
     shutdown_event: Optional[threading.Event] = None,
+    bufsize: int = DEFAULT_RECV_BUFSIZE,
+    zero_copy: bool = False,
+    sndbuf: Optional[int] = None,
+    rcvbuf: Optional[int] = None,
+    reuse_port: bool = False,
+    max_workers: Optional[int] = None,
+    backlog: int = 1024,
 ):
     """
     Starts a threaded TCP server (IPv4/IPv6 supported).
@@ -80,29 +276,50 @@ def start_threaded_tcp_server(
         port (int): Port to bind.
         handler_func (callable): Function to handle (data, addr, client_socket).
         host (str): Host to bind (IPv4 or IPv6).
-        shutdown_event (threading.Event, optional): If provided, server will exit when event is set.
+        shutdown_event (threading.Event, optional): If provided, server will exit
+            when event is set.
+        bufsize (int): Maximum bytes read per recv (default 64 KiB).
+        zero_copy (bool): Pass the handler a memoryview into the per-connection
+            receive buffer instead of a bytes copy. The view is only valid
+            until the next recv on that connection.
+        sndbuf (int, optional): SO_SNDBUF size in bytes (OS default if None).
+        rcvbuf (int, optional): SO_RCVBUF size in bytes (OS default if None).
+        reuse_port (bool): Set SO_REUSEPORT so several server processes can bind the
+            same port; the kernel spreads incoming connections across them.
+        max_workers (int, optional): Size of the worker thread pool serving
+            connections (default min(32, 4 * CPU count)). Connections beyond
+            this wait in the pool's queue until a worker frees up.
+        backlog (int): Listen backlog for pending connections (default 1024).
     """
     family = _get_socket_family(host)
     server_socket = socket.socket(family, socket.SOCK_STREAM)
+    _set_reuse(server_socket, reuse_port)
     server_socket.bind((host, port))
-    server_socket.listen(10)
-    logger.info(f"[TCP] Threaded server listening on {host}:{port}")
+    server_socket.listen(backlog)
+    # Wake up once a second to check shutdown_event
+    server_socket.settimeout(1.0)
+    logger.info("[TCP] Threaded server listening on %s:%s", host, port)
 
-    client_threads = []
+    # Connections are served by a fixed pool of reused threads
+    if max_workers is None:
+        max_workers = min(32, (os.cpu_count() or 1) * 4)
+    pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="kn_tcp")
 
     def client_thread(client_socket, addr):
-        logger.info(f"[TCP] Client thread started for {addr}")
+        logger.info("[TCP] Client thread started for %s", addr)
+        buf = bytearray(bufsize)
+        mv = memoryview(buf)
         try:
             while True:
-                data = client_socket.recv(BUFFER_SIZE)
-                if not data:
+                n = client_socket.recv_into(mv)
+                if not n:
                     break
-                handler_func(data, addr, client_socket)
+                handler_func(_recv_view(mv, n, zero_copy), addr, client_socket)
         except ConnectionResetError:
-            logger.warning(f"[TCP] Connection lost from {addr}")
+            logger.warning("[TCP] Connection lost from %s", addr)
         finally:
             client_socket.close()
-            logger.info(f"[TCP] Connection closed for {addr}")
+            logger.info("[TCP] Connection closed for %s", addr)
 
     try:
         while True:
@@ -110,49 +327,388 @@ def start_threaded_tcp_server(
                 logger.info("[TCP] Shutdown event set. Stopping threaded server.")
                 break
             try:
-                server_socket.settimeout(1.0)
                 client_socket, addr = server_socket.accept()
             except socket.timeout:
                 continue
-            t = threading.Thread(target=client_thread, args=(client_socket, addr))
-            t.start()
-            client_threads.append(t)
+            _tune_sock(client_socket, sndbuf, rcvbuf)
+            pool.submit(client_thread, client_socket, addr)
     finally:
         server_socket.close()
-        for t in client_threads:
-            t.join()
+        pool.shutdown(wait=True)
         logger.info("[TCP] Threaded server shutdown complete.")
 
 
+# -----------------------------
+# 🔀 Selector TCP Server
+# -----------------------------
+
+
+def start_selector_tcp_server(
+    port: int,
+    handler_func: Callable[[bytes, tuple, socket.socket], None],
+    host: str = "0.0.0.0",
+    shutdown_event: Optional[threading.Event] = None,
+    bufsize: int = DEFAULT_RECV_BUFSIZE,
+    zero_copy: bool = False,
+    sndbuf: Optional[int] = None,
+    rcvbuf: Optional[int] = None,
+    reuse_port: bool = False,
+    backlog: int = 1024,
+    unix_path: Optional[str] = None,
+):
+    """
+    Starts a single-threaded TCP server that multiplexes all connections with
+    a selector (epoll on Linux, kqueue on BSD/macOS).
+    The handler runs on the selector thread, so it should not block for long.
+    Args:
+        port (int): Port to bind.
+        handler_func (callable): Function to handle (data, addr, client_socket).
+        host (str): Host to bind (IPv4 or IPv6).
+        shutdown_event (threading.Event, optional): If provided, server will exit
+            when event is set.
+        bufsize (int): Maximum bytes read per recv (default 64 KiB).
+        zero_copy (bool): Pass the handler a memoryview into the per-connection
+            receive buffer instead of a bytes copy. The view is only valid
+            until the next recv on that connection.
+        sndbuf (int, optional): SO_SNDBUF size in bytes (OS default if None).
+        rcvbuf (int, optional): SO_RCVBUF size in bytes (OS default if None).
+        reuse_port (bool): Set SO_REUSEPORT so several server processes can bind the
+            same port; the kernel spreads incoming connections across them.
+        backlog (int): Listen backlog for pending connections (default 1024).
+        unix_path (str, optional): Also accept clients on this Unix socket path,
+            which skips the TCP/IP stack for clients on the same host.
+    """
+    family = _get_socket_family(host)
+    server_socket = socket.socket(family, socket.SOCK_STREAM)
+    _set_reuse(server_socket, reuse_port)
+    server_socket.bind((host, port))
+    server_socket.listen(backlog)
+    server_socket.setblocking(False)
+    logger.info("[TCP] Selector server listening on %s:%s", host, port)
+    listeners = [server_socket]
+    if unix_path is not None:
+        if os.path.exists(unix_path):
+            os.unlink(unix_path)
+        unix_sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        unix_sock.bind(unix_path)
+        unix_sock.listen(backlog)
+        unix_sock.setblocking(False)
+        listeners.append(unix_sock)
+        logger.info("[TCP] Selector server listening on %s", unix_path)
+
+    sel = selectors.DefaultSelector()
+    for listener in listeners:
+        sel.register(listener, selectors.EVENT_READ)
+    wakeup = None
+    if shutdown_event is not None:
+        wakeup = _EventWakeup(shutdown_event)
+        sel.register(wakeup, selectors.EVENT_READ)
+
+    def drop(client_socket, addr):
+        sel.unregister(client_socket)
+        client_socket.close()
+        logger.info("[TCP] Connection closed for %s", addr)
+
+    try:
+        while True:
+            if shutdown_event is not None and shutdown_event.is_set():
+                logger.info("[TCP] Shutdown event set. Stopping selector server.")
+                break
+            for key, _ in sel.select():
+                if key.fileobj is wakeup:
+                    continue
+                if key.fileobj in listeners:
+                    try:
+                        client_socket, addr = key.fileobj.accept()
+                    except BlockingIOError:
+                        continue
+                    if key.fileobj is server_socket:
+                        _tune_sock(client_socket, sndbuf, rcvbuf)
+                    logger.info("[TCP] Connection from %s", addr)
+                    # Each connection keeps its own receive buffer for its lifetime
+                    mv = memoryview(bytearray(bufsize))
+                    sel.register(client_socket, selectors.EVENT_READ, (addr, mv))
+                    continue
+                client_socket = key.fileobj
+                addr, mv = key.data
+                try:
+                    n = client_socket.recv_into(mv)
+                except ConnectionResetError:
+                    logger.warning("[TCP] Connection lost from %s", addr)
+                    n = 0
+                if not n:
+                    drop(client_socket, addr)
+                    continue
+                try:
+                    handler_func(_recv_view(mv, n, zero_copy), addr, client_socket)
+                except Exception as e:
+                    logger.error("[TCP] Handler error for %s: %s", addr, e)
+                    drop(client_socket, addr)
+    finally:
+        for key in list(sel.get_map().values()):
+            if key.fileobj not in listeners and key.fileobj is not wakeup:
+                key.fileobj.close()
+        sel.close()
+        if wakeup is not None:
+            wakeup.close()
+        for listener in listeners:
+            listener.close()
+        if unix_path is not None and os.path.exists(unix_path):
+            os.unlink(unix_path)
+        logger.info("[TCP] Selector server shutdown complete.")
+
+
+def start_iouring_tcp_server(
+    port: int,
+    handler_func: Callable[[bytes, tuple, socket.socket], None],
+    host: str = "0.0.0.0",
+    shutdown_event: Optional[threading.Event] = None,
+    bufsize: int = DEFAULT_RECV_BUFSIZE,
+    zero_copy: bool = False,
+    sndbuf: Optional[int] = None,
+    rcvbuf: Optional[int] = None,
+    reuse_port: bool = False,
+    backlog: int = 1024,
+):
+    """
+    Experimental: starts a single-threaded TCP server driven by io_uring, with
+    one multishot accept on the listener and one recv in flight per client.
+    Requires Linux and the liburing bindings (pip install liburing); otherwise
+    it logs a warning and runs start_selector_tcp_server instead.
+    The handler runs on the server thread, so it should not block for long.
+    Args:
+        port (int): Port to bind.
+        handler_func (callable): Function to handle (data, addr, client_socket).
+        host (str): Host to bind (IPv4 or IPv6).
+        shutdown_event (threading.Event, optional): If provided, server will exit
+            when event is set.
+        bufsize (int): Maximum bytes read per recv (default 64 KiB).
+        zero_copy (bool): Pass the handler a memoryview into the per-connection
+            receive buffer instead of a bytes copy. The view is only valid
+            until the handler returns.
+        sndbuf (int, optional): SO_SNDBUF size in bytes (OS default if None).
+        rcvbuf (int, optional): SO_RCVBUF size in bytes (OS default if None).
+        reuse_port (bool): Set SO_REUSEPORT so several server processes can bind the
+            same port; the kernel spreads incoming connections across them.
+        backlog (int): Listen backlog for pending connections (default 1024).
+    """
+    try:
+        from kn_sock import _iouring
+    except ImportError as e:
+        logger.warning("[TCP] io_uring unavailable (%s); using selector server", e)
+        return start_selector_tcp_server(
+            port,
+            handler_func,
+            host=host,
+            shutdown_event=shutdown_event,
+            bufsize=bufsize,
+            zero_copy=zero_copy,
+            sndbuf=sndbuf,
+            rcvbuf=rcvbuf,
+            reuse_port=reuse_port,
+            backlog=backlog,
+        )
+    family = _get_socket_family(host)
+    server_socket = socket.socket(family, socket.SOCK_STREAM)
+    _set_reuse(server_socket, reuse_port)
+    server_socket.bind((host, port))
+    server_socket.listen(backlog)
+    logger.info("[TCP] io_uring server listening on %s:%s", host, port)
+    try:
+        _iouring.serve(
+            server_socket,
+            handler_func,
+            shutdown_event,
+            bufsize,
+            zero_copy,
+            lambda client_socket: _tune_sock(client_socket, sndbuf, rcvbuf),
+        )
+    finally:
+        server_socket.close()
+        logger.info("[TCP] io_uring server shutdown complete.")
+
+
 # -----------------------------
 # 📤 TCP Client (Sync)
 # -----------------------------
 
 
-def send_tcp_message(host: str, port: int, message: str):
+def send_tcp_message(
+    host: str,
+    port: int,
+    message: Union[str, bytes, memoryview],
+    bufsize: int = DEFAULT_RECV_BUFSIZE,
+    sndbuf: Optional[int] = None,
+    rcvbuf: Optional[int] = None,
+):
     """
     Sends a message to a TCP server (IPv4/IPv6 supported).
+    Args:
+        message (str, bytes or memoryview): Payload; bytes are sent without copying
+            or encoding, so pass pre-encoded bytes when sending in a loop.
+        bufsize (int): Maximum bytes read for the response (default 64 KiB).
+        sndbuf (int, optional): SO_SNDBUF size in bytes (OS default if None).
+        rcvbuf (int, optional): SO_RCVBUF size in bytes (OS default if None).
     """
     family = _get_socket_family(host)
     with socket.socket(family, socket.SOCK_STREAM) as client_socket:
         client_socket.connect((host, port))
-        client_socket.sendall(message.encode("utf-8"))
+        _tune_sock(client_socket, sndbuf, rcvbuf)
+        client_socket.sendall(_encode(message))
         try:
-            response = client_socket.recv(BUFFER_SIZE)
-            logger.info(f"[TCP] Server response: {response.decode('utf-8')}")
-        except:
-            pass
+            response = client_socket.recv(bufsize)
+        except OSError as e:
+            logger.debug("[TCP] No response from server: %s", e)
+            response = b""
+        if response and logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "[TCP] Server response: %s", response.decode("utf-8", errors="replace")
+            )
 
 
-def send_tcp_bytes(host: str, port: int, data: bytes):
+def send_tcp_bytes(
+    host: str,
+    port: int,
+    data: bytes,
+    bufsize: int = DEFAULT_RECV_BUFSIZE,
+    sndbuf: Optional[int] = None,
+    rcvbuf: Optional[int] = None,
+):
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as client_socket:
         client_socket.connect((host, port))
+        _tune_sock(client_socket, sndbuf, rcvbuf)
         client_socket.sendall(data)
         try:
-            response = client_socket.recv(BUFFER_SIZE)
-            logger.info(f"[TCP] Server response: {response}")
-        except:
-            pass
+            response = client_socket.recv(bufsize)
+        except OSError as e:
+            logger.debug("[TCP] No response from server: %s", e)
+            response = b""
+        if response:
+            logger.info("[TCP] Server response: %s", response)
+
+
+def send_tcp_file(
+    host: str,
+    port: int,
+    file: Union[str, BinaryIO],
+    sndbuf: Optional[int] = None,
+    rcvbuf: Optional[int] = None,
+) -> int:
+    """
+    Sends the raw contents of a file over TCP with socket.sendfile(), which
+    lets the kernel copy file pages straight to the socket (sendfile(2) on
+    Linux, TransmitFile on Windows) and falls back to send() elsewhere.
+    Args:
+        host (str): Server host.
+        port (int): Server port.
+        file (str or binary file object): Path, or a file opened in binary mode.
+            A file object is sent from its current position.
+        sndbuf (int, optional): SO_SNDBUF size in bytes (OS default if None).
+        rcvbuf (int, optional): SO_RCVBUF size in bytes (OS default if None).
+    Returns:
+        int: Number of bytes sent.
+    """
+    family = _get_socket_family(host)
+    with socket.socket(family, socket.SOCK_STREAM) as client_socket:
+        client_socket.connect((host, port))
+        _tune_sock(client_socket, sndbuf, rcvbuf)
+        if isinstance(file, str):
+            with open(file, "rb") as f:
+                return client_socket.sendfile(f)
+        # sendfile() defaults to offset 0; start from the caller's position instead
+        return client_socket.sendfile(file, file.tell())
+
+
+def send_tcp_vectored(
+    host: str,
+    port: int,
+    buffers: Sequence[bytes],
+    *,
+    sndbuf: Optional[int] = None,
+    rcvbuf: Optional[int] = None,
+) -> int:
+    """
+    Sends several buffers (e.g. a header and a body) over TCP as one stream,
+    gathered into a single sendmsg() call instead of being concatenated first.
+    Args:
+        host (str): Server host.
+        port (int): Server port.
+        buffers (sequence of bytes-like): Buffers to send, in order.
+        sndbuf (int, optional): SO_SNDBUF size in bytes (OS default if None).
+        rcvbuf (int, optional): SO_RCVBUF size in bytes (OS default if None).
+    Returns:
+        int: Number of bytes sent.
+    """
+    family = _get_socket_family(host)
+    with socket.socket(family, socket.SOCK_STREAM) as client_socket:
+        client_socket.connect((host, port))
+        _tune_sock(client_socket, sndbuf, rcvbuf)
+        return send_all_vectored(client_socket, buffers)
+
+
+def send_tcp_messages(
+    host: str,
+    port: int,
+    messages: Iterable[Union[str, bytes, memoryview]],
+    bufsize: int = DEFAULT_RECV_BUFSIZE,
+    sndbuf: Optional[int] = None,
+    rcvbuf: Optional[int] = None,
+    unix_path: Optional[str] = None,
+) -> List[bytes]:
+    """
+    Sends several messages over one TCP connection, waiting for the server's
+    reply to each before sending the next. Saves the connect/close round
+    trips that calling send_tcp_message per message pays, and the reply wait
+    keeps messages from being merged into one read on the server.
+    Needs a server that serves more than one message per connection
+    (start_threaded_tcp_server, start_selector_tcp_server).
+    Args:
+        host (str): Server host.
+        port (int): Server port.
+        messages (iterable of str, bytes or memoryview): Payloads to send in order.
+        bufsize (int): Maximum bytes read for each response (default 64 KiB).
+        sndbuf (int, optional): SO_SNDBUF size in bytes (OS default if None).
+        rcvbuf (int, optional): SO_RCVBUF size in bytes (OS default if None).
+        unix_path (str, optional): Connect to the server's Unix socket at this
+            path instead (see start_selector_tcp_server), falling back to TCP
+            if it cannot be reached.
+    Returns:
+        list of bytes: One response per message; b"" once the server has closed.
+    """
+    responses = []
+    with _connect(host, port, unix_path, sndbuf, rcvbuf) as client_socket:
+        for message in messages:
+            client_socket.sendall(_encode(message))
+            responses.append(client_socket.recv(bufsize))
+    return responses
+
+
+def send_tcp_message_pooled(
+    pool: "TCPConnectionPool",
+    message: Union[str, bytes, memoryview],
+    bufsize: int = DEFAULT_RECV_BUFSIZE,
+    expect_response: bool = True,
+) -> bytes:
+    """
+    Sends a message over a connection borrowed from a TCPConnectionPool, so
+    repeated sends skip the connect (and TLS handshake) of send_tcp_message.
+    Already encoded bytes or memoryviews are sent as-is; short strings are
+    encoded once and cached.
+    Args:
+        pool (TCPConnectionPool): Pool to borrow the connection from.
+        message (str, bytes or memoryview): Payload to send.
+        bufsize (int): Maximum bytes read for the response (default 64 KiB).
+        expect_response (bool): Wait for one response read before returning
+            the connection. The server must reply, or the call blocks.
+    Returns:
+        bytes: The response, or b"" when expect_response is False.
+    """
+    payload = _encode(message)
+    with pool.connection() as conn:
+        conn.sendall(payload)
+        if not expect_response:
+            return b""
+        return conn.recv(bufsize)
 
 
 # -----------------------------
@@ -160,11 +716,34 @@ def send_tcp_bytes(host: str, port: int, data: bytes):
 # -----------------------------
 
 
+def install_fast_event_loop() -> bool:
+    """
+    Switch asyncio to uvloop's libuv-based event loop if uvloop is installed.
+    Call it before asyncio.run(start_async_tcp_server(...)); the async servers
+    and clients need no other change.
+    Returns:
+        bool: True if uvloop is now the event loop policy, False if it is not installed.
+    """
+    try:
+        import uvloop
+    except ImportError:
+        logger.debug("[TCP][ASYNC] uvloop not installed; keeping the default loop")
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+
 async def start_async_tcp_server(
     port: int,
     handler_func: Callable[[bytes, tuple, asyncio.StreamWriter], Awaitable[None]],
     host: str = "0.0.0.0",
     shutdown_event: Optional["asyncio.Event"] = None,
+    bufsize: int = DEFAULT_RECV_BUFSIZE,
+    limit: int = DEFAULT_STREAM_LIMIT,
+    sndbuf: Optional[int] = None,
+    rcvbuf: Optional[int] = None,
+    reuse_port: bool = False,
+    backlog: int = 100,
 ):
     """
     Starts an asynchronous TCP server with graceful shutdown support.
@@ -172,27 +751,43 @@ async def start_async_tcp_server(
         port (int): Port to bind.
         handler_func (callable): async function (data, addr, writer).
         host (str): Host to bind.
-        shutdown_event (asyncio.Event, optional): If provided, server will exit when event is set.
+        shutdown_event (asyncio.Event, optional): If provided, server will exit
+            when event is set.
+        bufsize (int): Maximum bytes read per recv (default 64 KiB).
+        limit (int): StreamReader buffer limit per connection (default 1 MiB).
+        sndbuf (int, optional): SO_SNDBUF size in bytes (OS default if None).
+        rcvbuf (int, optional): SO_RCVBUF size in bytes (OS default if None).
+        reuse_port (bool): Set SO_REUSEPORT so several server processes can bind the
+            same port; the kernel spreads incoming connections across them.
+        backlog (int): Listen backlog for pending connections (default 100).
     """
 
     async def handle_client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
         addr = writer.get_extra_info("peername")
-        logger.info(f"[TCP][ASYNC] Connection from {addr}")
+        logger.info("[TCP][ASYNC] Connection from %s", addr)
+        _tune_sock(writer.get_extra_info("socket"), sndbuf, rcvbuf)
         try:
             while True:
-                data = await reader.read(BUFFER_SIZE)
+                data = await reader.read(bufsize)
                 if not data:
                     break
                 await handler_func(data, addr, writer)
         except Exception as e:
-            logger.error(f"[TCP][ASYNC] Error: {e}")
+            logger.error("[TCP][ASYNC] Error: %s", e)
         finally:
             writer.close()
             await writer.wait_closed()
-            logger.info(f"[TCP][ASYNC] Connection closed from {addr}")
+            logger.info("[TCP][ASYNC] Connection closed from %s", addr)
 
-    server = await asyncio.start_server(handle_client, host, port)
-    logger.info(f"[TCP][ASYNC] Async server listening on {host}:{port}")
+    server = await asyncio.start_server(
+        handle_client,
+        host,
+        port,
+        limit=limit,
+        reuse_port=reuse_port,
+        backlog=backlog,
+    )
+    logger.info("[TCP][ASYNC] Async server listening on %s:%s", host, port)
     async with server:
         if shutdown_event is not None:
             await shutdown_event.wait()
@@ -202,20 +797,129 @@ async def start_async_tcp_server(
     logger.info("[TCP][ASYNC] Async server shutdown complete.")
 
 
+def _run_async_tcp_worker(port, handler_func, kwargs):
+    asyncio.run(start_async_tcp_server(port, handler_func, reuse_port=True, **kwargs))
+
+
+def start_async_tcp_server_multi(
+    port: int,
+    handler_func: Callable[[bytes, tuple, asyncio.StreamWriter], Awaitable[None]],
+    *,
+    workers: Optional[int] = None,
+    shutdown_event: Optional[threading.Event] = None,
+    backlog: int = 4096,
+    **kwargs,
+):
+    """
+    Runs start_async_tcp_server in one worker process per CPU, all bound to
+    the same port with SO_REUSEPORT so the kernel spreads connections across
+    them. Workers that crash are restarted. Requires SO_REUSEPORT (Linux, BSD,
+    macOS). Workers are forked where available and spawned elsewhere; with
+    spawn, handler_func must be a picklable module-level function.
+    Args:
+        port (int): Port to bind.
+        handler_func (callable): async function (data, addr, writer).
+        workers (int, optional): Number of worker processes (default CPU count).
+        shutdown_event (threading.Event, optional): Set in this (parent) process
+            to terminate the workers and return. Workers do not share state,
+            so an asyncio.Event cannot be passed through to them.
+        backlog (int): Listen backlog per worker (default 4096).
+        **kwargs: Passed through to start_async_tcp_server (host, bufsize, ...).
+    """
+    import multiprocessing
+    from multiprocessing.connection import wait
+
+    if "shutdown_event" in kwargs or "reuse_port" in kwargs:
+        raise TypeError("shutdown_event and reuse_port are managed per worker")
+    workers = workers or os.cpu_count() or 1
+    kwargs["backlog"] = backlog
+    method = "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+    ctx = multiprocessing.get_context(method)
+
+    started = {}  # pid -> monotonic start time
+
+    def spawn():
+        proc = ctx.Process(
+            target=_run_async_tcp_worker,
+            args=(port, handler_func, kwargs),
+            daemon=True,
+        )
+        proc.start()
+        started[proc.pid] = time.monotonic()
+        return proc
+
+    procs = [spawn() for _ in range(workers)]
+    logger.info("[TCP][ASYNC] Started %d worker processes on port %s", workers, port)
+    wakeup = _EventWakeup(shutdown_event) if shutdown_event is not None else None
+    try:
+        while procs:
+            # Block until a worker exits or shutdown_event is set
+            waitables = [p.sentinel for p in procs]
+            if wakeup is not None:
+                waitables.append(wakeup)
+            ready = wait(waitables)
+            if shutdown_event is not None and shutdown_event.is_set():
+                logger.info("[TCP][ASYNC] Shutdown event set. Stopping workers.")
+                break
+            for i, proc in enumerate(procs):
+                if proc.sentinel not in ready:
+                    continue
+                proc.join()
+                if proc.exitcode == 0:
+                    procs[i] = None
+                    continue
+                if time.monotonic() - started[proc.pid] < 1.0:
+                    # Dying at startup (e.g. bind failed) would restart forever
+                    logger.error(
+                        "[TCP][ASYNC] Worker %s failed on startup with %s",
+                        proc.pid,
+                        proc.exitcode,
+                    )
+                    procs[i] = None
+                    continue
+                logger.warning(
+                    "[TCP][ASYNC] Worker %s exited with %s; restarting",
+                    proc.pid,
+                    proc.exitcode,
+                )
+                procs[i] = spawn()
+            procs = [p for p in procs if p is not None]
+    finally:
+        for proc in procs:
+            proc.terminate()
+        for proc in procs:
+            proc.join()
+        if wakeup is not None:
+            wakeup.close()
+        logger.info("[TCP][ASYNC] Multi-process server shutdown complete.")
+
+
 # -----------------------------
 # ⚡ Async TCP Client
 # -----------------------------
 
 
-async def send_tcp_message_async(host: str, port: int, message: str):
+async def send_tcp_message_async(
+    host: str,
+    port: int,
+    message: Union[str, bytes, memoryview],
+    bufsize: int = DEFAULT_RECV_BUFSIZE,
+    sndbuf: Optional[int] = None,
+    rcvbuf: Optional[int] = None,
+):
     reader, writer = await asyncio.open_connection(host, port)
-    writer.write(message.encode("utf-8"))
+    _tune_sock(writer.get_extra_info("socket"), sndbuf, rcvbuf)
+    writer.write(_encode(message))
     await writer.drain()
     try:
-        data = await reader.read(BUFFER_SIZE)
-        logger.info(f"[TCP][ASYNC] Server says: {data.decode('utf-8')}")
-    except:
-        pass
+        data = await reader.read(bufsize)
+    except OSError as e:
+        logger.debug("[TCP][ASYNC] No response from server: %s", e)
+        data = b""
+    if data and logger.isEnabledFor(logging.INFO):
+        logger.info(
+            "[TCP][ASYNC] Server says: %s", data.decode("utf-8", errors="replace")
+        )
     writer.close()
     await writer.wait_closed()
 
@@ -229,6 +933,11 @@ def start_ssl_tcp_server(
     require_client_cert=False,
     host="0.0.0.0",
     shutdown_event: Optional[threading.Event] = None,
+    bufsize: int = DEFAULT_RECV_BUFSIZE,
+    zero_copy: bool = False,
+    sndbuf: Optional[int] = None,
+    rcvbuf: Optional[int] = None,
+    reuse_port: bool = False,
 ):
     """
     Starts a synchronous SSL/TLS TCP server with graceful shutdown support.
@@ -240,7 +949,15 @@ def start_ssl_tcp_server(
         cafile (str, optional): CA cert for client cert verification.
         require_client_cert (bool): Require client certificate (mutual TLS).
         host (str): Host to bind.
-        shutdown_event (threading.Event, optional): If provided, server will exit when event is set.
+        shutdown_event (threading.Event, optional): If provided, server will exit
+            when event is set.
+        bufsize (int): Maximum bytes read per recv (default 64 KiB).
+        zero_copy (bool): Pass the handler a memoryview into the receive buffer
+            instead of a bytes copy. The view is only valid until the next recv.
+        sndbuf (int, optional): SO_SNDBUF size in bytes (OS default if None).
+        rcvbuf (int, optional): SO_RCVBUF size in bytes (OS default if None).
+        reuse_port (bool): Set SO_REUSEPORT so several server processes can bind the
+            same port; the kernel spreads incoming connections across them.
     """
     context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
     context.load_cert_chain(certfile=certfile, keyfile=keyfile)
@@ -250,26 +967,31 @@ def start_ssl_tcp_server(
             context.load_verify_locations(cafile)
     else:
         context.verify_mode = ssl.CERT_NONE
+    buf = bytearray(bufsize)
+    mv = memoryview(buf)
     server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    _set_reuse(server_socket, reuse_port)
     server_socket.bind((host, port))
     server_socket.listen(5)
-    logger.info(f"[SSL][TCP] Server listening on {host}:{port}")
+    # Wake up once a second to check shutdown_event
+    server_socket.settimeout(1.0)
+    logger.info("[SSL][TCP] Server listening on %s:%s", host, port)
     while True:
         if shutdown_event is not None and shutdown_event.is_set():
             logger.info("[SSL][TCP] Shutdown event set. Stopping server.")
             break
         try:
-            server_socket.settimeout(1.0)
             client_socket, addr = server_socket.accept()
         except socket.timeout:
             continue
+        _tune_sock(client_socket, sndbuf, rcvbuf)
         try:
             ssl_sock = context.wrap_socket(client_socket, server_side=True)
-            data = ssl_sock.recv(BUFFER_SIZE)
-            if data:
-                handler_func(data, addr, ssl_sock)
+            n = ssl_sock.recv_into(mv)
+            if n:
+                handler_func(_recv_view(mv, n, zero_copy), addr, ssl_sock)
         except ssl.SSLError as e:
-            logger.error(f"[SSL][TCP] SSL error: {e}")
+            logger.error("[SSL][TCP] SSL error: %s", e)
         finally:
             try:
                 ssl_sock.close()
@@ -279,7 +1001,17 @@ def start_ssl_tcp_server(
 
 
 def send_ssl_tcp_message(
-    host, port, message, cafile=None, certfile=None, keyfile=None, verify=True
+    host,
+    port,
+    message,
+    cafile=None,
+    certfile=None,
+    keyfile=None,
+    verify=True,
+    bufsize: int = DEFAULT_RECV_BUFSIZE,
+    sndbuf: Optional[int] = None,
+    rcvbuf: Optional[int] = None,
+    alpn_protocols: Optional[List[str]] = None,
 ):
     """
     Sends a message to an SSL/TLS TCP server and prints the response.
@@ -291,23 +1023,32 @@ def send_ssl_tcp_message(
         certfile (str, optional): Client cert for mutual TLS.
         keyfile (str, optional): Client key for mutual TLS.
         verify (bool): Whether to verify server cert.
+        bufsize (int): Maximum bytes read for the response (default 64 KiB).
+        sndbuf (int, optional): SO_SNDBUF size in bytes (OS default if None).
+        rcvbuf (int, optional): SO_RCVBUF size in bytes (OS default if None).
+        alpn_protocols (list, optional): ALPN protocol names to offer.
+    Repeated calls to the same host and port resume the previous TLS session.
     """
-    context = ssl.create_default_context(ssl.Purpose.SERVER_AUTH, cafile=cafile)
-    if not verify:
-        context.check_hostname = False
-        context.verify_mode = ssl.CERT_NONE
-    if certfile and keyfile:
-        context.load_cert_chain(certfile=certfile, keyfile=keyfile)
+    context = _get_client_context(cafile, certfile, keyfile, verify, alpn_protocols)
     with socket.create_connection((host, port)) as sock:
+        _tune_sock(sock, sndbuf, rcvbuf)
         with context.wrap_socket(
-            sock, server_hostname=host if verify else None
+            sock,
+            server_hostname=host if verify else None,
+            session=_get_ssl_session(host, port, context),
         ) as ssock:
-            ssock.sendall(message.encode("utf-8"))
+            ssock.sendall(_encode(message))
             try:
-                response = ssock.recv(BUFFER_SIZE)
-                logger.info(f"[SSL][TCP] Server response: {response.decode('utf-8')}")
-            except Exception:
-                pass
+                response = ssock.recv(bufsize)
+            except OSError as e:
+                logger.debug("[SSL][TCP] No response from server: %s", e)
+                response = b""
+            if response and logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "[SSL][TCP] Server response: %s",
+                    response.decode("utf-8", errors="replace"),
+                )
+            _store_ssl_session(host, port, context, ssock)
 
 
 async def start_async_ssl_tcp_server(
@@ -319,6 +1060,11 @@ async def start_async_ssl_tcp_server(
     require_client_cert=False,
     host="0.0.0.0",
     shutdown_event: Optional["asyncio.Event"] = None,
+    bufsize: int = DEFAULT_RECV_BUFSIZE,
+    limit: int = DEFAULT_STREAM_LIMIT,
+    sndbuf: Optional[int] = None,
+    rcvbuf: Optional[int] = None,
+    reuse_port: bool = False,
 ):
     """
     Starts an asynchronous SSL/TLS TCP server with graceful shutdown support.
@@ -330,7 +1076,14 @@ async def start_async_ssl_tcp_server(
         cafile (str, optional): CA cert for client cert verification.
         require_client_cert (bool): Require client certificate (mutual TLS).
         host (str): Host to bind.
-        shutdown_event (asyncio.Event, optional): If provided, server will exit when event is set.
+        shutdown_event (asyncio.Event, optional): If provided, server will exit
+            when event is set.
+        bufsize (int): Maximum bytes read per recv (default 64 KiB).
+        limit (int): StreamReader buffer limit per connection (default 1 MiB).
+        sndbuf (int, optional): SO_SNDBUF size in bytes (OS default if None).
+        rcvbuf (int, optional): SO_RCVBUF size in bytes (OS default if None).
+        reuse_port (bool): Set SO_REUSEPORT so several server processes can bind the
+            same port; the kernel spreads incoming connections across them.
     """
     context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
     context.load_cert_chain(certfile=certfile, keyfile=keyfile)
@@ -343,22 +1096,30 @@ async def start_async_ssl_tcp_server(
 
     async def handle_client(reader, writer):
         addr = writer.get_extra_info("peername")
-        logger.info(f"[SSL][TCP][ASYNC] Connection from {addr}")
+        logger.info("[SSL][TCP][ASYNC] Connection from %s", addr)
+        _tune_sock(writer.get_extra_info("socket"), sndbuf, rcvbuf)
         try:
             while True:
-                data = await reader.read(BUFFER_SIZE)
+                data = await reader.read(bufsize)
                 if not data:
                     break
                 await handler_func(data, addr, writer)
         except Exception as e:
-            logger.error(f"[SSL][TCP][ASYNC] Error: {e}")
+            logger.error("[SSL][TCP][ASYNC] Error: %s", e)
         finally:
             writer.close()
             await writer.wait_closed()
-            logger.info(f"[SSL][TCP][ASYNC] Connection closed from {addr}")
+            logger.info("[SSL][TCP][ASYNC] Connection closed from %s", addr)
 
-    server = await asyncio.start_server(handle_client, host, port, ssl=context)
-    logger.info(f"[SSL][TCP][ASYNC] Async SSL server listening on {host}:{port}")
+    server = await asyncio.start_server(
+        handle_client,
+        host,
+        port,
+        ssl=context,
+        limit=limit,
+        reuse_port=reuse_port,
+    )
+    logger.info("[SSL][TCP][ASYNC] Async SSL server listening on %s:%s", host, port)
     async with server:
         if shutdown_event is not None:
             await shutdown_event.wait()
@@ -371,7 +1132,17 @@ async def start_async_ssl_tcp_server(
 
 
 async def send_ssl_tcp_message_async(
-    host, port, message, cafile=None, certfile=None, keyfile=None, verify=True
+    host,
+    port,
+    message,
+    cafile=None,
+    certfile=None,
+    keyfile=None,
+    verify=True,
+    bufsize: int = DEFAULT_RECV_BUFSIZE,
+    sndbuf: Optional[int] = None,
+    rcvbuf: Optional[int] = None,
+    alpn_protocols: Optional[List[str]] = None,
 ):
     """
     Sends a message to an SSL/TLS TCP server asynchronously and prints the response.
@@ -383,23 +1154,28 @@ async def send_ssl_tcp_message_async(
         certfile (str, optional): Client cert for mutual TLS.
         keyfile (str, optional): Client key for mutual TLS.
         verify (bool): Whether to verify server cert.
+        bufsize (int): Maximum bytes read for the response (default 64 KiB).
+        sndbuf (int, optional): SO_SNDBUF size in bytes (OS default if None).
+        rcvbuf (int, optional): SO_RCVBUF size in bytes (OS default if None).
+        alpn_protocols (list, optional): ALPN protocol names to offer.
     """
-    context = ssl.create_default_context(ssl.Purpose.SERVER_AUTH, cafile=cafile)
-    if not verify:
-        context.check_hostname = False
-        context.verify_mode = ssl.CERT_NONE
-    if certfile and keyfile:
-        context.load_cert_chain(certfile=certfile, keyfile=keyfile)
+    context = _get_client_context(cafile, certfile, keyfile, verify, alpn_protocols)
     reader, writer = await asyncio.open_connection(
         host, port, ssl=context, server_hostname=host if verify else None
     )
-    writer.write(message.encode("utf-8"))
+    _tune_sock(writer.get_extra_info("socket"), sndbuf, rcvbuf)
+    writer.write(_encode(message))
     await writer.drain()
     try:
-        data = await reader.read(BUFFER_SIZE)
-        logger.info(f"[SSL][TCP][ASYNC] Server says: {data.decode('utf-8')}")
-    except Exception:
-        pass
+        data = await reader.read(bufsize)
+    except OSError as e:
+        logger.debug("[SSL][TCP][ASYNC] No response from server: %s", e)
+        data = b""
+    if data and logger.isEnabledFor(logging.INFO):
+        logger.info(
+            "[SSL][TCP][ASYNC] Server says: %s",
+            data.decode("utf-8", errors="replace"),
+        )
     writer.close()
     await writer.wait_closed()
 
@@ -408,11 +1184,26 @@ class TCPConnectionPool:
     """
     A simple thread-safe TCP (and SSL) connection pool.
     Usage:
-        pool = TCPConnectionPool(host, port, max_size=2, idle_timeout=5, ssl=False, cafile=None, certfile=None, keyfile=None, verify=True)
+        pool = TCPConnectionPool(
+            host, port, max_size=2, idle_timeout=5, ssl=False, cafile=None,
+            certfile=None, keyfile=None, verify=True, sndbuf=None, rcvbuf=None,
+            alpn_protocols=None,
+        )
         with pool.connection() as conn:
             conn.sendall(b"hello")
             data = conn.recv(1024)
         pool.closeall()
+
+    For bulk reads on a pooled connection, prefer ``conn.recv_into(mv)`` against
+    a ``memoryview`` of a buffer you allocate once and reuse across reads.
+
+    A daemon thread, started on the first release, closes connections idle
+    for longer than idle_timeout. It only holds a weak reference to the pool,
+    so it exits on closeall() or once the pool is garbage-collected.
+
+    closeall() closes the idle connections and any still checked out when
+    they are released. The pool stays usable: the next connection() opens a
+    fresh connection and pooling (and the reaper) resume.
     """
 
     def __init__(
@@ -426,6 +1217,9 @@ class TCPConnectionPool:
         certfile=None,
         keyfile=None,
         verify=True,
+        sndbuf=None,
+        rcvbuf=None,
+        alpn_protocols=None,
     ):
         self.host = host
         self.port = port
@@ -436,23 +1230,46 @@ class TCPConnectionPool:
         self.certfile = certfile
         self.keyfile = keyfile
         self.verify = verify
-        self._pool = []  # list of (conn, last_used_time)
-        self._lock = threading.Lock()
+        self.sndbuf = sndbuf
+        self.rcvbuf = rcvbuf
+        # Built once so every pooled connection shares one context
+        self._ctx = (
+            _get_client_context(cafile, certfile, keyfile, verify, alpn_protocols)
+            if ssl
+            else None
+        )
+        # Last TLS session seen, offered to new connections for resumption
+        self._session = None
+        # (conn, last_used_time), least recently used on the left
+        self._pool: Deque[Tuple[socket.socket, float]] = deque()
+        self._cond = threading.Condition()
         self._used = 0
+        # Bumped by closeall(); connections checked out before it are closed on
+        # release instead of pooled
+        self._generation = 0
+        # Close idle connections in the background so a quiet pool does not
+        # hold sockets open until the next connection() call
+        self._stop = threading.Event()
+        self._reaper = None
 
     def _create_conn(self):
-        s = socket.create_connection((self.host, self.port))
-        if self.ssl:
-            context = ssl.create_default_context(
-                ssl.Purpose.SERVER_AUTH, cafile=self.cafile
+        s = _tune_sock(
+            socket.create_connection((self.host, self.port)), self.sndbuf, self.rcvbuf
+        )
+        # Let keepalive notice peers that vanished while the connection sat idle
+        if hasattr(socket, "TCP_KEEPIDLE"):
+            s.setsockopt(
+                socket.IPPROTO_TCP,
+                socket.TCP_KEEPIDLE,
+                max(1, int(self.idle_timeout)),
             )
-            if not self.verify:
-                context.check_hostname = False
-                context.verify_mode = ssl.CERT_NONE
-            if self.certfile and self.keyfile:
-                context.load_cert_chain(certfile=self.certfile, keyfile=self.keyfile)
-            s = context.wrap_socket(
-                s, server_hostname=self.host if self.verify else None
+            s.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 5)
+            s.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT, 3)
+        if self.ssl:
+            s = self._ctx.wrap_socket(
+                s,
+                server_hostname=self.host if self.verify else None,
+                session=self._session,
             )
         return s
 
@@ -461,60 +1278,112 @@ class TCPConnectionPool:
             self._pool = pool
             self._conn = conn
             self._closed = False
+            self._generation = pool._generation
 
         def __enter__(self):
             return self._conn
 
         def __exit__(self, exc_type, exc_val, exc_tb):
-            if not self._closed:
-                self._pool._release(self._conn)
+            if exc_type is not None:
+                # The block failed mid-exchange; the socket state is unknown
+                self.close()
+            self._pool._release(
+                self._conn, reuse=not self._closed, generation=self._generation
+            )
 
         def close(self):
             if not self._closed:
                 self._conn.close()
                 self._closed = True
 
+    def _pop_expired(self, now) -> List[socket.socket]:
+        # Released connections are appended, so expired ones sit at the left.
+        # Caller holds self._cond and closes the returned sockets after releasing it.
+        expired = []
+        while self._pool and now - self._pool[0][1] >= self.idle_timeout:
+            expired.append(self._pool.popleft()[0])
+        return expired
+
+    @staticmethod
+    def _close_all(conns):
+        for conn in conns:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def _start_reaper(self):
+        # Caller holds self._cond. With idle_timeout <= 0 nothing is ever kept
+        # idle (connection() drops it), so there is nothing to reap.
+        if self._reaper is not None or self.idle_timeout <= 0:
+            return
+        # Wake the reaper as soon as the pool is collected
+        weakref.finalize(self, self._stop.set)
+        self._reaper = threading.Thread(
+            target=TCPConnectionPool._reap_loop,
+            args=(weakref.ref(self), self._stop, max(self.idle_timeout / 2, 0.1)),
+            name="kn_tcp_pool_reaper",
+            daemon=True,
+        )
+        self._reaper.start()
+
+    @staticmethod
+    def _reap_loop(pool_ref, stop, interval):
+        # Holds only a weak reference so an abandoned pool can be collected
+        while not stop.wait(interval):
+            pool = pool_ref()
+            if pool is None:
+                return
+            with pool._cond:
+                expired = pool._pop_expired(time.time())
+            del pool
+            TCPConnectionPool._close_all(expired)
+
     def connection(self):
-        with self._lock:
-            now = time.time()
-            # Remove idle connections
-            self._pool = [
-                (c, t) for (c, t) in self._pool if now - t < self.idle_timeout
-            ]
-            if self._pool:
-                conn, _ = self._pool.pop()
-                self._used += 1
-                return self._PooledConn(self, conn)
-            elif self._used < self.max_size:
-                conn = self._create_conn()
-                self._used += 1
-                return self._PooledConn(self, conn)
-            else:
-                # Wait for a connection to be released
+        expired = []
+        try:
+            with self._cond:
                 while True:
-                    self._lock.release()
-                    time.sleep(0.05)
-                    self._lock.acquire()
-                    now = time.time()
-                    self._pool = [
-                        (c, t) for (c, t) in self._pool if now - t < self.idle_timeout
-                    ]
+                    expired.extend(self._pop_expired(time.time()))
                     if self._pool:
+                        # Most recently used: its kernel and TLS state are warmest
                         conn, _ = self._pool.pop()
                         self._used += 1
                         return self._PooledConn(self, conn)
+                    if self._used < self.max_size:
+                        conn = self._create_conn()
+                        self._used += 1
+                        return self._PooledConn(self, conn)
+                    # Wait for a connection to be released
+                    self._cond.wait()
+        finally:
+            self._close_all(expired)
 
-    def _release(self, conn):
-        with self._lock:
-            self._pool.append((conn, time.time()))
-            self._used -= 1
+    def _release(self, conn, reuse=True, generation=None):
+        with self._cond:
+            try:
+                if generation is not None and generation != self._generation:
+                    if reuse:
+                        self._close_all([conn])
+                elif reuse:
+                    if self.ssl and conn.session is not None:
+                        self._session = conn.session
+                    self._pool.append((conn, time.time()))
+                    self._start_reaper()
+            finally:
+                # Always free the slot, or waiters in connection() hang forever
+                self._used -= 1
+                self._cond.notify()
 
     def closeall(self):
-        with self._lock:
-            for conn, _ in self._pool:
-                try:
-                    conn.close()
-                except Exception:
-                    pass
+        with self._cond:
+            self._stop.set()
+            # A fresh event and thread are used if the pool is released into again
+            self._stop = threading.Event()
+            self._reaper = None
+            self._close_all(conn for conn, _ in self._pool)
             self._pool.clear()
-            self._used = 0
+            self._generation += 1
+            # _used is left alone: connections still checked out decrement it
+            # when they are released
+            self._cond.notify_all()
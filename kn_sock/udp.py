@@ -2,7 +2,10 @@
 
 import socket
 import asyncio
-from typing import Callable, Awaitable
+import logging
+from typing import Callable, Awaitable, Iterable, Union
+
+logger = logging.getLogger(__name__)
 
 BUFFER_SIZE = 1024
 
@@ -14,6 +17,11 @@ def _get_socket_family(host):
     return socket.AF_INET
 
 
+def _recv_view(mv, n, zero_copy):
+    # Servers recvfrom_into one reusable buffer; copy out unless the handler opted in
+    return mv[:n] if zero_copy else bytes(mv[:n])
+
+
 # -----------------------------
 # 📥 Sync UDP Server
 # -----------------------------
@@ -24,6 +32,7 @@ def start_udp_server(
     handler_func: Callable[[bytes, tuple, socket.socket], None],
     host: str = "0.0.0.0",
     shutdown_event=None,
+    zero_copy: bool = False,
 ):
     """
     Starts a synchronous UDP server (IPv4/IPv6 supported) with graceful shutdown support.
@@ -32,22 +41,27 @@ def start_udp_server(
         handler_func (callable): Function to handle (data, addr, socket).
         host (str): Host to bind (IPv4 or IPv6).
         shutdown_event (threading.Event, optional): If provided, server will exit when event is set.
+        zero_copy (bool): Pass the handler a memoryview into the receive buffer
+            instead of a bytes copy. The view is only valid until the next recv.
     """
     family = _get_socket_family(host)
     server_socket = socket.socket(family, socket.SOCK_DGRAM)
     server_socket.bind((host, port))
-    print(f"[UDP][SYNC] Server listening on {host}:{port}")
+    # Wake up once a second to check shutdown_event
+    server_socket.settimeout(1.0)
+    logger.info("[UDP][SYNC] Server listening on %s:%s", host, port)
+    buf = bytearray(BUFFER_SIZE)
+    mv = memoryview(buf)
 
     while True:
         if shutdown_event is not None and shutdown_event.is_set():
-            print("[UDP][SYNC] Shutdown event set. Stopping UDP server.")
+            logger.info("[UDP][SYNC] Shutdown event set. Stopping UDP server.")
             break
-        server_socket.settimeout(1.0)
         try:
-            data, addr = server_socket.recvfrom(BUFFER_SIZE)
+            n, addr = server_socket.recvfrom_into(mv)
         except socket.timeout:
             continue
-        handler_func(data, addr, server_socket)
+        handler_func(_recv_view(mv, n, zero_copy), addr, server_socket)
     server_socket.close()
 
 
@@ -56,14 +70,45 @@ def start_udp_server(
 # -----------------------------
 
 
-def send_udp_message(host: str, port: int, message: str):
+def send_udp_message(host: str, port: int, message: Union[str, bytes]):
     """
-    Sends a message to a UDP server (IPv4/IPv6 supported).
+    Sends a message to a UDP server (IPv4/IPv6 supported). str is UTF-8
+    encoded; bytes are sent as-is.
     """
+    if isinstance(message, str):
+        message = message.encode("utf-8")
     family = _get_socket_family(host)
     with socket.socket(family, socket.SOCK_DGRAM) as sock:
-        sock.sendto(message.encode("utf-8"), (host, port))
-        print(f"[UDP][SYNC] Sent to {host}:{port}")
+        sock.sendto(message, (host, port))
+        logger.debug("[UDP][SYNC] Sent to %s:%s", host, port)
+
+
+def send_udp_messages(
+    host: str, port: int, messages: Iterable[Union[str, bytes]]
+) -> int:
+    """
+    Sends each message as its own datagram to a UDP server. On Linux the
+    whole batch goes out through sendmmsg(2), up to 1024 datagrams per
+    syscall; elsewhere it falls back to one send() per message.
+    Args:
+        host (str): Target host (IPv4 or IPv6).
+        port (int): Target port.
+        messages (iterable of str or bytes): Payloads; str is UTF-8 encoded.
+    Returns:
+        int: Number of datagrams sent.
+    """
+    payloads = [m.encode("utf-8") if isinstance(m, str) else bytes(m) for m in messages]
+    family = _get_socket_family(host)
+    with socket.socket(family, socket.SOCK_DGRAM) as sock:
+        # Connected, so the datagrams need no per-message destination address
+        sock.connect((host, port))
+        try:
+            from kn_sock._sendmmsg import sendmmsg
+        except ImportError:
+            for payload in payloads:
+                sock.send(payload)
+            return len(payloads)
+        return sendmmsg(sock, payloads)
 
 
 # -----------------------------
@@ -92,7 +137,7 @@ async def start_udp_server_async(
 
         def connection_made(self, transport):
             self.transport = transport
-            print(f"[UDP][ASYNC] Server listening on {host}:{port}")
+            logger.info("[UDP][ASYNC] Server listening on %s:%s", host, port)
 
         def datagram_received(self, data, addr):
             asyncio.create_task(handler_func(data, addr, self.transport))
@@ -104,13 +149,13 @@ async def start_udp_server_async(
     try:
         if shutdown_event is not None:
             await shutdown_event.wait()
-            print("[UDP][ASYNC] Shutdown event set. Stopping async UDP server.")
+            logger.info("[UDP][ASYNC] Shutdown event set. Stopping async UDP server.")
         else:
             while True:
                 await asyncio.sleep(3600)  # Run forever
     finally:
         transport.close()
-        print("[UDP][ASYNC] Async UDP server shutdown complete.")
+        logger.info("[UDP][ASYNC] Async UDP server shutdown complete.")
 
 
 # -----------------------------
@@ -118,16 +163,19 @@ async def start_udp_server_async(
 # -----------------------------
 
 
-async def send_udp_message_async(host: str, port: int, message: str):
+async def send_udp_message_async(host: str, port: int, message: Union[str, bytes]):
     """
-    Sends a message to a UDP server asynchronously.
+    Sends a message to a UDP server asynchronously. str is UTF-8 encoded;
+    bytes are sent as-is.
     """
+    if isinstance(message, str):
+        message = message.encode("utf-8")
     loop = asyncio.get_running_loop()
     transport, _ = await loop.create_datagram_endpoint(
         lambda: asyncio.DatagramProtocol(), remote_addr=(host, port)
     )
-    transport.sendto(message.encode("utf-8"))
-    print(f"[UDP][ASYNC] Sent to {host}:{port}")
+    transport.sendto(message)
+    logger.debug("[UDP][ASYNC] Sent to %s:%s", host, port)
     transport.close()
 
 
@@ -152,6 +200,7 @@ def start_udp_multicast_server(
     handler_func: Callable[[bytes, tuple, socket.socket], None],
     listen_ip: str = "0.0.0.0",
     shutdown_event=None,
+    zero_copy: bool = False,
 ):
     """
     Start a UDP multicast server that listens for messages on the given group and port.
@@ -161,25 +210,32 @@ def start_udp_multicast_server(
         handler_func (callable): Function to handle (data, addr, socket).
         listen_ip (str): Local IP to bind (default '0.0.0.0').
         shutdown_event (threading.Event, optional): For graceful shutdown.
+        zero_copy (bool): Pass the handler a memoryview into the receive buffer
+            instead of a bytes copy. The view is only valid until the next recv.
     """
     sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
     sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
     sock.bind((listen_ip, port))
     mreq = socket.inet_aton(group) + socket.inet_aton(listen_ip)
     sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, mreq)
-    print(f"[UDP][MULTICAST] Listening on group {group}:{port}")
+    # Wake up once a second to check shutdown_event
+    sock.settimeout(1.0)
+    logger.info("[UDP][MULTICAST] Listening on group %s:%s", group, port)
+    buf = bytearray(BUFFER_SIZE)
+    mv = memoryview(buf)
     try:
         while True:
             if shutdown_event is not None and shutdown_event.is_set():
-                print("[UDP][MULTICAST] Shutdown event set. Stopping multicast server.")
+                logger.info(
+                    "[UDP][MULTICAST] Shutdown event set. Stopping multicast server."
+                )
                 break
-            sock.settimeout(1.0)
             try:
-                data, addr = sock.recvfrom(BUFFER_SIZE)
+                n, addr = sock.recvfrom_into(mv)
             except socket.timeout:
                 continue
-            handler_func(data, addr, sock)
+            handler_func(_recv_view(mv, n, zero_copy), addr, sock)
     finally:
         sock.setsockopt(socket.IPPROTO_IP, socket.IP_DROP_MEMBERSHIP, mreq)
         sock.close()
-        print("[UDP][MULTICAST] Multicast server shutdown complete.")
+        logger.info("[UDP][MULTICAST] Multicast server shutdown complete.")
@@ -2,8 +2,10 @@
 
 import os
 import socket
+import ssl
 import json
-from typing import Generator, Optional
+import threading
+from typing import Generator, Optional, Sequence
 
 # -----------------------------
 # 🌐 Network Utilities
@@ -28,6 +30,41 @@ def get_local_ip() -> str:
         return "127.0.0.1"
 
 
+# Most buffers one sendmsg() call accepts (IOV_MAX is 1024 on Linux and macOS)
+_SENDMSG_MAX_BUFFERS = 1024
+
+
+def send_all_vectored(sock: socket.socket, buffers: Sequence[bytes]) -> int:
+    """
+    Send several buffers as if concatenated, gathering them into one sendmsg()
+    call where possible instead of joining them or calling sendall() per buffer.
+    Falls back to sendall() per buffer on TLS sockets and platforms without
+    sendmsg(). Returns the number of bytes sent.
+    """
+    if isinstance(sock, ssl.SSLSocket) or not hasattr(sock, "sendmsg"):
+        # TLS frames each sendall into records itself; no joined copy needed
+        total = 0
+        for buf in buffers:
+            sock.sendall(buf)
+            total += len(buf)
+        return total
+    views = [memoryview(buf).cast("B") for buf in buffers]
+    views = [view for view in views if view.nbytes]
+    total = 0
+    while views:
+        sent = sock.sendmsg(views[:_SENDMSG_MAX_BUFFERS])
+        total += sent
+        # Drop fully sent buffers and trim a partially sent one
+        i = 0
+        while i < len(views) and sent >= len(views[i]):
+            sent -= len(views[i])
+            i += 1
+        del views[:i]
+        if views and sent:
+            views[0] = views[0][sent:]
+    return total
+
+
 # -----------------------------
 # 📁 File Utilities
 # -----------------------------
@@ -53,6 +90,51 @@ def recv_all(sock: socket.socket, total_bytes: int) -> bytes:
     return data
 
 
+_wakeup_lock = threading.Lock()
+
+
+class _EventWakeup:
+    """
+    Socket-like object that turns readable once a threading.Event is set, so a
+    selector can wait on the event and on sockets together instead of polling.
+    """
+
+    def __init__(self, event: threading.Event):
+        self._event = event
+        self._recv, self._send = socket.socketpair()
+        self._recv.setblocking(False)
+        self._send.setblocking(False)
+        with _wakeup_lock:
+            targets = event.__dict__.get("_kn_wakeups")
+            if targets is None:
+                targets = event._kn_wakeups = set()
+                original_set = event.set
+
+                def set_and_wake():
+                    original_set()
+                    with _wakeup_lock:
+                        socks = list(targets)
+                    for s in socks:
+                        try:
+                            s.send(b"\0")
+                        except OSError:
+                            pass
+
+                event.set = set_and_wake
+            targets.add(self._send)
+        if event.is_set():
+            self._send.send(b"\0")
+
+    def fileno(self) -> int:
+        return self._recv.fileno()
+
+    def close(self) -> None:
+        with _wakeup_lock:
+            self._event._kn_wakeups.discard(self._send)
+        self._recv.close()
+        self._send.close()
+
+
 # -----------------------------
 # 📊 Progress Display
 # -----------------------------
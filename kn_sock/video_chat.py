@@ -8,6 +8,13 @@ import time
 import numpy as np
 import os
 
+try:
+    import simplejpeg
+
+    _HAS_SIMPLEJPEG = True
+except ImportError:
+    _HAS_SIMPLEJPEG = False
+
 # Set display backend for OpenCV to avoid Qt issues
 os.environ["QT_QPA_PLATFORM"] = "xcb"
 
@@ -22,10 +29,45 @@ CHANNELS = 1
 RATE = 44100  # Changed from 16000 to 44100
 CHUNK = 1024
 
+# Frames travel as JPEG; simplejpeg (libjpeg-turbo) is used when installed
+JPEG_QUALITY = 80
+_JPEG_MAGIC = b"\xff\xd8"
+
+
+def _encode_frame(frame):
+    """Encode a BGR frame as JPEG bytes."""
+    if _HAS_SIMPLEJPEG:
+        return simplejpeg.encode_jpeg(
+            frame, quality=JPEG_QUALITY, colorspace="BGR", fastdct=True
+        )
+    _, buffer = cv2.imencode(
+        ".jpg", frame, [int(cv2.IMWRITE_JPEG_QUALITY), JPEG_QUALITY]
+    )
+    return buffer.tobytes()
+
+
+def _decode_frame(data):
+    """Decode a received frame; pickled arrays from older clients still work."""
+    if data[:2] != _JPEG_MAGIC:
+        return pickle.loads(data)
+    if _HAS_SIMPLEJPEG:
+        return simplejpeg.decode_jpeg(data, colorspace="BGR")
+    return cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+
+
+def _set_nodelay(sock):
+    """Send small frames immediately instead of waiting on Nagle's algorithm."""
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
 
 class VideoChatServer:
     def __init__(
-        self, host="0.0.0.0", video_port=9000, audio_port=9001, text_port=9002
+        self,
+        host="0.0.0.0",
+        video_port=9000,
+        audio_port=9001,
+        text_port=9002,
+        low_latency=False,
     ):
         self.host = host
         self.video_port = video_port
@@ -35,7 +77,27 @@ class VideoChatServer:
             {}
         )  # room_name -> { 'video': [clients], 'audio': [clients], 'text': [clients], 'nicknames': {sock: name} }
         self.lock = threading.Lock()
+        self._stop_event = threading.Event()
         self.running = False
+        self.low_latency = low_latency
+
+    @property
+    def running(self):
+        return not self._stop_event.is_set()
+
+    @running.setter
+    def running(self, value):
+        if value:
+            self._stop_event.clear()
+        else:
+            self._stop_event.set()
+
+    def stop(self):
+        self.running = False
+
+    def wait(self, timeout=None):
+        """Block until stop() is called; returns False if timeout expires."""
+        return self._stop_event.wait(timeout)
 
     def start(self):
         self.running = True
@@ -49,6 +111,8 @@ class VideoChatServer:
         s.listen(5)
         while self.running:
             client, _ = s.accept()
+            if self.low_latency:
+                _set_nodelay(client)
             threading.Thread(
                 target=self._handle_video_client, args=(client,), daemon=True
             ).start()
@@ -59,6 +123,8 @@ class VideoChatServer:
         s.listen(5)
         while self.running:
             client, _ = s.accept()
+            if self.low_latency:
+                _set_nodelay(client)
             threading.Thread(
                 target=self._handle_audio_client, args=(client,), daemon=True
             ).start()
@@ -69,6 +135,8 @@ class VideoChatServer:
         s.listen(5)
         while self.running:
             client, _ = s.accept()
+            if self.low_latency:
+                _set_nodelay(client)
             threading.Thread(
                 target=self._handle_text_client, args=(client,), daemon=True
             ).start()
@@ -331,6 +399,7 @@ class VideoChatClient:
         room="main",
         nickname="user",
         enable_audio=True,
+        low_latency=False,
     ):
         self.server_ip = server_ip
         self.video_port = video_port
@@ -341,6 +410,7 @@ class VideoChatClient:
         self.video_sock = None
         self.audio_sock = None
         self.text_sock = None
+        self._stop_event = threading.Event()
         self.running = False
         self.chat_messages = []
         self.chat_lock = threading.Lock()
@@ -349,6 +419,25 @@ class VideoChatClient:
         self.controls_lock = threading.Lock()
         self.audio_available = enable_audio
         self.video_available = True
+        self.low_latency = low_latency
+
+    @property
+    def running(self):
+        return not self._stop_event.is_set()
+
+    @running.setter
+    def running(self, value):
+        if value:
+            self._stop_event.clear()
+        else:
+            self._stop_event.set()
+
+    def stop(self):
+        self.running = False
+
+    def wait(self, timeout=None):
+        """Block until the client stops; returns False if timeout expires."""
+        return self._stop_event.wait(timeout)
 
     def start(self):
         self.running = True
@@ -358,6 +447,9 @@ class VideoChatClient:
         self.audio_sock.connect((self.server_ip, self.audio_port))
         self.text_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.text_sock.connect((self.server_ip, self.text_port))
+        if self.low_latency:
+            for sock in (self.video_sock, self.audio_sock, self.text_sock):
+                _set_nodelay(sock)
         self._send_handshake(self.video_sock)
         self._send_handshake(self.audio_sock)
         self._send_handshake(self.text_sock)
@@ -386,6 +478,14 @@ class VideoChatClient:
             cap.set(cv2.CAP_PROP_FRAME_WIDTH, FRAME_WIDTH)
             cap.set(cv2.CAP_PROP_FRAME_HEIGHT, FRAME_HEIGHT)
             cap.set(cv2.CAP_PROP_FPS, FRAME_RATE)
+            if self.low_latency:
+                # Keep only the newest frame instead of a queue of stale ones
+                cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+            # Encoded once; resent unchanged while video is disabled
+            black_frame = _encode_frame(
+                np.zeros((FRAME_HEIGHT, FRAME_WIDTH, 3), dtype=np.uint8)
+            )
 
             while self.running:
                 with self.controls_lock:
@@ -393,15 +493,11 @@ class VideoChatClient:
                         ret, frame = cap.read()
                         if not ret:
                             continue
-                        data = pickle.dumps(frame)
+                        data = _encode_frame(frame)
                         self._send_msg(self.video_sock, data)
                     else:
                         # Send a black frame when video is disabled
-                        black_frame = np.zeros(
-                            (FRAME_HEIGHT, FRAME_WIDTH, 3), dtype=np.uint8
-                        )
-                        data = pickle.dumps(black_frame)
-                        self._send_msg(self.video_sock, data)
+                        self._send_msg(self.video_sock, black_frame)
             cap.release()
         except Exception as e:
             print(f"Video error: {e}")
@@ -415,7 +511,7 @@ class VideoChatClient:
                 data = self._recv_msg(self.video_sock)
                 if not data:
                     continue
-                frame = pickle.loads(data)
+                frame = _decode_frame(data)
                 # Add chat overlay
                 frame = self._add_chat_overlay(frame)
                 # Add controls overlay
@@ -440,10 +536,10 @@ class VideoChatClient:
             print(f"Video display error: {e}")
 
     def _add_chat_overlay(self, frame):
-        # Add semi-transparent overlay for chat
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (0, 0), (frame.shape[1], 120), (0, 0, 0), -1)
-        cv2.addWeighted(overlay, 0.7, frame, 0.3, 0, frame)
+        # Add semi-transparent overlay for chat: blending 70% black into the
+        # top band (rows 0-120) is a 0.3 scale of just those rows, in place
+        band = frame[:121]
+        cv2.addWeighted(band, 0.3, band, 0, 0, band)
 
         # Add chat messages
         with self.chat_lock:
@@ -1,12 +1,109 @@
 import socket
-import threading
 import base64
+import functools
 import hashlib
+import os
+import selectors
 import struct
-from typing import Callable, Optional, Dict, Awaitable
+import threading
+from typing import Callable, Optional, Dict, Awaitable, Tuple, Union
 import asyncio
 
+from kn_sock.utils import _EventWakeup
+
+try:
+    import numpy as np
+
+    _HAS_NUMPY = True
+except ImportError:
+    _HAS_NUMPY = False
+
 GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+GUID_BYTES = GUID.encode("ascii")
+
+# 101 response around the Sec-WebSocket-Accept value, kept as bytes
+_RESP_PREFIX = (
+    b"HTTP/1.1 101 Switching Protocols\r\n"
+    b"Upgrade: websocket\r\n"
+    b"Connection: Upgrade\r\n"
+    b"Sec-WebSocket-Accept: "
+)
+_RESP_SUFFIX = b"\r\n\r\n"
+
+# Fixed client headers between Host and the Sec-WebSocket-Key value
+_CLIENT_UPGRADE_HEADERS = (
+    b"\r\nUpgrade: websocket\r\nConnection: Upgrade\r\nSec-WebSocket-Key: "
+)
+
+# Bytes asked of the socket per read in WebSocketConnection
+_RECV_CHUNK = 65536
+
+# Seconds a client may take to send its upgrade request
+HANDSHAKE_TIMEOUT = 5.0
+
+# Below this payload size NumPy's per-call setup costs more than it saves;
+# smaller frames are XORed as one Python integer
+_NUMPY_UNMASK_MIN = 1024
+
+# XOR with an all-zero masking key is a no-op, so such frames skip unmasking
+_ZERO_MASK = b"\x00\x00\x00\x00"
+
+
+def _tune_socket(
+    sock: socket.socket, sndbuf: Optional[int] = None, rcvbuf: Optional[int] = None
+) -> socket.socket:
+    """Disable Nagle for small, latency-bound frames; optionally size kernel buffers."""
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    # Left at the OS default unless given, so Linux keeps autotuning them
+    if sndbuf:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, sndbuf)
+    if rcvbuf:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, rcvbuf)
+    return sock
+
+
+def _unmask(data: bytes, mask: bytes) -> Union[bytes, bytearray]:
+    # XOR the payload with the repeating 4-byte masking key (RFC 6455 5.3).
+    # Both paths below already run in compiled loops, so there is no Numba
+    # kernel: Numba needs NumPy anyway, whose XOR is SIMD-dispatched, and its
+    # call overhead exceeds the integer XOR on small frames.
+    if mask == _ZERO_MASK:
+        return data
+    length = len(data)
+    if _HAS_NUMPY and length >= _NUMPY_UNMASK_MIN:
+        # XOR whole 32-bit words in place against the key as one scalar;
+        # NumPy picks an SSE2/AVX2/AVX-512/NEON loop for the CPU at runtime
+        data = bytearray(data)
+        start = length & ~3
+        words = np.frombuffer(data, dtype=np.uint32, count=start >> 2)
+        words ^= np.frombuffer(mask, dtype=np.uint32)[0]
+        for i in range(start, length):
+            data[i] ^= mask[i & 3]
+        # Callers only decode the result, so skip a second full-size copy
+        return data
+    # Otherwise XOR the whole payload as one integer: a single C-level loop
+    # over machine words instead of one interpreter step per byte
+    key = (mask * ((length >> 2) + 1))[:length]
+    return (int.from_bytes(data, "little") ^ int.from_bytes(key, "little")).to_bytes(
+        length, "little"
+    )
+
+
+@functools.lru_cache(maxsize=4096)
+def _frame_header(length: int) -> bytes:
+    # Text frame header (FIN + opcode 1) for a payload length; cached because
+    # chat and telemetry traffic repeats the same few sizes
+    if length < 126:
+        return bytes((0x81, length))
+    if length < (1 << 16):
+        return struct.pack("!BBH", 0x81, 126, length)
+    return struct.pack("!BBQ", 0x81, 127, length)
+
+
+def _text_frame(message: str) -> bytes:
+    # Unfragmented text frame; one allocation for header + payload
+    payload = message.encode("utf-8")
+    return _frame_header(len(payload)) + payload
 
 
 class WebSocketConnection:
@@ -14,41 +111,45 @@ class WebSocketConnection:
         self.conn = conn
         self.addr = addr
         self.open = True
+        # Bytes received but not yet parsed; one recv() usually holds a
+        # whole small frame, so header, mask and payload need one syscall
+        self._rbuf = bytearray()
 
     def send(self, message: str):
         # Send a text frame
-        payload = message.encode("utf-8")
-        header = b"\x81"  # FIN + text frame
-        length = len(payload)
-        if length < 126:
-            header += struct.pack("B", length)
-        elif length < (1 << 16):
-            header += struct.pack("!BH", 126, length)
-        else:
-            header += struct.pack("!BQ", 127, length)
-        self.conn.sendall(header + payload)
+        self.conn.sendall(_text_frame(message))
+
+    def _read_exactly(self, n: int) -> bytes:
+        rbuf = self._rbuf
+        while len(rbuf) < n:
+            chunk = self.conn.recv(max(n - len(rbuf), _RECV_CHUNK))
+            if not chunk:
+                raise ConnectionError("WebSocket connection closed mid-frame")
+            rbuf += chunk
+        out = bytes(rbuf[:n])
+        del rbuf[:n]
+        return out
 
     def recv(self) -> str:
         # Receive a text frame (no fragmentation, no extensions)
-        first2 = self.conn.recv(2)
-        if not first2:
-            self.open = False
-            return ""
-        fin_opcode, mask_len = first2
+        if not self._rbuf:
+            chunk = self.conn.recv(_RECV_CHUNK)
+            if not chunk:
+                self.open = False
+                return ""
+            self._rbuf += chunk
+        fin_opcode, mask_len = self._read_exactly(2)
         masked = mask_len & 0x80
         length = mask_len & 0x7F
         if length == 126:
-            length = struct.unpack("!H", self.conn.recv(2))[0]
+            length = int.from_bytes(self._read_exactly(2), "big")
         elif length == 127:
-            length = struct.unpack("!Q", self.conn.recv(8))[0]
+            length = int.from_bytes(self._read_exactly(8), "big")
         if masked:
-            mask = self.conn.recv(4)
-            data = bytearray(self.conn.recv(length))
-            for i in range(length):
-                data[i] ^= mask[i % 4]
-            return data.decode("utf-8")
+            mask = self._read_exactly(4)
+            return _unmask(self._read_exactly(length), mask).decode("utf-8")
         else:
-            data = self.conn.recv(length)
+            data = self._read_exactly(length)
             return data.decode("utf-8")
 
     def close(self):
@@ -61,31 +162,52 @@ class WebSocketConnection:
         self.open = False
 
 
-def _handshake(conn):
-    # Minimal WebSocket handshake
-    request = b""
-    while b"\r\n\r\n" not in request:
-        chunk = conn.recv(1024)
+def _handshake_response(key: bytes) -> bytes:
+    # Sec-WebSocket-Accept is base64(SHA-1(key + GUID)) (RFC 6455 4.2.2)
+    h = hashlib.sha1(key)
+    h.update(GUID_BYTES)
+    return _RESP_PREFIX + base64.b64encode(h.digest()) + _RESP_SUFFIX
+
+
+def _read_http_head(sock) -> Optional[Tuple[bytes, bytes]]:
+    # Read up to the blank line ending an HTTP head. Returns (head, rest),
+    # where rest holds any bytes received after it, or None on EOF
+    buf = bytearray()
+    scan = 0
+    while True:
+        chunk = sock.recv(4096)
         if not chunk:
-            return False
-        request += chunk
+            return None
+        buf += chunk
+        # Only rescan the new bytes, plus 3 in case the marker straddles chunks
+        idx = buf.find(b"\r\n\r\n", max(0, scan - 3))
+        if idx != -1:
+            return bytes(buf[:idx]), bytes(buf[idx + 4 :])
+        scan = len(buf)
+
+
+def _sec_websocket_key(request: bytes) -> Optional[bytes]:
+    # Header names and values stay bytes; nothing here needs decoding
     headers = {}
-    for line in request.decode().split("\r\n")[1:]:
-        if ": " in line:
-            k, v = line.split(": ", 1)
+    for line in request.split(b"\r\n")[1:]:
+        if b": " in line:
+            k, v = line.split(b": ", 1)
             headers[k.lower()] = v
-    key = headers.get("sec-websocket-key")
+    return headers.get(b"sec-websocket-key")
+
+
+def _handshake(conn) -> Optional[bytes]:
+    # Minimal WebSocket handshake; returns bytes read past the request
+    # (the start of the first frame), or None if the handshake failed
+    head = _read_http_head(conn)
+    if head is None:
+        return None
+    request, rest = head
+    key = _sec_websocket_key(request)
     if not key:
-        return False
-    accept = base64.b64encode(hashlib.sha1((key + GUID).encode()).digest()).decode()
-    response = (
-        "HTTP/1.1 101 Switching Protocols\r\n"
-        "Upgrade: websocket\r\n"
-        "Connection: Upgrade\r\n"
-        f"Sec-WebSocket-Accept: {accept}\r\n\r\n"
-    )
-    conn.sendall(response.encode())
-    return True
+        return None
+    conn.sendall(_handshake_response(key))
+    return rest
 
 
 def start_websocket_server(
@@ -93,6 +215,7 @@ def start_websocket_server(
     port: int,
     handler: Callable[[WebSocketConnection], None],
     shutdown_event=None,
+    max_workers: int = 256,
 ):
     """
     Start a minimal WebSocket server.
@@ -101,32 +224,120 @@ def start_websocket_server(
         port (int): Port to bind.
         handler (callable): Function called with WebSocketConnection for each client.
         shutdown_event (threading.Event, optional): For graceful shutdown.
+        max_workers (int): Maximum number of clients handled at once (default 256).
+            Each handler holds a thread for its connection's lifetime; further
+            clients wait in the listen backlog until one finishes.
     """
+
+    def serve_client(conn, addr):
+        # The handshake runs here, not on the accept loop, so a slow client
+        # cannot hold up accepts; the timeout bounds slowloris-style stalls
+        try:
+            conn.settimeout(HANDSHAKE_TIMEOUT)
+            rest = _handshake(conn)
+            conn.settimeout(None)
+        except OSError:
+            rest = None
+        if rest is None:
+            conn.close()
+            return
+        ws = WebSocketConnection(conn, addr)
+        ws._rbuf += rest
+        try:
+            handler(ws)
+        except Exception as e:
+            print(f"[WebSocket][SERVER] Handler error for {addr}: {e}")
+
+    def run_client(conn, addr):
+        try:
+            serve_client(conn, addr)
+        finally:
+            slots.release()
+            # Wake the accept loop in case it stopped accepting at capacity
+            try:
+                freed_w.send(b"\0")
+            except OSError:
+                pass
+
+    # Daemon threads, so a handler blocked in recv() cannot keep the process
+    # alive after the server stops; the semaphore bounds how many run at once
+    slots = threading.BoundedSemaphore(max_workers)
+    freed_r, freed_w = socket.socketpair()
+    freed_r.setblocking(False)
+    freed_w.setblocking(False)
     sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
     sock.bind((host, port))
     sock.listen(5)
     print(f"[WebSocket][SERVER] Listening on {host}:{port}")
+
+    # Block until a connection arrives or shutdown_event is set; no timeout polling
+    sel = selectors.DefaultSelector()
+    sel.register(sock, selectors.EVENT_READ)
+    sel.register(freed_r, selectors.EVENT_READ)
+    accepting = True
+    wakeup = None
+    if shutdown_event is not None:
+        wakeup = _EventWakeup(shutdown_event)
+        sel.register(wakeup, selectors.EVENT_READ)
     try:
         while True:
             if shutdown_event is not None and shutdown_event.is_set():
                 print("[WebSocket][SERVER] Shutdown event set. Stopping server.")
                 break
-            sock.settimeout(1.0)
-            try:
+            for key, _ in sel.select():
+                if key.fileobj is freed_r:
+                    try:
+                        freed_r.recv(4096)
+                    except BlockingIOError:
+                        pass
+                    if not accepting:
+                        sel.register(sock, selectors.EVENT_READ)
+                        accepting = True
+                    continue
+                if key.fileobj is not sock:
+                    continue
+                if not slots.acquire(blocking=False):
+                    # At capacity: stop watching the listener, leaving new
+                    # clients in the backlog, until a handler frees a slot
+                    sel.unregister(sock)
+                    accepting = False
+                    continue
                 conn, addr = sock.accept()
-            except socket.timeout:
-                continue
-            if not _handshake(conn):
-                conn.close()
-                continue
-            ws = WebSocketConnection(conn, addr)
-            threading.Thread(target=handler, args=(ws,), daemon=True).start()
+                _tune_socket(conn)
+                threading.Thread(
+                    target=run_client, args=(conn, addr), daemon=True
+                ).start()
     finally:
+        sel.close()
+        freed_r.close()
+        freed_w.close()
+        if wakeup is not None:
+            wakeup.close()
         sock.close()
         print("[WebSocket][SERVER] Shutdown complete.")
 
 
+def _client_handshake(
+    host: str, port: int, resource: str, headers: Optional[Dict[str, str]]
+) -> bytes:
+    # Upgrade request assembled as bytes; only the variable parts are encoded
+    req = (
+        b"GET "
+        + resource.encode()
+        + b" HTTP/1.1\r\nHost: "
+        + host.encode()
+        + b":"
+        + str(port).encode()
+        + _CLIENT_UPGRADE_HEADERS
+        + base64.b64encode(os.urandom(16))
+        + b"\r\nSec-WebSocket-Version: 13\r\n"
+    )
+    if headers:
+        req += "".join(f"{k}: {v}\r\n" for k, v in headers.items()).encode()
+    return req + b"\r\n"
+
+
 def connect_websocket(
     host: str, port: int, resource: str = "/", headers: Optional[dict] = None
 ) -> WebSocketConnection:
@@ -140,35 +351,18 @@ def connect_websocket(
     Returns:
         WebSocketConnection
     """
-    import os
-    import random
-
     sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     sock.connect((host, port))
-    key = base64.b64encode(os.urandom(16)).decode()
-    req = (
-        f"GET {resource} HTTP/1.1\r\n"
-        f"Host: {host}:{port}\r\n"
-        "Upgrade: websocket\r\n"
-        "Connection: Upgrade\r\n"
-        f"Sec-WebSocket-Key: {key}\r\n"
-        "Sec-WebSocket-Version: 13\r\n"
-    )
-    if headers:
-        for k, v in headers.items():
-            req += f"{k}: {v}\r\n"
-    req += "\r\n"
-    sock.sendall(req.encode())
+    _tune_socket(sock)
+    sock.sendall(_client_handshake(host, port, resource, headers))
     # Read response
-    resp = b""
-    while b"\r\n\r\n" not in resp:
-        chunk = sock.recv(1024)
-        if not chunk:
-            raise ConnectionError("WebSocket handshake failed")
-        resp += chunk
-    if b"101" not in resp.split(b"\r\n", 1)[0]:
+    head = _read_http_head(sock)
+    if head is None or b"101" not in head[0].split(b"\r\n", 1)[0]:
         raise ConnectionError("WebSocket handshake failed")
-    return WebSocketConnection(sock, (host, port))
+    ws = WebSocketConnection(sock, (host, port))
+    # A frame sent right after the 101 may have arrived with it
+    ws._rbuf += head[1]
+    return ws
 
 
 # --- Async WebSocket Client ---
@@ -179,16 +373,10 @@ class AsyncWebSocketConnection:
         self.open = True
 
     async def send(self, message: str):
+        # Hand header and payload over separately; the transport can send
+        # them with one sendmsg() (Python 3.12+) without joining them first
         payload = message.encode("utf-8")
-        header = b"\x81"
-        length = len(payload)
-        if length < 126:
-            header += struct.pack("B", length)
-        elif length < (1 << 16):
-            header += struct.pack("!BH", 126, length)
-        else:
-            header += struct.pack("!BQ", 127, length)
-        self.writer.write(header + payload)
+        self.writer.writelines((_frame_header(len(payload)), payload))
         await self.writer.drain()
 
     async def recv(self) -> str:
@@ -200,15 +388,13 @@ class AsyncWebSocketConnection:
         masked = mask_len & 0x80
         length = mask_len & 0x7F
         if length == 126:
-            length = struct.unpack("!H", await self.reader.readexactly(2))[0]
+            length = int.from_bytes(await self.reader.readexactly(2), "big")
         elif length == 127:
-            length = struct.unpack("!Q", await self.reader.readexactly(8))[0]
+            length = int.from_bytes(await self.reader.readexactly(8), "big")
         if masked:
             mask = await self.reader.readexactly(4)
-            data = bytearray(await self.reader.readexactly(length))
-            for i in range(length):
-                data[i] ^= mask[i % 4]
-            return data.decode("utf-8")
+            data = await self.reader.readexactly(length)
+            return _unmask(data, mask).decode("utf-8")
         else:
             data = await self.reader.readexactly(length)
             return data.decode("utf-8")
@@ -226,39 +412,75 @@ class AsyncWebSocketConnection:
 async def async_connect_websocket(
     host: str, port: int, resource: str = "/", headers: Optional[Dict[str, str]] = None
 ) -> AsyncWebSocketConnection:
-    import os
-
     reader, writer = await asyncio.open_connection(host, port)
-    key = base64.b64encode(os.urandom(16)).decode()
-    req = (
-        f"GET {resource} HTTP/1.1\r\n"
-        f"Host: {host}:{port}\r\n"
-        "Upgrade: websocket\r\n"
-        "Connection: Upgrade\r\n"
-        f"Sec-WebSocket-Key: {key}\r\n"
-        "Sec-WebSocket-Version: 13\r\n"
-    )
-    if headers:
-        for k, v in headers.items():
-            req += f"{k}: {v}\r\n"
-    req += "\r\n"
-    writer.write(req.encode())
+    _tune_socket(writer.get_extra_info("socket"))
+    writer.write(_client_handshake(host, port, resource, headers))
     await writer.drain()
-    resp = b""
-    while b"\r\n\r\n" not in resp:
-        chunk = await reader.read(1024)
-        if not chunk:
-            raise ConnectionError("WebSocket handshake failed")
-        resp += chunk
+    # readuntil() leaves any bytes after the head buffered in the reader
+    try:
+        resp = await reader.readuntil(b"\r\n\r\n")
+    except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+        raise ConnectionError("WebSocket handshake failed")
     if b"101" not in resp.split(b"\r\n", 1)[0]:
         raise ConnectionError("WebSocket handshake failed")
     return AsyncWebSocketConnection(reader, writer)
 
 
+async def start_websocket_server_async(
+    host: str,
+    port: int,
+    handler: Callable[[AsyncWebSocketConnection], Awaitable[None]],
+    shutdown_event: Optional[asyncio.Event] = None,
+):
+    """
+    Start a WebSocket server on the asyncio event loop: the async counterpart
+    of start_websocket_server, serving each client as a task instead of a thread.
+    Args:
+        host (str): Host to bind.
+        port (int): Port to bind.
+        handler (callable): Async function called with an AsyncWebSocketConnection
+            for each client.
+        shutdown_event (asyncio.Event, optional): Server exits when the event is set.
+    """
+
+    async def handle_client(reader, writer):
+        addr = writer.get_extra_info("peername")
+        _tune_socket(writer.get_extra_info("socket"))
+        try:
+            try:
+                request = await reader.readuntil(b"\r\n\r\n")
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                return
+            key = _sec_websocket_key(request)
+            if not key:
+                return
+            writer.write(_handshake_response(key))
+            await writer.drain()
+            await handler(AsyncWebSocketConnection(reader, writer))
+        except Exception as e:
+            print(f"[WebSocket][ASYNC] Handler error for {addr}: {e}")
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+    server = await asyncio.start_server(handle_client, host, port)
+    print(f"[WebSocket][ASYNC] Server listening on {host}:{port}")
+    async with server:
+        if shutdown_event is not None:
+            await shutdown_event.wait()
+            print("[WebSocket][ASYNC] Shutdown event set. Stopping server.")
+        else:
+            await server.serve_forever()
+    print("[WebSocket][ASYNC] Shutdown complete.")
+
+
 async def start_async_websocket_server(
     port: int,
     handler: Callable[[dict, tuple, asyncio.StreamWriter], Awaitable[None]],
-    host: str = "localhost"
+    host: str = "localhost",
 ):
     """
     Start an asynchronous WebSocket server.
@@ -267,35 +489,26 @@ async def start_async_websocket_server(
         handler (callable): Async function to handle (data, addr, writer).
         host (str): Host to bind.
     """
+
     async def handle_client(reader, writer):
-        addr = writer.get_extra_info('peername')
+        addr = writer.get_extra_info("peername")
+        _tune_socket(writer.get_extra_info("socket"))
         try:
             # Simple WebSocket handshake for async server
-            request = await reader.readuntil(b'\r\n\r\n')
-            if b'Upgrade: websocket' in request:
+            request = await reader.readuntil(b"\r\n\r\n")
+            if b"Upgrade: websocket" in request:
                 # Extract Sec-WebSocket-Key
-                lines = request.decode().split('\r\n')
+                lines = request.split(b"\r\n")
                 key = None
                 for line in lines:
-                    if line.startswith('Sec-WebSocket-Key:'):
-                        key = line.split(':', 1)[1].strip()
+                    if line.startswith(b"Sec-WebSocket-Key:"):
+                        key = line.split(b":", 1)[1].strip()
                         break
-                
+
                 if key:
-                    # Generate response key
-                    accept = base64.b64encode(
-                        hashlib.sha1((key + GUID).encode()).digest()
-                    ).decode()
-                    
-                    response = (
-                        "HTTP/1.1 101 Switching Protocols\r\n"
-                        "Upgrade: websocket\r\n"
-                        "Connection: Upgrade\r\n"
-                        f"Sec-WebSocket-Accept: {accept}\r\n\r\n"
-                    )
-                    writer.write(response.encode())
+                    writer.write(_handshake_response(key))
                     await writer.drain()
-                    
+
                     # Create async WebSocket connection and handle messages
                     ws_conn = AsyncWebSocketConnection(reader, writer)
                     while True:
@@ -318,6 +531,6 @@ async def start_async_websocket_server(
 
     server = await asyncio.start_server(handle_client, host, port)
     print(f"[WebSocket][ASYNC] Server listening on {host}:{port}")
-    
+
     async with server:
         await server.serve_forever()
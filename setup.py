@@ -18,6 +18,14 @@ setup(
         ],
     },
     install_requires=["opencv-python", "numpy", "pyaudio", "ffmpeg-python"],
+    extras_require={
+        "test": [
+            "pytest",
+            "pytest-asyncio",
+            "pytest-benchmark",
+            "uvloop; sys_platform != 'win32'",
+        ],
+    },
     author="Khagendra Neupane",
     author_email="nkhagendra1@gmail.com",
     description="Modern Python networking library with comprehensive protocol support and developer-friendly APIs",
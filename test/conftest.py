@@ -0,0 +1,28 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from kn_sock import install_fast_event_loop
+
+_default_policy = None
+
+
+def pytest_configure(config):
+    # Runs before pytest-asyncio reads the policy, so every test loop (and
+    # asyncio.run in server threads) uses uvloop when it is installed.
+    global _default_policy
+    _default_policy = asyncio.get_event_loop_policy()
+    install_fast_event_loop()
+
+
+def pytest_unconfigure(config):
+    if _default_policy is not None:
+        asyncio.set_event_loop_policy(_default_policy)
+
+
+@pytest.fixture(scope="session")
+def server_pool():
+    """Reused threads for blocking servers; tests must stop what they submit."""
+    with ThreadPoolExecutor(max_workers=4, thread_name_prefix="test-server") as pool:
+        yield pool
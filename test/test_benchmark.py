@@ -0,0 +1,72 @@
+import socket
+import threading
+import time
+
+import pytest
+
+from kn_sock import (
+    send_tcp_message,
+    send_tcp_messages,
+    send_udp_message,
+    start_selector_tcp_server,
+)
+from kn_sock.utils import get_free_port
+
+# Skips this module unless pytest-benchmark is installed (pip install -e ".[test]")
+pytest.importorskip("pytest_benchmark")
+
+# Small, page-sized and socket-buffer-sized payloads
+SIZES = [64, 4096, 65536]
+# Largest payload that fits in one IPv4 UDP datagram
+MAX_UDP_PAYLOAD = 65507
+
+
+@pytest.fixture(scope="module")
+def tcp_server_port():
+    """Selector TCP server that answers every read with b"ok"."""
+    port = get_free_port()
+    shutdown_event = threading.Event()
+    threading.Thread(
+        target=start_selector_tcp_server,
+        args=(port, lambda data, addr, sock: sock.sendall(b"ok")),
+        kwargs={"shutdown_event": shutdown_event},
+        daemon=True,
+    ).start()
+    deadline = time.monotonic() + 5
+    while True:
+        try:
+            socket.create_connection(("localhost", port), timeout=0.05).close()
+            break
+        except OSError:
+            if time.monotonic() > deadline:
+                pytest.fail("TCP server did not start in time")
+            time.sleep(0.01)
+    yield port
+    shutdown_event.set()
+
+
+@pytest.fixture(scope="module")
+def udp_sink_port():
+    """Bound UDP socket that is never read; the kernel drops what overflows."""
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sink:
+        sink.bind(("127.0.0.1", 0))
+        yield sink.getsockname()[1]
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_bench_send_tcp_message(benchmark, tcp_server_port, size):
+    payload = b"x" * size
+    benchmark(send_tcp_message, "localhost", tcp_server_port, payload)
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_bench_send_tcp_messages(benchmark, tcp_server_port, size):
+    payloads = [b"x" * size] * 10
+    responses = benchmark(send_tcp_messages, "localhost", tcp_server_port, payloads)
+    assert len(responses) == len(payloads)
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_bench_send_udp_message(benchmark, udp_sink_port, size):
+    payload = b"x" * min(size, MAX_UDP_PAYLOAD)
+    benchmark(send_udp_message, "127.0.0.1", udp_sink_port, payload)
@@ -1,4 +1,5 @@
 import os
+import socket
 import tempfile
 import threading
 import asyncio
@@ -53,26 +54,47 @@ def test_sync_file_transfer(temp_text_file, temp_dir):
     print("[SUCCESS] Sync file transfer")
 
 
+def _accepts_connections(port):
+    try:
+        socket.create_connection(("localhost", port), timeout=0.05).close()
+        return True
+    except OSError:
+        return False
+
+
+def _read_or_none(path):
+    try:
+        with open(path) as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+async def wait_for_async(predicate, timeout=2.0):
+    """Poll predicate every 10 ms instead of sleeping a fixed time."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not predicate():
+        if loop.time() > deadline:
+            pytest.fail("Condition not met in time")
+        await asyncio.sleep(0.01)
+
+
 @pytest.mark.asyncio
 async def test_async_file_transfer(temp_text_file, temp_dir):
     port = get_free_port()
     received_path = os.path.join(temp_dir, os.path.basename(temp_text_file))
 
-    async def server():
-        await start_file_server_async(port, temp_dir)
-
-    server_task = asyncio.create_task(server())
-    await asyncio.sleep(0.5)
+    shutdown_event = asyncio.Event()
+    server_task = asyncio.create_task(
+        start_file_server_async(port, temp_dir, shutdown_event=shutdown_event)
+    )
+    await wait_for_async(lambda: _accepts_connections(port))
     await send_file_async("localhost", port, temp_text_file)
-    await asyncio.sleep(0.5)
-    assert os.path.exists(received_path)
-    with open(received_path) as f:
-        assert f.read() == "hello world"
-    server_task.cancel()
-    try:
-        await server_task
-    except asyncio.CancelledError:
-        pass
+    # The sender returns once the bytes are sent; the server saves them after
+    await wait_for_async(lambda: _read_or_none(received_path) == "hello world")
+    shutdown_event.set()
+    await asyncio.wait_for(server_task, timeout=2)
     print("[SUCCESS] Async file transfer")
 
 
@@ -4,6 +4,7 @@ import socket
 import json
 import pytest
 from kn_sock import send_json
+from kn_sock.utils import get_free_port
 
 
 # This is a helper to run a *single-connection* JSON server for testing
@@ -51,9 +52,10 @@ def test_handle_json_message_and_server():
         received_data["addr"] = addr
         client_socket.sendall(b'{"status": "received"}')
 
+    port = get_free_port()
     server_thread = threading.Thread(
         target=run_single_connection_json_server,
-        args=(9090, test_handler, stop_event),
+        args=(port, test_handler, stop_event),
         daemon=True,
     )
     server_thread.start()
@@ -63,7 +65,7 @@ def test_handle_json_message_and_server():
 
     test_message = {"message": "Hello, Test!"}
     try:
-        response = send_json("localhost", 9090, test_message)
+        response = send_json("localhost", port, test_message)
     except Exception as e:
         pytest.fail(f"send_json raised an exception: {e}")
 
@@ -84,3 +86,33 @@ def test_handle_json_message_and_server():
     }, f"Unexpected response from server: expected {{'status': 'received'}}, got {response}"
 
     print("[TEST PASSED] JSON server received and responded correctly.")
+
+
+def test_json_server_reads_coalesced_messages():
+    from kn_sock import start_json_server
+
+    received = []
+    done = threading.Event()
+
+    def handler(data, addr, client_socket):
+        received.append(data)
+        if len(received) == 3:
+            done.set()
+
+    port = get_free_port()
+    threading.Thread(
+        target=start_json_server, args=(port, handler), daemon=True
+    ).start()
+    for _ in range(50):
+        try:
+            client = socket.create_connection(("localhost", port))
+            break
+        except ConnectionRefusedError:
+            time.sleep(0.05)
+    else:
+        pytest.fail("JSON server did not start in time")
+    with client:
+        # Three newline-framed messages in a single segment
+        client.sendall(b'{"n": 1}\n{"n": 2}\n{"n": 3}\n')
+        assert done.wait(timeout=2), f"Only received {received}"
+    assert received == [{"n": 1}, {"n": 2}, {"n": 3}]
@@ -14,6 +14,7 @@ from kn_sock import (
     start_async_ssl_tcp_server,
     send_ssl_tcp_message_async,
 )
+from kn_sock.utils import get_free_port
 
 pytestmark = pytest.mark.skipif(
     not shutil.which("openssl"), reason="openssl not available for test cert generation"
@@ -49,7 +50,7 @@ def generate_self_signed_cert(tmpdir):
 def test_ssl_tcp_sync():
     with tempfile.TemporaryDirectory() as tmpdir:
         certfile, keyfile = generate_self_signed_cert(tmpdir)
-        port = 9443
+        port = get_free_port()
         received = {}
 
         def handler(data, addr, client_socket):
@@ -72,11 +73,27 @@ def test_ssl_tcp_sync():
         print("[SUCCESS] SSL TCP sync server/client")
 
 
+async def wait_for_port_async(port, timeout=5.0):
+    """Wait until something accepts TCP connections on localhost:port."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection("localhost", port)
+            writer.close()
+            await writer.wait_closed()
+            return
+        except OSError:
+            if loop.time() > deadline:
+                pytest.fail(f"Server on port {port} did not start in time")
+            await asyncio.sleep(0.01)
+
+
 @pytest.mark.asyncio
 async def test_ssl_tcp_async():
     with tempfile.TemporaryDirectory() as tmpdir:
         certfile, keyfile = generate_self_signed_cert(tmpdir)
-        port = 9444
+        port = get_free_port()
         received = {}
 
         async def handler(data, addr, writer):
@@ -97,11 +114,11 @@ async def test_ssl_tcp_async():
 
         server_thread = threading.Thread(target=run_server, daemon=True)
         server_thread.start()
-        await asyncio.sleep(1)
+        await wait_for_port_async(port)
+        # Returns after reading the ACK, which the handler sends after recording
         await send_ssl_tcp_message_async(
             "localhost", port, "hello ssl", cafile=certfile, verify=False
         )
-        await asyncio.sleep(0.5)
         assert received["data"] == b"hello ssl"
         print("[SUCCESS] SSL TCP async server/client")
 
@@ -113,7 +130,7 @@ def test_tcp_connection_pool_ssl():
 
     with tempfile.TemporaryDirectory() as tmpdir:
         certfile, keyfile = generate_self_signed_cert(tmpdir)
-        port = 9553
+        port = get_free_port()
 
         def echo_server():
             def handler(data, addr, client_socket):
@@ -141,3 +158,133 @@ def test_tcp_connection_pool_ssl():
             assert data == b"ECHO:ssl pool test"
         pool.closeall()
         print("[SUCCESS] TCPConnectionPool SSL/TLS")
+
+
+def test_tcp_connection_pool_ssl_resumes_session():
+    from kn_sock import TCPConnectionPool
+    from kn_sock.utils import get_free_port
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        certfile, keyfile = generate_self_signed_cert(tmpdir)
+        port = get_free_port()
+
+        def handler(data, addr, client_socket):
+            client_socket.sendall(b"ECHO:" + data)
+
+        threading.Thread(
+            target=start_ssl_tcp_server,
+            args=(port, handler, certfile, keyfile),
+            daemon=True,
+        ).start()
+        time.sleep(1)
+        pool = TCPConnectionPool(
+            "localhost", port, max_size=1, idle_timeout=0.1, ssl=True, verify=False
+        )
+        for expect_reused in (False, True):
+            with pool.connection() as conn:
+                conn.sendall(b"resume")
+                assert conn.recv(1024) == b"ECHO:resume"
+                assert conn.session_reused is expect_reused
+            # Let the idle connection expire so the next one is a new handshake
+            time.sleep(0.2)
+        pool.closeall()
+
+
+def test_https_get_reuses_connection():
+    import http.server
+    import socketserver
+    import ssl
+    from kn_sock import https_get
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        certfile, keyfile = generate_self_signed_cert(tmpdir)
+        connections = []
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                connections.append(self.client_address)
+                super().setup()
+
+            def do_GET(self):
+                body = self.path.encode()
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        class Server(socketserver.ThreadingMixIn, http.server.HTTPServer):
+            daemon_threads = True
+
+        httpd = Server(("127.0.0.1", 0), Handler)
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(certfile, keyfile)
+        httpd.socket = context.wrap_socket(httpd.socket, server_side=True)
+        port = httpd.server_address[1]
+        t = threading.Thread(target=httpd.serve_forever, daemon=True)
+        t.start()
+        try:
+            assert https_get("localhost", port, "/one", cafile=certfile) == "/one"
+            assert https_get("localhost", port, "/two", cafile=certfile) == "/two"
+            assert len(connections) == 1
+        finally:
+            httpd.shutdown()
+            httpd.server_close()
+            t.join()
+        print("[SUCCESS] HTTPS keep-alive connection reuse")
+
+
+def test_https_get_chunked_keepalive():
+    import http.server
+    import socketserver
+    import ssl
+    from kn_sock import https_get
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        certfile, keyfile = generate_self_signed_cert(tmpdir)
+        connections = []
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                connections.append(self.client_address)
+                super().setup()
+
+            def do_GET(self):
+                # No Content-Length and the connection stays open: only the
+                # chunk framing tells the client where the body ends
+                self.send_response(200)
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for part in (self.path.encode(), b"-chunked"):
+                    self.wfile.write(b"%x\r\n%s\r\n" % (len(part), part))
+                self.wfile.write(b"0\r\n\r\n")
+
+            def log_message(self, *args):
+                pass
+
+        class Server(socketserver.ThreadingMixIn, http.server.HTTPServer):
+            daemon_threads = True
+
+        httpd = Server(("127.0.0.1", 0), Handler)
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(certfile, keyfile)
+        httpd.socket = context.wrap_socket(httpd.socket, server_side=True)
+        port = httpd.server_address[1]
+        t = threading.Thread(target=httpd.serve_forever, daemon=True)
+        t.start()
+        try:
+            for path in ("/one", "/two"):
+                body = https_get("localhost", port, path, cafile=certfile)
+                assert body == path + "-chunked"
+            assert len(connections) == 1
+        finally:
+            httpd.shutdown()
+            httpd.server_close()
+            t.join()
+        print("[SUCCESS] HTTPS chunked keep-alive response")
@@ -1,11 +1,14 @@
 import pytest
+import pytest_asyncio
 import asyncio
 import threading
 import socket
+import json
 import random
 import time
 from kn_sock import (
     start_tcp_server,
+    start_selector_tcp_server,
     send_tcp_message,
     start_async_tcp_server,
     send_tcp_message_async,
@@ -16,122 +19,187 @@ from kn_sock import (
 )
 from kn_sock.utils import get_free_port
 
-# --- Sync TCP ---
+# --- Sync TCP/UDP ---
 
+# Datagram sent until the server's handler sees it, to detect UDP readiness
+READY_PROBE = b"__ready__"
+# Payloads are pre-encoded so the senders skip str.encode and handlers compare bytes
+MSG_SYNC = {"TCP": b"Hello, Sync TCP!", "UDP": b"Hello, Sync UDP!"}
+MSG_ASYNC = (b"Hello, Async!", b"Second message")
 
-@pytest.fixture
-def run_sync_tcp_server():
-    received_messages = []
 
-    def handler(data, addr, client_socket):
-        received_messages.append(data.decode())
-        client_socket.sendall(b"Message received")
+def wait_for_tcp_server(port, timeout=5.0):
+    """Block until something accepts TCP connections on localhost:port."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            socket.create_connection(("localhost", port), timeout=0.05).close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                pytest.fail(f"TCP server on port {port} did not start in time")
+            time.sleep(0.01)
+
+
+def wait_for_udp_server(port, ready, timeout=5.0):
+    """Send READY_PROBE to localhost:port until the handler sets ready."""
+    deadline = time.monotonic() + timeout
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as probe:
+        while True:
+            probe.sendto(READY_PROBE, ("127.0.0.1", port))
+            if ready.wait(0.05):
+                return
+            if time.monotonic() > deadline:
+                pytest.fail(f"UDP server on port {port} did not start in time")
+
+
+def make_handler():
+    """Sync handler recording messages; returns (handler, messages, ready, received)."""
+    received_messages = []
+    ready = threading.Event()
+    received = threading.Event()
 
+    def handler(data, addr, sock):
+        if data == READY_PROBE:
+            ready.set()
+            return
+        received_messages.append(data)
+        received.set()
+        if sock.type == socket.SOCK_STREAM:
+            sock.sendall(b"Message received")
+
+    return handler, received_messages, ready, received
+
+
+@pytest.mark.parametrize(
+    "protocol,start_server,send_msg",
+    [
+        ("TCP", start_tcp_server, send_tcp_message),
+        ("TCP", start_selector_tcp_server, send_tcp_message),
+        ("UDP", start_udp_server, send_udp_message),
+    ],
+    ids=["tcp", "tcp-selector", "udp"],
+)
+def test_sync_send(server_pool, protocol, start_server, send_msg):
+    handler, received_messages, ready, received = make_handler()
     port = get_free_port()
-    server_thread = threading.Thread(
-        target=start_tcp_server, args=(port, handler), daemon=True
-    )
-    server_thread.start()
-
-    import time
-
-    time.sleep(1)
-    yield received_messages, port
-
-
-def test_sync_tcp(run_sync_tcp_server):
-    import time
-
-    received_messages, port = run_sync_tcp_server
-    for _ in range(10):
+    shutdown_event = threading.Event()
+    server_pool.submit(start_server, port, handler, shutdown_event=shutdown_event)
+    try:
+        if protocol == "TCP":
+            wait_for_tcp_server(port)
+        else:
+            wait_for_udp_server(port, ready)
+        message = MSG_SYNC[protocol]
+        send_msg("localhost", port, message)
+        received.wait(timeout=2.0)
+        assert (
+            message in received_messages
+        ), f"FAILURE: Sync {protocol} server did NOT receive the expected message."
+    finally:
+        # Hand the pool thread back for the next test; it exits on its own
+        # within a second, so there is nothing to join
+        shutdown_event.set()
+
+
+# --- Async TCP/UDP ---
+
+
+async def wait_for_async_tcp_server(port, timeout=5.0):
+    """Wait until something accepts TCP connections on localhost:port."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while True:
         try:
-            send_tcp_message("localhost", port, "Hello, Sync TCP!")
-            break
-        except ConnectionRefusedError:
-            time.sleep(0.2)
-    else:
-        pytest.fail("TCP server did not start in time")
-    time.sleep(0.5)
-    assert (
-        "Hello, Sync TCP!" in received_messages
-    ), "FAILURE: Sync TCP server did NOT receive the expected message."
-    print("SUCCESS: Sync TCP server received the expected message.")
-
-
-# --- Async TCP ---
-
-
-@pytest.mark.asyncio
-async def test_async_tcp():
-    received_messages = []
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection("localhost", port), 0.05
+            )
+            writer.close()
+            await writer.wait_closed()
+            return
+        except (OSError, asyncio.TimeoutError):
+            if loop.time() > deadline:
+                pytest.fail(f"TCP server on port {port} did not start in time")
+            await asyncio.sleep(0.01)
+
+
+async def wait_for_async_udp_server(port, ready, timeout=5.0):
+    """Send READY_PROBE to localhost:port until the handler sets ready."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as probe:
+        while True:
+            probe.sendto(READY_PROBE, ("127.0.0.1", port))
+            try:
+                await asyncio.wait_for(ready.wait(), 0.05)
+                return
+            except asyncio.TimeoutError:
+                if loop.time() > deadline:
+                    pytest.fail(f"UDP server on port {port} did not start in time")
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def async_tcp_server():
+    """One async TCP server shared by the module; yields (port, message queue)."""
+    messages = asyncio.Queue()
 
     async def handler(data, addr, writer):
-        received_messages.append(data.decode())
+        await messages.put(data)
         writer.write(b"Message received")
         await writer.drain()
-        writer.close()
-        await writer.wait_closed()
-
-    server_task = asyncio.create_task(start_async_tcp_server(9091, handler))
-    await asyncio.sleep(1)  # wait for server to start
-
-    await send_tcp_message_async("localhost", 9091, "Hello, Async TCP!")
-
-    await asyncio.sleep(1)  # wait for message handling
-
-    server_task.cancel()
-    try:
-        await server_task
-    except asyncio.CancelledError:
-        pass
 
-    assert (
-        "Hello, Async TCP!" in received_messages
-    ), "FAILURE: Async TCP server did NOT receive the expected message."
-    print("SUCCESS: Async TCP server received the expected message.")
-
-
-# --- Sync UDP ---
+    port = get_free_port()
+    shutdown_event = asyncio.Event()
+    server_task = asyncio.create_task(
+        start_async_tcp_server(port, handler, shutdown_event=shutdown_event)
+    )
+    await wait_for_async_tcp_server(port)
+    yield port, messages
+    shutdown_event.set()
+    await server_task
 
 
-@pytest.fixture
-def run_sync_udp_server():
-    received_messages = []
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def async_udp_server():
+    """One async UDP server shared by the module; yields (port, message queue)."""
+    messages = asyncio.Queue()
+    ready = asyncio.Event()
 
-    def handler(data, addr, server_socket):
-        received_messages.append(data.decode())
+    async def handler(data, addr, transport):
+        if data == READY_PROBE:
+            ready.set()
+        else:
+            await messages.put(data)
 
-    server_thread = threading.Thread(
-        target=start_udp_server, args=(9092, handler), daemon=True
+    port = get_free_port()
+    shutdown_event = asyncio.Event()
+    server_task = asyncio.create_task(
+        start_udp_server_async(port, handler, shutdown_event=shutdown_event)
     )
-    server_thread.start()
-
-    import time
+    await wait_for_async_udp_server(port, ready)
+    yield port, messages
+    shutdown_event.set()
+    await server_task
 
-    time.sleep(0.5)
-    yield received_messages
 
+@pytest.fixture(params=["TCP", "UDP"])
+def async_server(request):
+    """(protocol, send function, port, message queue) for each async server."""
+    if request.param == "TCP":
+        port, messages = request.getfixturevalue("async_tcp_server")
+        return request.param, send_tcp_message_async, port, messages
+    port, messages = request.getfixturevalue("async_udp_server")
+    return request.param, send_udp_message_async, port, messages
 
-def test_sync_udp(run_sync_udp_server):
-    send_udp_message("localhost", 9092, "Hello, Sync UDP!")
-    import time
 
-    time.sleep(0.5)
+@pytest.mark.asyncio(loop_scope="module")
+@pytest.mark.parametrize("message", MSG_ASYNC)
+async def test_async_send(async_server, message):
+    protocol, send_msg, port, messages = async_server
+    await send_msg("127.0.0.1", port, message)
     assert (
-        "Hello, Sync UDP!" in run_sync_udp_server
-    ), "FAILURE: Sync UDP server did NOT receive the expected message."
-    print("SUCCESS: Sync UDP server received the expected message.")
-
-
-# --- Async UDP ---
-
-
-def get_free_port():
-    s = socket.socket()
-    s.bind(("", 0))
-    port = s.getsockname()[1]
-    s.close()
-    return port
+        await asyncio.wait_for(messages.get(), 2.0) == message
+    ), f"FAILURE: Async {protocol} server did NOT receive the expected message."
 
 
 def test_async_udp():
@@ -161,6 +229,91 @@ def test_async_udp():
     ), f"FAILURE: Async UDP server did NOT receive the expected message."
 
 
+def test_udp_server_zero_copy(server_pool):
+    received = []
+    ready = threading.Event()
+    done = threading.Event()
+
+    def handler(data, addr, sock):
+        if data == READY_PROBE:
+            ready.set()
+            return
+        received.append((type(data), bytes(data)))
+        done.set()
+
+    port = get_free_port()
+    stop_event = threading.Event()
+    server_pool.submit(
+        start_udp_server, port, handler, shutdown_event=stop_event, zero_copy=True
+    )
+    try:
+        wait_for_udp_server(port, ready)
+        send_udp_message("127.0.0.1", port, b"zero-copy")
+        done.wait(timeout=2.0)
+        assert received == [(memoryview, b"zero-copy")]
+    finally:
+        # Pool workers are not daemons; a server left running hangs teardown
+        stop_event.set()
+
+
+async def _multi_echo_handler(data, addr, writer):
+    writer.write(b"ECHO:" + data)
+    await writer.drain()
+
+
+@pytest.mark.skipif(
+    not hasattr(socket, "SO_REUSEPORT"), reason="SO_REUSEPORT not supported"
+)
+def test_async_tcp_server_multi():
+    from kn_sock import start_async_tcp_server_multi
+
+    port = get_free_port()
+    shutdown_event = threading.Event()
+    server_thread = threading.Thread(
+        target=start_async_tcp_server_multi,
+        args=(port, _multi_echo_handler),
+        kwargs={"workers": 2, "shutdown_event": shutdown_event},
+        daemon=True,
+    )
+    server_thread.start()
+    for _ in range(20):
+        try:
+            c = socket.create_connection(("localhost", port))
+            break
+        except ConnectionRefusedError:
+            time.sleep(0.1)
+    else:
+        pytest.fail("Multi-process server did not start in time")
+    with c:
+        c.sendall(b"multi")
+        assert c.recv(1024) == b"ECHO:multi"
+    shutdown_event.set()
+    server_thread.join(timeout=5)
+    assert not server_thread.is_alive(), "Workers were not stopped"
+
+
+def test_tcp_server_reuseport():
+    from kn_sock import start_tcp_server_reuseport
+
+    port = get_free_port()
+    shutdown_event = threading.Event()
+    server_thread = threading.Thread(
+        target=start_tcp_server_reuseport,
+        args=(port, lambda data, addr, sock: sock.sendall(b"ECHO:" + data)),
+        kwargs={"num_workers": 2, "shutdown_event": shutdown_event},
+        daemon=True,
+    )
+    server_thread.start()
+    wait_for_tcp_server(port)
+    for i in range(4):
+        with socket.create_connection(("localhost", port)) as c:
+            c.sendall(b"hi-%d" % i)
+            assert c.recv(1024) == b"ECHO:hi-%d" % i
+    shutdown_event.set()
+    server_thread.join(timeout=5)
+    assert not server_thread.is_alive(), "Listeners were not stopped"
+
+
 @pytest.mark.asyncio
 async def test_async_tcp_server_graceful_shutdown():
     shutdown_event = asyncio.Event()
@@ -172,7 +325,7 @@ async def test_async_tcp_server_graceful_shutdown():
     server_task = asyncio.create_task(
         start_async_tcp_server(port, handler, shutdown_event=shutdown_event)
     )
-    await asyncio.sleep(1)
+    await wait_for_async_tcp_server(port)
     shutdown_event.set()
     await asyncio.wait_for(server_task, timeout=2)
     print("[SUCCESS] Async TCP server graceful shutdown")
@@ -204,15 +357,17 @@ def test_tcp_server_graceful_shutdown():
 @pytest.mark.asyncio
 async def test_async_udp_server_graceful_shutdown():
     shutdown_event = asyncio.Event()
+    ready = asyncio.Event()
 
     async def handler(data, addr, transport):
-        pass
+        if data == READY_PROBE:
+            ready.set()
 
     port = get_free_port()
     server_task = asyncio.create_task(
         start_udp_server_async(port, handler, shutdown_event=shutdown_event)
     )
-    await asyncio.sleep(1)
+    await wait_for_async_udp_server(port, ready)
     shutdown_event.set()
     await asyncio.wait_for(server_task, timeout=2)
     print("[SUCCESS] Async UDP server graceful shutdown")
@@ -243,6 +398,371 @@ def test_tcp_connection_pool():
     print("[SUCCESS] TCPConnectionPool plain TCP")
 
 
+def test_tcp_connection_pool_waits_for_release():
+    from kn_sock import TCPConnectionPool
+
+    port = get_free_port()
+
+    def handler(data, addr, client_socket):
+        client_socket.sendall(b"ECHO:" + data)
+
+    threading.Thread(
+        target=start_selector_tcp_server, args=(port, handler), daemon=True
+    ).start()
+    wait_for_tcp_server(port)
+    pool = TCPConnectionPool("localhost", port, max_size=1, idle_timeout=5)
+    acquired = threading.Event()
+
+    def waiter():
+        with pool.connection() as conn:
+            conn.sendall(b"second")
+            assert conn.recv(1024) == b"ECHO:second"
+            acquired.set()
+
+    with pool.connection():
+        t = threading.Thread(target=waiter, daemon=True)
+        t.start()
+        assert not acquired.wait(0.2), "Pool handed out more than max_size"
+    assert acquired.wait(1), "Waiter was not woken when the connection was released"
+    t.join(timeout=1)
+    pool.closeall()
+
+
+def test_tcp_connection_pool_recovers_from_errors():
+    from kn_sock import TCPConnectionPool
+
+    port = get_free_port()
+
+    def handler(data, addr, client_socket):
+        client_socket.sendall(b"ECHO:" + data)
+
+    threading.Thread(
+        target=start_selector_tcp_server, args=(port, handler), daemon=True
+    ).start()
+    wait_for_tcp_server(port)
+    pool = TCPConnectionPool("localhost", port, max_size=1, idle_timeout=5)
+    with pytest.raises(RuntimeError):
+        with pool.connection() as failed:
+            raise RuntimeError("handler failed")
+    assert failed.fileno() == -1, "Connection was returned to the pool"
+    for _ in range(3):
+        pooled = pool.connection()
+        pooled.close()
+        with pooled:
+            pass
+    with pool.connection() as conn:
+        conn.sendall(b"again")
+        assert conn.recv(1024) == b"ECHO:again"
+    pool.closeall()
+
+
+@pytest.mark.parametrize(
+    "transport",
+    [
+        "inet",
+        pytest.param(
+            "unix",
+            marks=pytest.mark.skipif(
+                not hasattr(socket, "AF_UNIX"), reason="AF_UNIX not available"
+            ),
+        ),
+    ],
+)
+def test_send_tcp_messages_reuses_connection(transport, tmp_path):
+    from kn_sock import send_tcp_messages
+
+    port = get_free_port()
+    # The Unix socket skips the TCP/IP stack; the inet case keeps TCP coverage
+    unix_path = str(tmp_path / "srv.sock") if transport == "unix" else None
+    connections = set()
+    families = set()
+
+    def handler(data, addr, client_socket):
+        connections.add(id(client_socket))
+        families.add(client_socket.family)
+        client_socket.sendall(b"ECHO:" + data)
+
+    shutdown_event = threading.Event()
+    threading.Thread(
+        target=start_selector_tcp_server,
+        args=(port, handler),
+        kwargs={"shutdown_event": shutdown_event, "unix_path": unix_path},
+        daemon=True,
+    ).start()
+    wait_for_tcp_server(port)
+    messages = [f"msg-{i}" for i in range(5)]
+    assert send_tcp_messages("localhost", port, messages, unix_path=unix_path) == [
+        b"ECHO:" + m.encode() for m in messages
+    ]
+    assert len(connections) == 1, "Messages were not sent over one connection"
+    assert families == {socket.AF_UNIX if unix_path else socket.AF_INET}
+    shutdown_event.set()
+
+
+def test_send_udp_messages():
+    from kn_sock import send_udp_messages
+
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as receiver:
+        receiver.bind(("127.0.0.1", 0))
+        receiver.settimeout(2)
+        port = receiver.getsockname()[1]
+        messages = [f"dgram-{i}" for i in range(5)] + [b"raw-bytes"]
+        assert send_udp_messages("127.0.0.1", port, messages) == len(messages)
+        received = [receiver.recv(1024) for _ in messages]
+    assert received == [m if isinstance(m, bytes) else m.encode() for m in messages]
+
+
+def test_send_tcp_message_pooled():
+    from kn_sock import TCPConnectionPool, send_tcp_message_pooled
+
+    port = get_free_port()
+    peers = set()
+
+    def handler(data, addr, client_socket):
+        peers.add(addr)
+        client_socket.sendall(b"ECHO:" + data)
+
+    threading.Thread(
+        target=start_selector_tcp_server, args=(port, handler), daemon=True
+    ).start()
+    wait_for_tcp_server(port)
+    pool = TCPConnectionPool("localhost", port, max_size=1, idle_timeout=5)
+    assert send_tcp_message_pooled(pool, "hello") == b"ECHO:hello"
+    assert send_tcp_message_pooled(pool, memoryview(b"raw")) == b"ECHO:raw"
+    assert len(peers) == 1, "Pooled sends did not reuse the connection"
+    pool.closeall()
+
+
+def test_tcp_connection_pool_closes_idle():
+    from kn_sock import TCPConnectionPool
+
+    port = get_free_port()
+    threading.Thread(
+        target=start_selector_tcp_server,
+        args=(port, lambda data, addr, sock: None),
+        daemon=True,
+    ).start()
+    wait_for_tcp_server(port)
+    pool = TCPConnectionPool("localhost", port, max_size=1, idle_timeout=0.1)
+    with pool.connection() as first:
+        pass
+    time.sleep(0.2)
+    with pool.connection() as second:
+        assert second is not first
+    assert first.fileno() == -1, "Expired connection was not closed"
+    # The reaper closes idle connections without waiting for connection()
+    time.sleep(0.3)
+    assert second.fileno() == -1, "Idle connection was not reaped in the background"
+    pool.closeall()
+
+
+def test_tcp_connection_pool_closeall_with_checked_out_connection():
+    from kn_sock import TCPConnectionPool
+
+    port = get_free_port()
+    threading.Thread(
+        target=start_selector_tcp_server,
+        args=(port, lambda data, addr, sock: None),
+        daemon=True,
+    ).start()
+    wait_for_tcp_server(port)
+    pool = TCPConnectionPool("localhost", port, max_size=1, idle_timeout=30)
+    with pool.connection() as conn:
+        pool.closeall()
+    assert pool._used == 0, "closeall() let the slot count drift"
+    assert conn.fileno() == -1, "Released connection was kept after closeall()"
+    assert not pool._pool
+    # The pool is reset, not retired: later connections are pooled again
+    with pool.connection() as conn:
+        pass
+    assert [c for c, _ in pool._pool] == [conn]
+    assert pool._reaper is not None and pool._reaper.is_alive()
+    pool.closeall()
+
+
+def test_tcp_connection_pool_reaper_does_not_keep_pool_alive():
+    import gc
+    import weakref
+    from kn_sock import TCPConnectionPool
+
+    port = get_free_port()
+    threading.Thread(
+        target=start_selector_tcp_server,
+        args=(port, lambda data, addr, sock: None),
+        daemon=True,
+    ).start()
+    wait_for_tcp_server(port)
+    # No idle timeout: nothing to reap, so no thread is started
+    pool = TCPConnectionPool("localhost", port, idle_timeout=0)
+    with pool.connection():
+        pass
+    assert pool._reaper is None
+    pool.closeall()
+
+    pool = TCPConnectionPool("localhost", port, idle_timeout=30)
+    with pool.connection():
+        pass
+    reaper, ref = pool._reaper, weakref.ref(pool)
+    del pool
+    gc.collect()
+    assert ref() is None, "Reaper thread kept the pool alive"
+    reaper.join(timeout=2)
+    assert not reaper.is_alive(), "Reaper did not exit after the pool was collected"
+
+
+def test_selector_tcp_server():
+    port = get_free_port()
+    shutdown_event = threading.Event()
+
+    def handler(data, addr, client_socket):
+        client_socket.sendall(b"ECHO:" + data)
+
+    server_thread = threading.Thread(
+        target=start_selector_tcp_server,
+        args=(port, handler),
+        kwargs={"shutdown_event": shutdown_event},
+        daemon=True,
+    )
+    server_thread.start()
+    wait_for_tcp_server(port)
+    clients = [socket.create_connection(("localhost", port)) for _ in range(3)]
+    for i, c in enumerate(clients):
+        c.sendall(f"msg{i}".encode())
+    for i, c in enumerate(clients):
+        assert c.recv(1024) == f"ECHO:msg{i}".encode()
+        c.close()
+    shutdown_event.set()
+    server_thread.join(timeout=2)
+    assert not server_thread.is_alive(), "Selector server did not shut down"
+
+
+def test_iouring_tcp_server():
+    # Falls back to the selector server where io_uring or liburing is missing
+    from kn_sock import start_iouring_tcp_server
+
+    port = get_free_port()
+    shutdown_event = threading.Event()
+
+    def handler(data, addr, client_socket):
+        client_socket.sendall(b"ECHO:" + data)
+
+    server_thread = threading.Thread(
+        target=start_iouring_tcp_server,
+        args=(port, handler),
+        kwargs={"shutdown_event": shutdown_event},
+        daemon=True,
+    )
+    server_thread.start()
+    wait_for_tcp_server(port)
+    clients = [socket.create_connection(("localhost", port)) for _ in range(3)]
+    for round_ in range(2):
+        for i, c in enumerate(clients):
+            c.sendall(f"msg{i}-{round_}".encode())
+        for i, c in enumerate(clients):
+            assert c.recv(1024) == f"ECHO:msg{i}-{round_}".encode()
+    for c in clients:
+        c.close()
+    shutdown_event.set()
+    server_thread.join(timeout=2)
+    assert not server_thread.is_alive(), "io_uring server did not shut down"
+
+
+
+def test_iouring_serve_survives_failed_accept():
+    # Runs the io_uring loop itself; skipped where liburing or io_uring is missing
+    _iouring = pytest.importorskip("kn_sock._iouring")
+
+    server_socket = socket.socket()
+    server_socket.bind(("127.0.0.1", 0))
+    server_socket.listen(8)
+    port = server_socket.getsockname()[1]
+    shutdown_event = threading.Event()
+    accepted = []
+
+    def on_accept(client_socket):
+        # Behave as if the first client reset before it was processed
+        accepted.append(client_socket)
+        if len(accepted) == 1:
+            raise OSError("Transport endpoint is not connected")
+
+    def handler(data, addr, client_socket):
+        client_socket.sendall(b"ECHO:" + data)
+
+    server_thread = threading.Thread(
+        target=_iouring.serve,
+        args=(server_socket, handler, shutdown_event, 1024, False, on_accept),
+        daemon=True,
+    )
+    server_thread.start()
+    try:
+        with socket.create_connection(("127.0.0.1", port), timeout=2) as dropped:
+            assert dropped.recv(1024) == b"", "Failed accept was not closed"
+        with socket.create_connection(("127.0.0.1", port), timeout=2) as c:
+            c.sendall(b"still serving")
+            assert c.recv(1024) == b"ECHO:still serving"
+    finally:
+        shutdown_event.set()
+        server_thread.join(timeout=2)
+        server_socket.close()
+    assert not server_thread.is_alive(), "io_uring loop did not shut down"
+
+def test_send_tcp_file(tmp_path):
+    from kn_sock import send_tcp_file
+
+    payload = bytes(range(256)) * 1024
+    path = tmp_path / "payload.bin"
+    path.write_bytes(payload)
+    port = get_free_port()
+    received = bytearray()
+    expected = {"size": len(payload)}
+    done = threading.Event()
+
+    def handler(data, addr, client_socket):
+        received.extend(data)
+        if len(received) == expected["size"]:
+            done.set()
+
+    threading.Thread(
+        target=start_selector_tcp_server, args=(port, handler), daemon=True
+    ).start()
+    wait_for_tcp_server(port)
+    assert send_tcp_file("localhost", port, str(path)) == len(payload)
+    assert done.wait(2), "Server did not receive the whole file"
+    assert bytes(received) == payload
+
+    # A file object is sent from its current position
+    received.clear()
+    done.clear()
+    expected["size"] = len(payload) - 1024
+    with open(path, "rb") as f:
+        f.seek(1024)
+        assert send_tcp_file("localhost", port, f) == expected["size"]
+    assert done.wait(2), "Server did not receive the rest of the file"
+    assert bytes(received) == payload[1024:]
+
+
+def test_send_tcp_vectored():
+    from kn_sock import send_tcp_vectored
+
+    port = get_free_port()
+    received = bytearray()
+    done = threading.Event()
+    buffers = [b"HEADER:", b"x" * 100000]
+
+    def handler(data, addr, client_socket):
+        received.extend(data)
+        if len(received) == 100007:
+            done.set()
+
+    threading.Thread(
+        target=start_selector_tcp_server, args=(port, handler), daemon=True
+    ).start()
+    wait_for_tcp_server(port)
+    assert send_tcp_vectored("localhost", port, buffers) == 100007
+    assert done.wait(2), "Server did not receive every buffer"
+    assert bytes(received) == b"".join(buffers)
+
+
 @pytest.mark.skipif(not socket.has_ipv6, reason="IPv6 not supported on this platform")
 def test_tcp_ipv6():
     import threading
@@ -342,6 +862,207 @@ def test_websocket_echo():
     print("[SUCCESS] WebSocket echo test")
 
 
+def test_websocket_server_blocked_handler_does_not_block_exit():
+    import os
+    import subprocess
+    import sys
+    import textwrap
+
+    script = textwrap.dedent("""
+        import threading, time
+        from kn_sock import start_websocket_server, connect_websocket
+        from kn_sock.utils import get_free_port
+
+        stop, port = threading.Event(), get_free_port()
+        threading.Thread(
+            target=start_websocket_server,
+            args=("127.0.0.1", port, lambda ws: ws.recv(), stop),
+            daemon=True,
+        ).start()
+        time.sleep(0.3)
+        client = connect_websocket("127.0.0.1", port)
+        time.sleep(0.3)
+        stop.set()
+        """)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    # The handler is still blocked in recv() when the main thread returns
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=root,
+        capture_output=True,
+        timeout=10,
+    )
+    assert result.returncode == 0, result.stderr.decode()
+
+
+
+def test_websocket_server_at_capacity_waits_for_free_slot():
+    from kn_sock import start_websocket_server, connect_websocket
+
+    def echo_handler(ws):
+        ws.send(ws.recv())
+        ws.close()
+
+    port = get_free_port()
+    shutdown_event = threading.Event()
+    server_thread = threading.Thread(
+        target=start_websocket_server,
+        args=("127.0.0.1", port, echo_handler),
+        kwargs={"shutdown_event": shutdown_event, "max_workers": 1},
+        daemon=True,
+    )
+    server_thread.start()
+    wait_for_tcp_server(port)
+    first = connect_websocket("127.0.0.1", port)
+    replies = []
+
+    def second_client():
+        ws = connect_websocket("127.0.0.1", port)
+        ws.send("second")
+        replies.append(ws.recv())
+        ws.close()
+
+    second = threading.Thread(target=second_client, daemon=True)
+    second.start()
+    second.join(0.3)
+    assert second.is_alive(), "Second client was served past max_workers"
+    first.send("first")
+    assert first.recv() == "first"
+    first.close()
+    # The freed slot wakes the accept loop, which then takes the queued client
+    second.join(5)
+    assert replies == ["second"]
+    # Shutdown also wakes a loop that stopped accepting at capacity
+    holder = connect_websocket("127.0.0.1", port)
+    queued = socket.create_connection(("127.0.0.1", port))
+    shutdown_event.set()
+    server_thread.join(timeout=5)
+    assert not server_thread.is_alive(), "Server did not stop at capacity"
+    queued.close()
+    holder.close()
+
+def test_websocket_slow_handshake_does_not_block_accepts():
+    from kn_sock import start_websocket_server, connect_websocket
+
+    def echo_handler(ws):
+        ws.send(ws.recv())
+        ws.close()
+
+    port = get_free_port()
+    shutdown_event = threading.Event()
+    server_thread = threading.Thread(
+        target=start_websocket_server,
+        args=("127.0.0.1", port, echo_handler),
+        kwargs={"shutdown_event": shutdown_event},
+        daemon=True,
+    )
+    server_thread.start()
+    wait_for_tcp_server(port)
+    # Connects but never sends its upgrade request
+    stalled = socket.create_connection(("127.0.0.1", port))
+    ws = connect_websocket("127.0.0.1", port)
+    ws.send("fast")
+    assert ws.recv() == "fast"
+    ws.close()
+    stalled.close()
+    shutdown_event.set()
+    server_thread.join(timeout=5)
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+@pytest.mark.parametrize("size", [0, 5, 1023, 4096, 4099])
+def test_websocket_unmask(size, use_numpy, monkeypatch):
+    from kn_sock import websocket
+    from kn_sock.websocket import _unmask
+
+    if not use_numpy:
+        monkeypatch.setattr(websocket, "_HAS_NUMPY", False)
+    payload = bytes(random.getrandbits(8) for _ in range(size))
+    mask = b"\x12\x34\x56\x78"
+    masked = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+    assert _unmask(masked, mask) == payload
+    assert _unmask(payload, b"\x00\x00\x00\x00") == payload
+
+
+def test_websocket_handshake_response():
+    from kn_sock.websocket import _handshake_response
+
+    # Example key and accept value from RFC 6455 section 1.3
+    response = _handshake_response(b"dGhlIHNhbXBsZSBub25jZQ==")
+    assert response.startswith(b"HTTP/1.1 101 Switching Protocols\r\n")
+    assert b"Sec-WebSocket-Accept: s3pPLMBiTxaQ9kYGzzhZRbK+xOo=\r\n\r\n" in response
+
+
+def test_websocket_read_http_head():
+    from kn_sock.websocket import _read_http_head
+
+    a, b = socket.socketpair()
+    # The end-of-head marker straddles two reads, and a frame follows it
+    b.sendall(b"HTTP/1.1 101 Switching Protocols\r\n\r")
+    time.sleep(0.05)
+    b.sendall(b"\n\x81\x02hi")
+    assert _read_http_head(a) == (b"HTTP/1.1 101 Switching Protocols", b"\x81\x02hi")
+    b.close()
+    assert _read_http_head(a) is None
+    a.close()
+
+
+@pytest.mark.parametrize("size", [0, 125, 126, 65535, 65536])
+def test_websocket_send_recv_lengths(size):
+    from kn_sock.websocket import WebSocketConnection
+
+    a, b = socket.socketpair()
+    sender, receiver = WebSocketConnection(a, None), WebSocketConnection(b, None)
+    message = "x" * size
+    t = threading.Thread(target=sender.send, args=(message,))
+    t.start()
+    assert receiver.recv() == message
+    t.join()
+    a.close()
+    b.close()
+
+
+def test_websocket_recv_buffers_frames():
+    from kn_sock.websocket import WebSocketConnection
+
+    a, b = socket.socketpair()
+    ws = WebSocketConnection(a, None)
+    mask = b"\x01\x02\x03\x04"
+    masked = bytes(c ^ mask[i % 4] for i, c in enumerate(b"two"))
+    # Two frames in one segment, then a frame split across segments
+    b.sendall(b"\x81\x03one" + b"\x81\x83" + mask + masked + b"\x81")
+    assert ws.recv() == "one"
+    assert ws.recv() == "two"
+    b.sendall(b"\x05three")
+    assert ws.recv() == "three"
+    b.close()
+    assert ws.recv() == ""
+    assert not ws.open
+    a.close()
+
+
+@pytest.mark.asyncio
+async def test_websocket_server_async_echo():
+    from kn_sock import async_connect_websocket, start_websocket_server_async
+
+    port = get_free_port()
+    shutdown_event = asyncio.Event()
+
+    async def echo_handler(ws):
+        await ws.send(await ws.recv())
+
+    server_task = asyncio.create_task(
+        start_websocket_server_async("127.0.0.1", port, echo_handler, shutdown_event)
+    )
+    await wait_for_async_tcp_server(port)
+    ws = await async_connect_websocket("127.0.0.1", port)
+    await ws.send("async123")
+    assert await ws.recv() == "async123"
+    await ws.close()
+    shutdown_event.set()
+    await asyncio.wait_for(server_task, timeout=5)
+
+
 def test_http_get_post():
     import threading
     import time
@@ -374,6 +1095,41 @@ def test_http_get_post():
     print("[SUCCESS] HTTP GET/POST test")
 
 
+def test_http_get_content_length_keepalive():
+    import threading
+    from kn_sock import http_get
+
+    body = bytes(range(256)) * 4
+    srv = socket.socket()
+    srv.bind(("127.0.0.1", 0))
+    srv.listen(1)
+    port = srv.getsockname()[1]
+    done = threading.Event()
+
+    def serve():
+        conn, _ = srv.accept()
+        conn.recv(4096)
+        conn.sendall(
+            b"HTTP/1.1 200 OK\r\nContent-Length: "
+            + str(len(body)).encode()
+            + b"\r\n\r\n"
+            + body
+        )
+        # Keep the connection open: the client must stop at Content-Length
+        done.wait(5)
+        conn.close()
+
+    t = threading.Thread(target=serve, daemon=True)
+    t.start()
+    try:
+        assert http_get("127.0.0.1", port, "/", decode=False) == body
+    finally:
+        done.set()
+        t.join()
+        srv.close()
+    print("[SUCCESS] HTTP Content-Length framing test")
+
+
 def test_http_server():
     import threading
     import time
@@ -383,6 +1139,9 @@ def test_http_server():
     os.makedirs("test_static", exist_ok=True)
     with open("test_static/index.html", "w") as f:
         f.write("<h1>Static Test</h1>")
+    big = os.urandom(200 * 1024)
+    with open("test_static/big.bin", "wb") as f:
+        f.write(big)
 
     def hello_route(request, client_sock):
         client_sock.sendall(
@@ -425,17 +1184,51 @@ def test_http_server():
     # Test static file
     body = http_get("127.0.0.1", port, "/")
     assert "Static Test" in body
+    # Large static files are sent with sendfile()
+    assert http_get("127.0.0.1", port, "/big.bin", decode=False) == big
     # Test GET route
     body = http_get("127.0.0.1", port, "/hello")
     assert "Hello" in body
     # Test POST route
     body = http_post("127.0.0.1", port, "/echo", data="abc123")
     assert "abc123" in body
+    # Oversized request heads are rejected
+    with socket.create_connection(("127.0.0.1", port)) as c:
+        head = b"GET / HTTP/1.1\r\nX-Pad: "
+        c.sendall(head + b"a" * (8192 - len(head)))
+        assert c.recv(1024).startswith(b"HTTP/1.1 431")
     shutdown_event.set()
     server_thread.join()
+    os.remove("test_static/big.bin")
     print("[SUCCESS] HTTP server static, GET, POST test")
 
 
+
+def test_http_server_drops_idle_clients(monkeypatch):
+    import kn_sock.http
+    from kn_sock import start_http_server, http_get
+
+    monkeypatch.setattr(kn_sock.http, "CLIENT_TIMEOUT", 0.2)
+    port = get_free_port()
+    shutdown_event = threading.Event()
+    server_thread = threading.Thread(
+        target=start_http_server,
+        args=("127.0.0.1", port),
+        kwargs={"shutdown_event": shutdown_event, "max_workers": 1},
+        daemon=True,
+    )
+    server_thread.start()
+    wait_for_tcp_server(port)
+    # A silent client holds the only worker until CLIENT_TIMEOUT drops it
+    idle = socket.create_connection(("127.0.0.1", port), timeout=5)
+    try:
+        assert http_get("127.0.0.1", port, "/missing") == ""
+        assert idle.recv(1) == b""
+    finally:
+        idle.close()
+        shutdown_event.set()
+        server_thread.join()
+
 def test_pubsub():
     import threading
     import time
@@ -473,6 +1266,84 @@ def test_pubsub():
     print("[SUCCESS] PubSub subscribe/publish test")
 
 
+def test_pubsub_wildcard():
+    import threading
+    import time
+    from kn_sock import start_pubsub_server, PubSubClient
+
+    shutdown_event = threading.Event()
+    import socket
+
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    server_thread = threading.Thread(
+        target=start_pubsub_server,
+        args=(port,),
+        kwargs={"shutdown_event": shutdown_event},
+        daemon=True,
+    )
+    server_thread.start()
+    time.sleep(1)
+    single = PubSubClient("127.0.0.1", port)
+    multi = PubSubClient("127.0.0.1", port)
+    publisher = PubSubClient("127.0.0.1", port)
+    single.subscribe("news/+")
+    multi.subscribe("news/#")
+    time.sleep(0.2)
+    publisher.publish("news/tech", "one level")
+    publisher.publish("news/tech/ai", "two levels")
+    msg1 = single.recv(timeout=2)
+    msg2 = multi.recv(timeout=2)
+    msg3 = multi.recv(timeout=2)
+    extra = single.recv(timeout=0.5)
+    single.close()
+    multi.close()
+    publisher.close()
+    shutdown_event.set()
+    server_thread.join()
+    assert msg1 == {"topic": "news/tech", "message": "one level"}
+    assert msg2["message"] == "one level"
+    assert msg3["message"] == "two levels"
+    assert extra is None
+    print("[SUCCESS] PubSub wildcard subscription test")
+
+
+def test_pubsub_publish_many():
+    import threading
+    import time
+    from kn_sock import start_pubsub_server, PubSubClient
+
+    shutdown_event = threading.Event()
+    import socket
+
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    server_thread = threading.Thread(
+        target=start_pubsub_server,
+        args=(port,),
+        kwargs={"shutdown_event": shutdown_event},
+        daemon=True,
+    )
+    server_thread.start()
+    time.sleep(1)
+    subscriber = PubSubClient("127.0.0.1", port)
+    publisher = PubSubClient("127.0.0.1", port)
+    subscriber.subscribe("batch")
+    time.sleep(0.2)
+    publisher.publish_many([("batch", str(i)) for i in range(5)])
+    received = [subscriber.recv(timeout=2) for _ in range(5)]
+    subscriber.close()
+    publisher.close()
+    shutdown_event.set()
+    server_thread.join()
+    assert [m["message"] for m in received] == ["0", "1", "2", "3", "4"]
+    print("[SUCCESS] PubSub publish_many test")
+
+
 def test_rpc():
     import threading
     import time
@@ -503,6 +1374,22 @@ def test_rpc():
     client = RPCClient("127.0.0.1", port)
     assert client.call("add", 2, 3) == 5
     assert client.call("echo", msg="hi") == "hi"
+    assert client.call_many([("add", 1, 2), ("echo", "x"), ("add", 3, 4)]) == [
+        3,
+        "x",
+        7,
+    ]
+    # (method, args, kwargs) entries pass keyword arguments
+    assert client.call_many([("echo", [], {"msg": "kw"}), ("add", [1], {"b": 2})]) == [
+        "kw",
+        3,
+    ]
+    try:
+        client.call_many([("add", 1, 2), ("notfound",)])
+        assert False, "Expected exception for unknown method"
+    except Exception as e:
+        assert "not found" in str(e)
+    assert client.call("add", 5, 5) == 10
     try:
         client.call("notfound")
         assert False, "Expected exception for unknown method"
@@ -514,6 +1401,85 @@ def test_rpc():
     print("[SUCCESS] RPC server/client test")
 
 
+def _serve_rpc_lines(srv, reply):
+    # Minimal line-based RPC peer: answers each request line with reply(req)
+    conn, _ = srv.accept()
+    with conn, conn.makefile("rb") as rfile:
+        for line in rfile:
+            conn.sendall(json.dumps(reply(json.loads(line))).encode() + b"\n")
+
+
+@pytest.mark.parametrize(
+    "reply,expected",
+    [
+        # Server that predates ids answers in order without echoing them
+        (lambda req: {"result": req["params"][0]}, [1, 2, 3]),
+        # The first reply carries a bogus id; the rest must still be drained
+        (
+            lambda req: {
+                "id": 999 if req["params"][0] == 1 else req.get("id"),
+                "result": req["params"][0],
+            },
+            RuntimeError,
+        ),
+    ],
+    ids=["no-id", "unknown-id"],
+)
+def test_rpc_call_many_response_ids(reply, expected):
+    from kn_sock import RPCClient
+
+    srv = socket.socket()
+    srv.bind(("127.0.0.1", 0))
+    srv.listen(1)
+    threading.Thread(target=_serve_rpc_lines, args=(srv, reply), daemon=True).start()
+    client = RPCClient("127.0.0.1", srv.getsockname()[1])
+    client.sock.settimeout(5)
+    calls = [("echo", 1), ("echo", 2), ("echo", 3)]
+    try:
+        if expected is RuntimeError:
+            with pytest.raises(RuntimeError):
+                client.call_many(calls)
+            # No stale reply is left for the next call
+            assert client.call("echo", 4) == 4
+        else:
+            assert client.call_many(calls) == expected
+    finally:
+        client.close()
+        srv.close()
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="AF_UNIX not available")
+def test_rpc_unix_path(tmp_path):
+    import threading
+    import time
+    import os
+    from kn_sock import start_rpc_server, RPCClient
+
+    funcs = {"add": lambda a, b: a + b}
+    shutdown_event = threading.Event()
+    unix_path = str(tmp_path / "rpc.sock")
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    server_thread = threading.Thread(
+        target=start_rpc_server,
+        args=(port, funcs),
+        kwargs={"shutdown_event": shutdown_event, "unix_path": unix_path},
+        daemon=True,
+    )
+    server_thread.start()
+    time.sleep(1)
+    client = RPCClient("127.0.0.1", port, unix_path=unix_path)
+    assert client.sock.family == socket.AF_UNIX
+    assert client.call("add", 2, 3) == 5
+    client.close()
+    shutdown_event.set()
+    server_thread.join()
+    assert not os.path.exists(unix_path)
+    print("[SUCCESS] RPC over Unix socket test")
+
+
 # --- Error Condition Tests ---
 def test_tcp_connection_timeout(monkeypatch):
     import socket
@@ -176,14 +176,15 @@ async def test_async_websocket_client():
     import threading
     import time
 
+    port = get_free_port()
     server_thread = threading.Thread(
         target=start_websocket_server,
-        args=("127.0.0.1", 8766, echo_handler),
+        args=("127.0.0.1", port, echo_handler),
         daemon=True,
     )
     server_thread.start()
     time.sleep(0.5)
-    ws = await async_connect_websocket("127.0.0.1", 8766)
+    ws = await async_connect_websocket("127.0.0.1", port)
     await ws.send("hello async")
     reply = await ws.recv()
     assert reply == "hello async"
@@ -323,3 +324,78 @@ def test_send_file_progress_bar(tmp_path):
     send_file("127.0.0.1", port, str(test_file))
     stop_event.set()
     t.join(timeout=1)
+
+
+### _EventWakeup ###
+def test_event_wakeup_becomes_readable_on_set():
+    import select
+    import threading
+    from kn_sock.utils import _EventWakeup
+
+    event = threading.Event()
+    first, second = _EventWakeup(event), _EventWakeup(event)
+    try:
+        assert select.select([first, second], [], [], 0)[0] == []
+        event.set()
+        ready = select.select([first, second], [], [], 1)[0]
+        assert first in ready and second in ready
+        assert event.is_set()
+    finally:
+        first.close()
+        second.close()
+    # Already-set events wake new waiters immediately
+    late = _EventWakeup(event)
+    try:
+        assert select.select([late], [], [], 1)[0] == [late]
+    finally:
+        late.close()
+    print("[SUCCESS] _EventWakeup wakes selectors when the event is set")
+
+
+### send_all_vectored ###
+def test_send_all_vectored_handles_partial_sends():
+    import threading
+    from kn_sock.utils import send_all_vectored
+
+    sender, receiver = socket.socketpair()
+    # Many buffers larger than the socket buffer force short sendmsg() writes
+    buffers = [b"head"] + [bytes([i]) * 70000 for i in range(5)] + [b"", b"tail"]
+    expected = b"".join(buffers)
+    received = bytearray()
+
+    def reader():
+        while len(received) < len(expected):
+            chunk = receiver.recv(65536)
+            if not chunk:
+                break
+            received.extend(chunk)
+
+    t = threading.Thread(target=reader)
+    t.start()
+    try:
+        assert send_all_vectored(sender, buffers) == len(expected)
+        t.join(timeout=5)
+        assert bytes(received) == expected
+    finally:
+        sender.close()
+        receiver.close()
+    print("[SUCCESS] send_all_vectored sent every buffer in order")
+
+
+def test_star_import_skips_optional_modules():
+    import subprocess
+    import sys
+
+    code = (
+        "import sys\n"
+        "from kn_sock import *\n"
+        "assert 'importlib' not in dir() and 'os' not in dir()\n"
+        "assert 'send_tcp_message' in dir()\n"
+        "loaded = {'kn_sock.network', 'kn_sock.live_stream', 'kn_sock.video_chat'}\n"
+        "assert not loaded & set(sys.modules), loaded & set(sys.modules)\n"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=root, capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr